@@ -7,12 +7,17 @@ error handlers are set up here.
 """
 
 import os
+import gzip
+import zlib
+import hashlib
 import logging
 from logging.handlers import RotatingFileHandler
 from flask import Flask, jsonify, request
 
+from app.auth import AdminGate
 from app.config import config
 from app.database import init_db, ConversationStore
+from app.jsonutil import OrjsonProvider
 from app.errors import (
     OllamaConnectionError,
     OllamaTimeoutError,
@@ -118,6 +123,12 @@ def create_app():
     app.secret_key = config.FLASK_SECRET_KEY
     app.debug = config.FLASK_DEBUG
 
+    # Cache-Control max-age for /static files (URLs are fingerprinted below)
+    app.config['SEND_FILE_MAX_AGE_DEFAULT'] = config.STATIC_MAX_AGE or None
+
+    # Use orjson (when installed) for jsonify() and request JSON parsing
+    app.json = OrjsonProvider(app)
+
     # Store config object in app for route access
     app.config['APP_CONFIG'] = config
 
@@ -140,10 +151,19 @@ def create_app():
     from app.routes import register_blueprints
     register_blueprints(app)
 
+    # Reject unauthorized /admin/ requests before they reach Flask
+    app.wsgi_app = AdminGate(app.wsgi_app)
+
     # Register error handlers
     logger.info("Registering error handlers")
     register_error_handlers(app)
 
+    # Version static URLs by content so they can be cached for STATIC_MAX_AGE
+    register_static_fingerprints(app)
+
+    if config.COMPRESS_RESPONSES:
+        register_compression(app)
+
     # Optional: Check Ollama connection on startup
     if config.OLLAMA_STARTUP_CHECK:
         logger.info("Checking Ollama connection (set OLLAMA_STARTUP_CHECK=false to skip)")
@@ -156,6 +176,109 @@ def create_app():
     return app
 
 
+def register_static_fingerprints(app: Flask):
+    """
+    Append a content hash to every url_for('static', ...) URL.
+
+    Hashes every file under the static folder once, at startup, and adds
+    it as a ``v`` query parameter: ``/static/js/main.js?v=1a2b3c4d``. A
+    deploy that changes a file changes its URL, so browsers can cache
+    static files for STATIC_MAX_AGE without ever running stale JS or CSS.
+
+    Args:
+        app: Flask application instance
+    """
+    fingerprints = {}
+    for root, _dirs, files in os.walk(app.static_folder):
+        for name in files:
+            path = os.path.join(root, name)
+            with open(path, 'rb') as f:
+                digest = hashlib.blake2b(f.read(), digest_size=4).hexdigest()
+            filename = os.path.relpath(path, app.static_folder).replace(os.sep, '/')
+            fingerprints[filename] = digest
+    logger.info(f"Fingerprinted {len(fingerprints)} static file(s)")
+
+    @app.url_defaults
+    def add_static_fingerprint(endpoint, values):
+        if endpoint == 'static' and 'v' not in values:
+            digest = fingerprints.get(values.get('filename'))
+            if digest:
+                values['v'] = digest
+
+
+# Response types worth compressing, and the smallest body worth the CPU
+_COMPRESSIBLE_MIMETYPES = frozenset({'application/json', 'text/html', 'text/event-stream'})
+_COMPRESS_MIN_SIZE = 512
+
+
+def _gzip_stream(chunks):
+    """
+    Gzip a streamed body chunk by chunk without holding anything back.
+
+    Each chunk is followed by a sync flush, so every SSE event reaches the
+    browser as soon as it is produced; the window shared across events
+    still compresses their repeated JSON framing well.
+
+    Args:
+        chunks: Iterable of str or bytes body chunks
+
+    Yields:
+        bytes: Gzip stream fragments
+    """
+    compressor = zlib.compressobj(1, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+
+def register_compression(app: Flask):
+    """
+    Gzip JSON, HTML and SSE responses for clients that accept it.
+
+    Buffered bodies under _COMPRESS_MIN_SIZE bytes are sent as-is. Streams
+    are compressed incrementally (see _gzip_stream). Responses that are
+    already encoded, such as the precompressed preset bodies, and files
+    served with direct passthrough are left alone. A compressed body's
+    ETag is made weak, so If-None-Match still matches the identity ETag
+    the view computed.
+
+    Args:
+        app: Flask application instance
+    """
+
+    @app.after_request
+    def compress_response(response):
+        if (response.status_code != 200
+                or response.direct_passthrough
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in _COMPRESSIBLE_MIMETYPES
+                or not request.accept_encodings['gzip']):
+            return response
+
+        if response.is_streamed:
+            response.response = _gzip_stream(response.response)
+            response.headers.pop('Content-Length', None)
+        else:
+            body = response.get_data()
+            if len(body) < _COMPRESS_MIN_SIZE:
+                return response
+            response.set_data(gzip.compress(body, compresslevel=6))
+
+        response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+
 def register_error_handlers(app: Flask):
     """
     Register all error handlers with the Flask application.
@@ -233,7 +356,7 @@ def register_error_handlers(app: Flask):
         Returns:
             tuple: (JSON response dict, HTTP status code 500)
         """
-        logger.error(f"Internal server error: {str(error)}", exc_info=True)
+        logger.error(f"Internal server error: {str(error)}", exc_info=app.debug or logger.isEnabledFor(logging.DEBUG))
         return jsonify({
             'error': 'Internal server error',
             'message': 'An internal server error occurred. Please try again later.',
@@ -246,7 +369,9 @@ def register_error_handlers(app: Flask):
         Handle any unexpected/uncaught exceptions.
 
         Catch-all handler for exceptions not covered by specific handlers.
-        Logs full traceback for debugging.
+        Logs the full traceback in debug mode or with LOG_LEVEL=DEBUG;
+        otherwise only the message, since formatting a traceback walks every
+        frame and reads source lines.
 
         Args:
             error: The exception object
@@ -254,7 +379,7 @@ def register_error_handlers(app: Flask):
         Returns:
             tuple: (JSON response dict, HTTP status code 500)
         """
-        logger.error(f"Unexpected error: {str(error)}", exc_info=True)
+        logger.error(f"Unexpected error: {str(error)}", exc_info=app.debug or logger.isEnabledFor(logging.DEBUG))
         return jsonify({
             'error': 'Unexpected error',
             'message': 'An unexpected error occurred. Please try again.',
@@ -288,7 +413,7 @@ def register_error_handlers(app: Flask):
         """
         Handle Ollama timeout errors (custom exception).
 
-        Returns 504 Gateway Timeout when request exceeds 120 second limit.
+        Returns 504 Gateway Timeout when request exceeds the OLLAMA_TIMEOUT limit.
         Usually indicates model is too large for available system resources.
 
         Args:
@@ -5,22 +5,80 @@ Handles admin request authorization with support for:
 - API key authentication
 - IP-based access control (loopback + allowlist)
 - Proxy header support (optional)
+- AdminGate, WSGI middleware enforcing the above before Flask handles the request
 """
 
+import re
 import secrets
+import functools
 import ipaddress
 import logging
 
+from werkzeug.wrappers import Request, Response
+
+from app import jsonutil
 from app.config import config
 
 logger = logging.getLogger(__name__)
 
+# Fast path for the common loopback spellings; anything else goes through ipaddress
+_OCTET = r'(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)'
+_LOOPBACK_RE = re.compile(rf'^(?:127\.{_OCTET}\.{_OCTET}\.{_OCTET}|::1|0:0:0:0:0:0:0:1)$')
+
+
+def _resolve_client_ip(req, forwarded_for: str) -> str:
+    """
+    Pick the client IP given an already-read X-Forwarded-For header value.
+
+    With TRUST_PROXY_HEADERS enabled, the rightmost X-Forwarded-For entry is
+    used: that is the address the trusted proxy appended. Entries to its left
+    come from the client and can be forged (e.g. a remote client sending
+    "X-Forwarded-For: 127.0.0.1" to pass the loopback check).
+
+    Args:
+        req: Flask request object
+        forwarded_for: Raw X-Forwarded-For header value ('' if absent)
+
+    Returns:
+        str: Client IP address, or empty string if unable to determine
+    """
+    # Only trust X-Forwarded-For if explicitly enabled (i.e., behind a trusted proxy)
+    if forwarded_for and config.TRUST_PROXY_HEADERS:
+        return forwarded_for.rsplit(',', 1)[-1].strip()
+
+    # Default to remote_addr which is set by the WSGI server and cannot be spoofed
+    return getattr(req, 'remote_addr', '') or ''
+
+
+@functools.lru_cache(maxsize=1024)
+def _canonical_ip(ip: str):
+    """
+    Return the canonical string form of an IP address, or None if invalid.
+
+    Args:
+        ip: IP address string as reported by the request
+
+    Returns:
+        str: Canonical address (e.g. '::1' for '0:0:0:0:0:0:0:1'), or None
+    """
+    try:
+        return str(ipaddress.ip_address(ip))
+    except ValueError:
+        return None
+
+
+@functools.lru_cache(maxsize=4)
+def _encoded_key(key: str) -> bytes:
+    """Return the configured API key as bytes, encoded once per distinct key."""
+    return key.encode('utf-8')
+
 
 def get_client_ip(req) -> str:
     """
     Return the best-effort client IP for the current request.
 
-    Security note: Only trusts X-Forwarded-For if TRUST_PROXY_HEADERS is enabled.
+    Security note: Only trusts X-Forwarded-For if TRUST_PROXY_HEADERS is enabled,
+    and then only its rightmost entry (the one added by the proxy).
     By default, uses req.remote_addr which cannot be spoofed by clients.
 
     Args:
@@ -32,14 +90,8 @@ def get_client_ip(req) -> str:
     if not req:
         return ''
 
-    # Only trust X-Forwarded-For if explicitly enabled (i.e., behind a trusted proxy)
-    if config.TRUST_PROXY_HEADERS:
-        forwarded_for = req.headers.get('X-Forwarded-For', '') if hasattr(req, 'headers') else ''
-        if forwarded_for:
-            return forwarded_for.split(',')[0].strip()
-
-    # Default to remote_addr which is set by the WSGI server and cannot be spoofed
-    return getattr(req, 'remote_addr', '') or ''
+    forwarded_for = req.headers.get('X-Forwarded-For', '') if hasattr(req, 'headers') else ''
+    return _resolve_client_ip(req, forwarded_for)
 
 
 def is_loopback_ip(ip: str) -> bool:
@@ -55,6 +107,9 @@ def is_loopback_ip(ip: str) -> bool:
     if not ip:
         return False
 
+    if _LOOPBACK_RE.match(ip):
+        return True
+
     try:
         return ipaddress.ip_address(ip).is_loopback
     except ValueError:
@@ -75,20 +130,21 @@ def authorize_admin_request(req):
     Returns:
         tuple: (authorized: bool, client_ip: str, forwarded_for: str, reason: str)
     """
-    client_ip = get_client_ip(req)
-    forwarded_for = req.headers.get('X-Forwarded-For', '') if hasattr(req, 'headers') else ''
+    headers = getattr(req, 'headers', None)
+    forwarded_for = headers.get('X-Forwarded-For', '') if headers is not None else ''
+    client_ip = _resolve_client_ip(req, forwarded_for)
 
     # Check API key if configured
     if config.ADMIN_API_KEY:
         args = getattr(req, 'args', {})
-        provided_key = (req.headers.get('X-Admin-API-Key') if hasattr(req, 'headers') else None) or args.get('admin_api_key')
-        if provided_key and secrets.compare_digest(str(provided_key), str(config.ADMIN_API_KEY)):
+        provided_key = (headers.get('X-Admin-API-Key') if headers is not None else None) or args.get('admin_api_key')
+        if provided_key and secrets.compare_digest(provided_key.encode('utf-8'), _encoded_key(config.ADMIN_API_KEY)):
             logger.info(f"Admin request authorized via API key from {client_ip}")
             return True, client_ip, forwarded_for, 'valid API key'
         return False, client_ip, forwarded_for, 'missing or invalid API key'
 
-    # Check IP-based access
-    if client_ip and (is_loopback_ip(client_ip) or client_ip in config.ADMIN_ALLOWED_IPS):
+    # Check IP-based access (allowlist entries are canonicalized at config load)
+    if client_ip and (is_loopback_ip(client_ip) or _canonical_ip(client_ip) in config.ADMIN_ALLOWED_IPS):
         logger.info(f"Admin request authorized via IP from {client_ip}")
         return True, client_ip, forwarded_for, 'allowed client IP'
 
@@ -98,3 +154,46 @@ def authorize_admin_request(req):
 
     logger.warning(f"Admin request denied: client IP {client_ip} not permitted")
     return False, client_ip, forwarded_for, 'client IP not permitted'
+
+
+# Body of every rejected admin request, encoded once
+_FORBIDDEN_BODY = jsonutil.dumps_bytes({
+    'success': False,
+    'error': 'forbidden',
+    'message': 'Unauthorized access to admin endpoint'
+})
+
+
+class AdminGate:
+    """
+    WSGI middleware rejecting unauthorized requests to /admin/ endpoints.
+
+    Runs authorize_admin_request() on the bare WSGI environ, before Flask
+    builds its request context, opens the session or routes the URL, and
+    answers a denied request with a 403 JSON body itself. Werkzeug parses
+    headers and query args lazily, so the check reads only what it needs
+    and never touches the request body. Other paths pass straight through.
+
+    Usage:
+        app.wsgi_app = AdminGate(app.wsgi_app)
+    """
+
+    PATH_PREFIX = '/admin/'
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        if environ.get('PATH_INFO', '').startswith(self.PATH_PREFIX):
+            authorized, client_ip, forwarded_for, reason = authorize_admin_request(Request(environ))
+            if not authorized:
+                logger.warning(
+                    "Denied %s request from %s (forwarded_for=%s, reason=%s)",
+                    environ.get('PATH_INFO'),
+                    client_ip or 'unknown',
+                    forwarded_for or 'none',
+                    reason,
+                )
+                response = Response(_FORBIDDEN_BODY, status=403, mimetype='application/json')
+                return response(environ, start_response)
+        return self.wsgi_app(environ, start_response)
@@ -7,11 +7,40 @@ See .env.example for available options and descriptions.
 
 import os
 import secrets
+import logging
+import ipaddress
 from dotenv import load_dotenv
 
 # Load environment variables from .env file if it exists
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+
+def _parse_allowed_ips(raw: str) -> frozenset:
+    """
+    Parse a comma separated IP list into canonical address strings.
+
+    Canonical forms make equivalent spellings (e.g. '::0:1' and '::1')
+    compare equal. Invalid entries are skipped with a warning.
+
+    Args:
+        raw: Comma separated IP addresses
+
+    Returns:
+        frozenset: Canonical IP address strings
+    """
+    allowed = set()
+    for entry in raw.split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        try:
+            allowed.add(str(ipaddress.ip_address(entry)))
+        except ValueError:
+            logger.warning(f"Ignoring invalid ADMIN_ALLOWED_IPS entry: {entry!r}")
+    return frozenset(allowed)
+
 
 class Config:
     """
@@ -34,6 +63,33 @@ class Config:
     # Must be installed locally: ollama pull <model-name>
     OLLAMA_MODEL = os.getenv('OLLAMA_MODEL', 'qwen3:latest')
 
+    # Send conversations to Ollama's /api/chat endpoint as a message list
+    # instead of flattening them into one /api/generate prompt. Lets Ollama
+    # apply the model's chat template and reuse its KV cache across turns
+    OLLAMA_USE_CHAT_API = os.getenv('OLLAMA_USE_CHAT_API', 'false').lower() in ('true', '1', 'yes')
+
+    # Seconds to reuse a non-streaming Ollama response for an identical
+    # model + prompt. Default: 0 (disabled) so "regenerate" always produces
+    # a fresh result; enable for deployments that see many repeated prompts
+    OLLAMA_RESPONSE_CACHE_TTL = int(os.getenv('OLLAMA_RESPONSE_CACHE_TTL', '0'))
+
+    # Maximum number of cached Ollama responses (least recently used are evicted)
+    OLLAMA_RESPONSE_CACHE_SIZE = int(os.getenv('OLLAMA_RESPONSE_CACHE_SIZE', '1024'))
+
+    # Seconds to wait for Ollama to connect and to send each response or
+    # stream chunk before giving up. Default: 120
+    OLLAMA_TIMEOUT = float(os.getenv('OLLAMA_TIMEOUT', '120'))
+
+    # Upper bound on generated tokens per request (Ollama's num_predict).
+    # Each request is capped at 512 + 4 tokens per word of the user's input,
+    # never more than this; 0 disables the cap. Default: 1024
+    OLLAMA_MAX_OUTPUT_TOKENS = int(os.getenv('OLLAMA_MAX_OUTPUT_TOKENS', '1024'))
+
+    # Extra attempts when the connection to Ollama cannot be opened (e.g.
+    # Ollama restarting). Timeouts and dropped connections are never retried,
+    # since the model may still be generating. Default: 2
+    OLLAMA_MAX_RETRIES = int(os.getenv('OLLAMA_MAX_RETRIES', '2'))
+
     # ============================================================================
     # Flask Configuration
     # ============================================================================
@@ -52,6 +108,15 @@ class Config:
     # Generate with: python -c "import secrets; print(secrets.token_hex(32))"
     FLASK_SECRET_KEY = os.getenv('FLASK_SECRET_KEY', secrets.token_hex(16))
 
+    # Cache lifetime in seconds that Flask sends for /static files
+    # Default: one year. Static URLs carry a content hash (?v=...), so a deploy
+    # that changes a file changes its URL. 0 makes browsers revalidate every load
+    STATIC_MAX_AGE = int(os.getenv('STATIC_MAX_AGE', '31536000'))
+
+    # Gzip JSON, HTML and SSE responses for clients that accept it
+    # Set to 'false' when a reverse proxy in front already compresses responses
+    COMPRESS_RESPONSES = os.getenv('COMPRESS_RESPONSES', 'true').lower() in ('true', '1', 'yes')
+
     # ============================================================================
     # Logging Configuration
     # ============================================================================
@@ -84,15 +149,13 @@ class Config:
 
     # Optional comma separated list of additional IPs allowed to access admin endpoints
     # Example: ADMIN_ALLOWED_IPS="192.168.1.10,10.0.0.5"
-    ADMIN_ALLOWED_IPS = {
-        ip.strip()
-        for ip in os.getenv('ADMIN_ALLOWED_IPS', '').split(',')
-        if ip.strip()
-    }
+    # Stored as canonical address strings; invalid entries are skipped
+    ADMIN_ALLOWED_IPS = _parse_allowed_ips(os.getenv('ADMIN_ALLOWED_IPS', ''))
 
     # Trust X-Forwarded-For header for IP detection (only enable if behind a trusted proxy)
     # WARNING: Only set to 'true' if your app is behind a reverse proxy (nginx, etc.)
-    # that properly strips untrusted X-Forwarded-For headers from clients
+    # that properly strips untrusted X-Forwarded-For headers from clients.
+    # Only the rightmost X-Forwarded-For entry (the one the proxy appended) is used
     TRUST_PROXY_HEADERS = os.getenv('TRUST_PROXY_HEADERS', 'false').lower() in ('true', '1', 'yes')
 
     # ============================================================================
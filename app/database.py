@@ -8,15 +8,124 @@ Manages SQLite database for:
 
 import sqlite3
 import json
+import time
+import atexit
 import secrets
 import logging
-from datetime import datetime, timezone, timedelta
+import functools
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from itertools import islice
 from typing import Optional
 
+from app import jsonutil
 from app.config import config
 
 logger = logging.getLogger(__name__)
 
+# Per-thread cache of open SQLite connections, keyed by database path
+_db_local = threading.local()
+
+# Set by init_db(); False when the SQLite build lacks the FTS5 extension
+_fts_enabled = False
+
+# (epoch second, formatted timestamp) cache used by _iso_utc_now()
+_ts_cache = (None, '')
+
+_ISO_UTC_FORMAT = '%Y-%m-%dT%H:%M:%S+00:00'
+
+# Column order of every prompt_history SELECT in get_history()
+HISTORY_KEYS = ('id', 'timestamp', 'user_input', 'generated_output', 'model', 'presets', 'mode')
+
+# Characters of generated_output returned by get_history(preview=True)
+HISTORY_PREVIEW_CHARS = 200
+
+
+def _iso_utc(epoch_seconds: float) -> str:
+    """Format a Unix timestamp as an ISO 8601 UTC string with second resolution."""
+    return time.strftime(_ISO_UTC_FORMAT, time.gmtime(epoch_seconds))
+
+
+def _iso_utc_now() -> str:
+    """
+    Return the current UTC time as an ISO 8601 string, cached per second.
+
+    Formatting is only redone when the wall-clock second changes. Rows are
+    strictly ordered by their autoincrement id, so second resolution is
+    enough for the stored timestamps.
+    """
+    global _ts_cache
+    second = int(time.time())
+    cached_second, formatted = _ts_cache
+    if second != cached_second:
+        formatted = _iso_utc(second)
+        _ts_cache = (second, formatted)
+    return formatted
+
+
+def _get_conn(db_path: Optional[str] = None) -> sqlite3.Connection:
+    """
+    Return a cached SQLite connection for the current thread.
+
+    Connections are opened once per thread and database path, then reused
+    for every subsequent history/conversation operation. Each connection is
+    opened in autocommit mode (writes use explicit transactions, see
+    _write_transaction) and configured for WAL journaling so readers do not
+    block behind a writer.
+
+    Paths starting with 'file:' are opened as SQLite URIs, e.g.
+    'file:name?mode=memory&cache=shared' for an in-memory database that all
+    threads share (the test suite uses this).
+
+    Args:
+        db_path: Path or 'file:' URI of the SQLite database
+            (defaults to config.DATABASE_PATH)
+
+    Returns:
+        sqlite3.Connection: Open connection owned by the calling thread
+    """
+    path = db_path or config.DATABASE_PATH
+    conns = getattr(_db_local, 'conns', None)
+    if conns is None:
+        conns = _db_local.conns = {}
+
+    conn = conns.get(path)
+    if conn is None:
+        conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, uri=path.startswith('file:')
+        )
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA mmap_size=268435456')
+        conns[path] = conn
+    return conn
+
+
+@contextmanager
+def _write_transaction(conn: sqlite3.Connection):
+    """
+    Run the enclosed statements inside a BEGIN IMMEDIATE transaction.
+
+    Takes the write lock up front so concurrent writers queue on the busy
+    timeout instead of failing mid-transaction on lock upgrade. Rolls back
+    and re-raises on any error.
+
+    Args:
+        conn: Connection returned by _get_conn()
+
+    Yields:
+        sqlite3.Connection: The same connection, inside the transaction
+    """
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        yield conn
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    conn.execute('COMMIT')
+
 
 def init_db():
     """
@@ -31,11 +140,37 @@ def init_db():
     - presets: JSON string of preset selections
     - mode: Generation mode (oneshot/chat)
 
+    An index on timestamp lets get_history() serve its
+    ORDER BY timestamp DESC LIMIT N query without sorting the table.
+
+    When SQLite is built with FTS5, a prompt_history_fts full-text index
+    mirrors user_input/generated_output and is kept in sync by triggers.
+    Existing rows are backfilled the first time the index is created.
+
     This function is idempotent - safe to call multiple times.
     Creates database file if it doesn't exist.
     """
+    global _fts_enabled
+
     logger.info("Initializing prompt history database")
-    conn = sqlite3.connect(config.DATABASE_PATH)
+    conn = _get_conn()
+
+    with _write_transaction(conn):
+        _create_schema(conn)
+
+    try:
+        with _write_transaction(conn):
+            _create_fts_index(conn)
+        _fts_enabled = True
+    except sqlite3.OperationalError as e:
+        _fts_enabled = False
+        logger.warning(f"FTS5 unavailable, history search will use LIKE scans: {e}")
+
+    logger.info("Database initialized successfully")
+
+
+def _create_schema(conn: sqlite3.Connection):
+    """Create prompt history and conversation tables plus their indexes."""
     cursor = conn.cursor()
 
     cursor.execute('''
@@ -59,14 +194,83 @@ def init_db():
         )
     ''')
 
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_prompt_timestamp
+        ON prompt_history (timestamp DESC)
+    ''')
+
     cursor.execute('''
         CREATE INDEX IF NOT EXISTS idx_conversation_updated
         ON conversation_store (updated_at)
     ''')
 
-    conn.commit()
-    conn.close()
-    logger.info("Database initialized successfully")
+
+def _create_fts_index(conn: sqlite3.Connection):
+    """
+    Create the FTS5 mirror of prompt_history and its sync triggers.
+
+    Raises:
+        sqlite3.OperationalError: If the SQLite build has no FTS5 support
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'prompt_history_fts'"
+    ).fetchone()
+
+    conn.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS prompt_history_fts USING fts5(
+            user_input,
+            generated_output,
+            content='prompt_history',
+            content_rowid='id'
+        )
+    ''')
+
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS prompt_history_fts_insert
+        AFTER INSERT ON prompt_history BEGIN
+            INSERT INTO prompt_history_fts(rowid, user_input, generated_output)
+            VALUES (new.id, new.user_input, new.generated_output);
+        END
+    ''')
+
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS prompt_history_fts_delete
+        AFTER DELETE ON prompt_history BEGIN
+            INSERT INTO prompt_history_fts(prompt_history_fts, rowid, user_input, generated_output)
+            VALUES ('delete', old.id, old.user_input, old.generated_output);
+        END
+    ''')
+
+    if not exists:
+        # Migrating an existing database: index rows saved before FTS existed
+        conn.execute("INSERT INTO prompt_history_fts(prompt_history_fts) VALUES ('rebuild')")
+
+
+def _fts_query(search_query: str) -> str:
+    """
+    Convert free-form search text into an FTS5 MATCH expression.
+
+    Each whitespace-separated word becomes a quoted prefix term, so user
+    input cannot inject FTS syntax and partially typed words still match.
+
+    Args:
+        search_query: Raw search text from the user
+
+    Returns:
+        str: MATCH expression requiring every term (implicit AND)
+    """
+    terms = search_query.split()
+    return ' '.join('"' + term.replace('"', '""') + '"*' for term in terms)
+
+
+_UPSERT_CONVERSATION = '''
+    INSERT INTO conversation_store (session_id, model_type, conversation, updated_at)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(session_id) DO UPDATE SET
+        model_type=excluded.model_type,
+        conversation=excluded.conversation,
+        updated_at=excluded.updated_at
+'''
 
 
 class ConversationStore:
@@ -75,9 +279,25 @@ class ConversationStore:
 
     Manages conversation sessions with automatic trimming to prevent
     token limit issues and memory bloat.
+
+    Recent messages of each active session are kept in memory as a
+    bounded deque, so appending a chat turn costs O(1) instead of
+    re-slicing the whole transcript. Writes are flushed to SQLite by a
+    background thread, so rapid chat turns on the same session collapse
+    into a single UPSERT and requests never wait on disk sync. Reads are
+    served from memory first, so callers always see their own writes.
+    At most max_cached_sessions sessions are held in memory; the least
+    recently used ones that are already on disk are dropped beyond that
+    and reloaded from SQLite on their next request. Because memory is
+    authoritative, one store must own the database: the app runs as a
+    single worker process and scales with threads.
     """
 
-    def __init__(self, db_path: str, max_messages: int = 21, max_age_hours: int = 24):
+    # Minimum seconds between age-based cleanup passes
+    CLEANUP_INTERVAL_SECONDS = 300
+
+    def __init__(self, db_path: str, max_messages: int = 21, max_age_hours: int = 24,
+                 flush_interval: float = 0.5, max_cached_sessions: int = 1024):
         """
         Initialize conversation store.
 
@@ -85,19 +305,35 @@ class ConversationStore:
             db_path: Path to SQLite database file
             max_messages: Maximum messages to keep (includes system prompt)
             max_age_hours: Auto-cleanup conversations older than this
+            flush_interval: Seconds between background flushes of buffered writes
+            max_cached_sessions: Most sessions kept in memory between requests
         """
         self.db_path = db_path
         self.max_messages = max_messages
         self.max_age_hours = max_age_hours
+        self.flush_interval = flush_interval
+        self.max_cached_sessions = max_cached_sessions
+
+        # session_id -> [system message or None, deque of messages, model_type, updated_at],
+        # least recently used first
+        self._sessions = OrderedDict()
+        # Session ids whose in-memory state has not been written yet
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._last_cleanup = None  # time.monotonic() of the last cleanup pass
+        self._flusher = None
+
         self._ensure_table()
+        atexit.register(self.flush)
 
     def _connect(self):
-        """Create database connection."""
-        return sqlite3.connect(self.db_path)
+        """Return the calling thread's cached database connection."""
+        return _get_conn(self.db_path)
 
     def _ensure_table(self):
         """Ensure conversation_store table exists."""
-        with self._connect() as conn:
+        with _write_transaction(self._connect()) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS conversation_store (
@@ -111,64 +347,119 @@ class ConversationStore:
                 CREATE INDEX IF NOT EXISTS idx_conversation_updated
                 ON conversation_store (updated_at)
             ''')
-            conn.commit()
 
-    def _trim_messages(self, messages):
+    def _trim_in_place(self, session_id: str, messages):
         """
-        Trim conversation to max_messages while preserving user-assistant pairs.
+        Fold messages into the session's bounded deque, preserving user-assistant pairs.
+
+        When messages is the previously stored conversation plus newly
+        appended turns (the normal chat flow), only the new turns are pushed
+        onto the existing deque. Any other list rebuilds the deque from
+        scratch. Once the window is full, a leading assistant message is
+        dropped so the history never starts mid-pair. Must be called with
+        _pending_lock held.
 
         Args:
+            session_id: Session identifier
             messages: List of message dicts with 'role' and 'content'
 
         Returns:
-            Trimmed list of messages
+            list: The session's state entry
+        """
+        system_msg = messages[0] if messages and messages[0].get('role') == 'system' else None
+        offset = 1 if system_msg else 0
+
+        state = self._sessions.get(session_id)
+        if state is not None and state[0] == system_msg:
+            window = state[1]
+            known = offset + len(window)
+            if len(messages) >= known and (not window or messages[known - 1] == window[-1]):
+                window.extend(islice(messages, known, None))
+            else:
+                state = None
+
+        if state is None:
+            maxlen = max(self.max_messages - offset, 0)
+            # Skip overflowing messages up front (plus one more if the window
+            # would start on an assistant reply) instead of pushing them through
+            excess = max(0, len(messages) - offset - maxlen)
+            if excess and messages[offset + excess].get('role') == 'assistant':
+                excess += 1
+            window = deque(islice(messages, offset + excess, None), maxlen=maxlen)
+            state = self._sessions[session_id] = [system_msg, window, None, None]
+            self._sessions.move_to_end(session_id)
+            self._evict_idle_sessions(keep=session_id)
+
+        if window and len(window) == window.maxlen and window[0].get('role') == 'assistant':
+            window.popleft()
+
+        return state
+
+    def _evict_idle_sessions(self, keep: str):
+        """
+        Drop least recently used sessions beyond max_cached_sessions.
+
+        Sessions with unflushed writes are skipped; they become evictable
+        once the flusher has written them. Must be called with
+        _pending_lock held.
+
+        Args:
+            keep: Session being loaded or saved, never evicted
         """
-        if not messages or len(messages) <= self.max_messages:
-            return list(messages)
-
-        # Extract system prompt if present
-        system_msg = None
-        conv_messages = messages
-        if messages[0].get('role') == 'system':
-            system_msg = messages[0]
-            conv_messages = messages[1:]
-
-        # Calculate how many conversation messages we can keep
-        max_conv_messages = self.max_messages - (1 if system_msg else 0)
-
-        # If we need to trim, ensure we preserve complete user-assistant pairs
-        if len(conv_messages) > max_conv_messages:
-            keep_count = max_conv_messages
-
-            # Check what role we'd be starting with after the trim
-            start_index = len(conv_messages) - keep_count
-            # If we're starting with an 'assistant' message, that means we're breaking a pair
-            if start_index < len(conv_messages) and conv_messages[start_index].get('role') == 'assistant':
-                # Move forward to the next user message to preserve the pair
-                keep_count -= 1
-
-            conv_messages = conv_messages[-keep_count:] if keep_count > 0 else []
-            # Ensure the last message is always an assistant response
-            if conv_messages and conv_messages[-1].get('role') == 'user':
-                conv_messages = conv_messages[:-1]
-
-        # Reconstruct the message list
-        result = []
-        if system_msg:
-            result.append(system_msg)
-        result.extend(conv_messages)
-        return result
+        excess = len(self._sessions) - self.max_cached_sessions
+        if excess <= 0:
+            return
+        evicted = []
+        for session_id in self._sessions:
+            if len(evicted) == excess:
+                break
+            if session_id != keep and session_id not in self._pending:
+                evicted.append(session_id)
+        for session_id in evicted:
+            del self._sessions[session_id]
+
+    @staticmethod
+    def _materialize(state):
+        """Return a session state entry as a fresh list of messages."""
+        system_msg, window = state[0], state[1]
+        messages = [system_msg] if system_msg else []
+        messages.extend(window)
+        return messages
 
     def _cleanup(self, conn):
-        """Delete old conversations past max_age_hours."""
+        """
+        Delete old conversations past max_age_hours and evict them from memory.
+
+        Runs at most once every CLEANUP_INTERVAL_SECONDS. An indexed
+        existence probe skips the DELETE (and its WAL write) when no
+        conversation has expired.
+        """
         if not self.max_age_hours:
             return
 
-        cutoff = datetime.now(timezone.utc) - timedelta(hours=self.max_age_hours)
-        conn.execute(
-            'DELETE FROM conversation_store WHERE updated_at < ?',
-            (cutoff.isoformat(),)
-        )
+        now = time.monotonic()
+        if self._last_cleanup is not None and now - self._last_cleanup < self.CLEANUP_INTERVAL_SECONDS:
+            return
+        self._last_cleanup = now
+
+        cutoff = _iso_utc(time.time() - self.max_age_hours * 3600)
+        expired_row = conn.execute(
+            'SELECT 1 FROM conversation_store WHERE updated_at < ? LIMIT 1',
+            (cutoff,)
+        ).fetchone()
+        if expired_row:
+            conn.execute(
+                'DELETE FROM conversation_store WHERE updated_at < ?',
+                (cutoff,)
+            )
+
+        with self._pending_lock:
+            expired = [
+                session_id for session_id, state in self._sessions.items()
+                if session_id not in self._pending and state[3] < cutoff
+            ]
+            for session_id in expired:
+                del self._sessions[session_id]
 
     def create_session(self, model_type: str, initial_messages=None) -> str:
         """
@@ -199,28 +490,40 @@ class ConversationStore:
         if not session_id:
             return [], None
 
-        with self._connect() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                'SELECT conversation, model_type FROM conversation_store WHERE session_id = ?',
-                (session_id,)
-            )
-            row = cursor.fetchone()
+        with self._pending_lock:
+            state = self._sessions.get(session_id)
+            if state is not None:
+                self._sessions.move_to_end(session_id)
+                return self._materialize(state), state[2]
+
+        row = self._connect().execute(
+            'SELECT conversation, model_type, updated_at FROM conversation_store WHERE session_id = ?',
+            (session_id,)
+        ).fetchone()
 
         if not row:
             return [], None
 
         try:
-            conversation = json.loads(row[0])
+            conversation = jsonutil.loads(row[0])
         except json.JSONDecodeError:
             conversation = []
 
+        with self._pending_lock:
+            if session_id not in self._sessions:
+                state = self._trim_in_place(session_id, conversation)
+                state[2], state[3] = row[1], row[2]
+
         return conversation, row[1]
 
     def save_messages(self, session_id: str, messages, model_type: str):
         """
         Save conversation messages for a session (with trimming).
 
+        The conversation is updated in memory and written to the database
+        by the background flusher; it is immediately visible to
+        get_conversation.
+
         Args:
             session_id: Session identifier
             messages: List of message dicts
@@ -229,24 +532,68 @@ class ConversationStore:
         Returns:
             Trimmed messages that were saved
         """
-        trimmed = self._trim_messages(messages)
-        serialized = json.dumps(trimmed)
-        timestamp = datetime.now(timezone.utc).isoformat()
-
-        with self._connect() as conn:
-            conn.execute('''
-                INSERT INTO conversation_store (session_id, model_type, conversation, updated_at)
-                VALUES (?, ?, ?, ?)
-                ON CONFLICT(session_id) DO UPDATE SET
-                    model_type=excluded.model_type,
-                    conversation=excluded.conversation,
-                    updated_at=excluded.updated_at
-            ''', (session_id, model_type, serialized, timestamp))
-            self._cleanup(conn)
-            conn.commit()
+        timestamp = _iso_utc_now()
+
+        with self._pending_lock:
+            state = self._trim_in_place(session_id, messages)
+            state[2], state[3] = model_type, timestamp
+            trimmed = self._materialize(state)
+
+            self._sessions.move_to_end(session_id)
+            self._pending.add(session_id)
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._flush_loop,
+                    name='conversation-store-flush',
+                    daemon=True
+                )
+                self._flusher.start()
 
         return trimmed
 
+    def _flush_loop(self):
+        """Background loop flushing buffered writes until the buffer stays empty."""
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+            with self._pending_lock:
+                if not self._pending:
+                    self._flusher = None
+                    return
+
+    def flush(self):
+        """
+        Write all buffered conversations to the database in one transaction.
+
+        Called periodically by the background flusher and at interpreter exit.
+        Conversations are serialized here rather than on every save. On
+        failure the sessions are marked pending again and retried later.
+        """
+        with self._flush_lock:
+            with self._pending_lock:
+                if not self._pending:
+                    return
+                batch, self._pending = self._pending, set()
+                snapshots = []
+                for session_id in batch:
+                    state = self._sessions.get(session_id)
+                    if state is not None:
+                        snapshots.append((session_id, state[2], self._materialize(state), state[3]))
+
+            rows = [
+                (session_id, model_type, jsonutil.dumps(messages), timestamp)
+                for session_id, model_type, messages, timestamp in snapshots
+            ]
+
+            try:
+                with _write_transaction(self._connect()) as conn:
+                    conn.executemany(_UPSERT_CONVERSATION, rows)
+                    self._cleanup(conn)
+            except sqlite3.Error as e:
+                logger.error(f"Failed to flush {len(rows)} conversation(s): {e}")
+                with self._pending_lock:
+                    self._pending.update(batch)
+
     def delete_session(self, session_id: Optional[str]):
         """
         Delete a conversation session.
@@ -257,15 +604,154 @@ class ConversationStore:
         if not session_id:
             return
 
-        with self._connect() as conn:
-            conn.execute('DELETE FROM conversation_store WHERE session_id = ?', (session_id,))
-            conn.commit()
+        with self._flush_lock:
+            with self._pending_lock:
+                self._pending.discard(session_id)
+                self._sessions.pop(session_id, None)
+            with _write_transaction(self._connect()) as conn:
+                conn.execute('DELETE FROM conversation_store WHERE session_id = ?', (session_id,))
 
     def clear_all(self):
         """Delete all conversation sessions."""
-        with self._connect() as conn:
-            conn.execute('DELETE FROM conversation_store')
-            conn.commit()
+        with self._flush_lock:
+            with self._pending_lock:
+                self._pending.clear()
+                self._sessions.clear()
+            with _write_transaction(self._connect()) as conn:
+                conn.execute('DELETE FROM conversation_store')
+
+
+@functools.lru_cache(maxsize=256)
+def _encode_preset_items(items: tuple) -> str:
+    """Serialize a canonical (sorted) tuple of preset items as a JSON object."""
+    return jsonutil.dumps(dict(items))
+
+
+def _encode_presets(presets) -> str:
+    """
+    Serialize preset selections for storage, caching repeated combinations.
+
+    Users tend to generate many prompts with the same preset selection, so
+    the encoded string is memoized by the dict's sorted items. Selections
+    containing unhashable values (such as hierarchical selection dicts)
+    are encoded directly.
+
+    Args:
+        presets: Dictionary of preset selections
+
+    Returns:
+        str: JSON encoding of presets
+    """
+    if not isinstance(presets, dict):
+        return jsonutil.dumps(presets)
+
+    key = tuple(sorted(presets.items(), key=lambda kv: kv[0]))
+    try:
+        return _encode_preset_items(key)
+    except TypeError:
+        return jsonutil.dumps(presets)
+
+
+_INSERT_HISTORY = '''
+    INSERT INTO prompt_history (timestamp, user_input, generated_output, model, presets, mode)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+
+# Seconds the background writer waits to batch records from queue_history()
+HISTORY_FLUSH_INTERVAL = 0.5
+
+# (timestamp, user_input, output, model, presets, mode) rows waiting to be written
+_pending_history = []
+_pending_history_lock = threading.Lock()
+_history_flush_lock = threading.Lock()
+_history_flusher = None
+
+
+def queue_history(user_input, output, model, presets, mode):
+    """
+    Queue a generated prompt for saving to history without waiting on disk.
+
+    Takes the same arguments as save_to_history(). The record is timestamped
+    now and written by a background thread together with any others queued
+    within HISTORY_FLUSH_INTERVAL, so the request returns without paying for
+    the SQLite commit. get_history() and delete_history_item() flush the
+    queue first, so callers still see their own writes.
+    """
+    global _history_flusher
+    with _pending_history_lock:
+        _pending_history.append((_iso_utc_now(), user_input, output, model, presets, mode))
+        if _history_flusher is None:
+            _history_flusher = threading.Thread(
+                target=_history_flush_loop,
+                name='history-flush',
+                daemon=True
+            )
+            _history_flusher.start()
+
+
+def _history_flush_loop():
+    """Background loop writing queued history until the queue stays empty."""
+    global _history_flusher
+    while True:
+        time.sleep(HISTORY_FLUSH_INTERVAL)
+        flush_history()
+        with _pending_history_lock:
+            if not _pending_history:
+                _history_flusher = None
+                return
+
+
+def flush_history():
+    """
+    Write all queued history records in one transaction.
+
+    Called by the background writer, before history reads and at
+    interpreter exit. On failure the records are queued again and retried.
+    """
+    with _history_flush_lock:
+        with _pending_history_lock:
+            if not _pending_history:
+                return
+            batch = _pending_history[:]
+            _pending_history.clear()
+
+        rows = [
+            (timestamp, user_input, output, model, _encode_presets(presets), mode)
+            for timestamp, user_input, output, model, presets, mode in batch
+        ]
+        if not _insert_history_rows(rows):
+            with _pending_history_lock:
+                _pending_history[:0] = batch
+
+
+atexit.register(flush_history)
+
+
+def _insert_history_rows(rows):
+    """
+    Insert encoded prompt_history rows in a single transaction.
+
+    Args:
+        rows: List of (timestamp, user_input, output, model, presets_json, mode)
+
+    Returns:
+        list: IDs of the inserted records in input order, or [] if failed
+    """
+    if not rows:
+        return []
+    try:
+        with _write_transaction(_get_conn()) as conn:
+            conn.executemany(_INSERT_HISTORY, rows)
+            last_id = conn.execute('SELECT last_insert_rowid()').fetchone()[0]
+
+        # The write lock is held for the whole batch, so AUTOINCREMENT ids are consecutive
+        record_ids = list(range(last_id - len(rows) + 1, last_id + 1))
+        logger.debug(f"Saved {len(record_ids)} prompt(s) to history, last ID: {last_id}")
+        return record_ids
+    except Exception as e:
+        logger.error(f"Failed to save to history: {str(e)}")
+        return []
 
 
 def save_to_history(user_input, output, model, presets, mode):
@@ -282,77 +768,107 @@ def save_to_history(user_input, output, model, presets, mode):
     Returns:
         int: The ID of the inserted record, or None if failed
     """
-    try:
-        conn = sqlite3.connect(config.DATABASE_PATH)
-        cursor = conn.cursor()
+    record_ids = save_to_history_bulk([(user_input, output, model, presets, mode)])
+    return record_ids[0] if record_ids else None
+
 
-        timestamp = datetime.now(timezone.utc).isoformat()
-        presets_json = json.dumps(presets)
+def save_to_history_bulk(records):
+    """
+    Save many generated prompts to the history database in one transaction.
 
-        cursor.execute('''
-            INSERT INTO prompt_history (timestamp, user_input, generated_output, model, presets, mode)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (timestamp, user_input, output, model, presets_json, mode))
+    All rows are inserted with a single executemany inside one
+    BEGIN IMMEDIATE transaction, so bulk imports pay the commit cost once
+    instead of once per record.
 
-        record_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+    Args:
+        records: Iterable of (user_input, output, model, presets, mode) tuples,
+            with the same meaning as the save_to_history() arguments. A
+            record may carry a sixth element, its original ISO 8601 UTC
+            timestamp (as stored in the timestamp column), so imported
+            history keeps its dates; records without one, or with None, are
+            stamped with the current time
 
-        logger.debug(f"Saved prompt to history with ID: {record_id}")
-        return record_id
+    Returns:
+        list: IDs of the inserted records in input order, or [] if failed
+    """
+    try:
+        now = _iso_utc_now()
+        rows = []
+        for record in records:
+            user_input, output, model, presets, mode, *rest = record
+            if len(rest) > 1:
+                raise ValueError(f"history record has {len(record)} fields, expected 5 or 6")
+            timestamp = rest[0] if rest and rest[0] is not None else now
+            rows.append((timestamp, user_input, output, model, _encode_presets(presets), mode))
     except Exception as e:
         logger.error(f"Failed to save to history: {str(e)}")
-        return None
+        return []
+    return _insert_history_rows(rows)
+
+
+def _output_column(preview: bool, alias: str = '') -> str:
+    """Return the SQL expression selecting generated_output, truncated for previews."""
+    column = f'{alias}generated_output'
+    return f'substr({column}, 1, {HISTORY_PREVIEW_CHARS})' if preview else column
 
 
-def get_history(limit=50, search_query=None):
+def get_history(limit=50, search_query=None, preview=False):
     """
     Retrieve prompt history from the database.
 
+    Searches go through the FTS5 index when available, matching every
+    word of the query as a prefix. Without FTS5 they fall back to a
+    substring scan. Either way results are newest first, like the
+    unfiltered listing, and a blank or whitespace-only query means no
+    filter.
+
     Args:
         limit: Maximum number of records to return (default: 50)
         search_query: Optional search string to filter results
+        preview: Return only the first HISTORY_PREVIEW_CHARS characters of
+            each generated_output; SQLite truncates before the row is read
 
     Returns:
         list: List of history records as dictionaries
     """
+    flush_history()
     try:
-        conn = sqlite3.connect(config.DATABASE_PATH)
-        conn.row_factory = sqlite3.Row  # Enable column access by name
-        cursor = conn.cursor()
-
-        if search_query:
-            # Search in user_input and generated_output
-            cursor.execute('''
-                SELECT id, timestamp, user_input, generated_output, model, presets, mode
+        cursor = _get_conn().cursor()
+
+        search_query = search_query.strip() if search_query else ''
+        match_expr = _fts_query(search_query) if search_query and _fts_enabled else ''
+        if match_expr:
+            # Full-text search over user_input and generated_output
+            cursor.execute(f'''
+                SELECT h.id, h.timestamp, h.user_input, {_output_column(preview, 'h.')}, h.model, h.presets, h.mode
+                FROM prompt_history h
+                JOIN prompt_history_fts f ON h.id = f.rowid
+                WHERE prompt_history_fts MATCH ?
+                ORDER BY h.timestamp DESC, h.id DESC
+                LIMIT ?
+            ''', (match_expr, limit))
+        elif search_query:
+            # Substring scan when FTS5 is unavailable
+            cursor.execute(f'''
+                SELECT id, timestamp, user_input, {_output_column(preview)}, model, presets, mode
                 FROM prompt_history
                 WHERE user_input LIKE ? OR generated_output LIKE ?
-                ORDER BY timestamp DESC
+                ORDER BY timestamp DESC, id DESC
                 LIMIT ?
             ''', (f'%{search_query}%', f'%{search_query}%', limit))
         else:
-            cursor.execute('''
-                SELECT id, timestamp, user_input, generated_output, model, presets, mode
+            cursor.execute(f'''
+                SELECT id, timestamp, user_input, {_output_column(preview)}, model, presets, mode
                 FROM prompt_history
-                ORDER BY timestamp DESC
+                ORDER BY timestamp DESC, id DESC
                 LIMIT ?
             ''', (limit,))
 
-        rows = cursor.fetchall()
-        conn.close()
-
-        # Convert rows to dictionaries
-        history = []
-        for row in rows:
-            history.append({
-                'id': row['id'],
-                'timestamp': row['timestamp'],
-                'user_input': row['user_input'],
-                'generated_output': row['generated_output'],
-                'model': row['model'],
-                'presets': json.loads(row['presets']) if row['presets'] else {},
-                'mode': row['mode']
-            })
+        # Convert positional rows to dictionaries, then decode presets in place
+        history = [dict(zip(HISTORY_KEYS, row, strict=True)) for row in cursor]
+        for item in history:
+            presets = item['presets']
+            item['presets'] = jsonutil.loads(presets) if presets else {}
 
         logger.debug(f"Retrieved {len(history)} history records")
         return history
@@ -371,15 +887,11 @@ def delete_history_item(item_id):
     Returns:
         bool: True if deletion was successful, False otherwise
     """
+    flush_history()
     try:
-        conn = sqlite3.connect(config.DATABASE_PATH)
-        cursor = conn.cursor()
-
-        cursor.execute('DELETE FROM prompt_history WHERE id = ?', (item_id,))
-
-        deleted = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
+        with _write_transaction(_get_conn()) as conn:
+            cursor = conn.execute('DELETE FROM prompt_history WHERE id = ?', (item_id,))
+            deleted = cursor.rowcount > 0
 
         if deleted:
             logger.info(f"Deleted history item with ID: {item_id}")
@@ -21,7 +21,7 @@ class OllamaConnectionError(Exception):
 
 class OllamaTimeoutError(Exception):
     """
-    Raised when Ollama request exceeds timeout threshold (120 seconds).
+    Raised when Ollama request exceeds timeout threshold (OLLAMA_TIMEOUT, 120 seconds by default).
 
     This typically indicates:
     - Model is too large for available RAM
@@ -6,16 +6,34 @@ including connection management, auto-discovery, and streaming support.
 """
 
 import os
+import re
 import sys
 import json
 import logging
+import functools
 import socket
+import time
 import ipaddress
+import queue
+import hashlib
+import threading
+import subprocess
 import requests
+import urllib3
+from collections import OrderedDict
 from typing import Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from requests.exceptions import ConnectionError, Timeout, RequestException
+from urllib.parse import urlsplit
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from requests.adapters import HTTPAdapter
+from requests.exceptions import (
+    ChunkedEncodingError,
+    ConnectionError,
+    ContentDecodingError,
+    RequestException,
+    Timeout
+)
 
+from app import jsonutil
 from app.config import config
 from app.errors import (
     OllamaConnectionError,
@@ -27,11 +45,49 @@ from app.errors import (
 # Initialize logger for this module
 logger = logging.getLogger(__name__)
 
+# Default port Ollama listens on
+OLLAMA_PORT = 11434
+
+# URL suffixes recognised by the URL helpers below
+_API_GENERATE = '/api/generate'
+_API_GENERATE_LEN = len(_API_GENERATE)
+_API_SUFFIX = '/api'
+_API_SUFFIX_LEN = len(_API_SUFFIX)
+
+# Shared HTTP session so probes and generation requests reuse keep-alive
+# connections. The pool is sized for several concurrent Flask request
+# threads (e.g. parallel streams) talking to the same Ollama host.
+_OLLAMA_SESSION = requests.Session()
+_OLLAMA_ADAPTER = HTTPAdapter(pool_connections=8, pool_maxsize=32)
+_OLLAMA_SESSION.mount('http://', _OLLAMA_ADAPTER)
+_OLLAMA_SESSION.mount('https://', _OLLAMA_ADAPTER)
+
+# Non-streaming responses keyed by a digest of model + prompt, stored as
+# (expires_at, response) in least-recently-used order
+_response_cache = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+# Non-streaming requests currently being sent to Ollama, keyed like the
+# response cache; concurrent identical calls wait on the same Future
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+# Line prefixes for conversation turns in an /api/generate prompt
+_ROLE_PREFIX = {"user": "User: ", "assistant": "Assistant: "}
+
+# Marks the end of a stream read ahead by _buffered_lines()
+_STREAM_END = object()
+
+# IPv4 address as printed by `arp -an` (macOS/BSD) and `arp -a` (Windows)
+_ARP_IP_PATTERN = re.compile(r'(\d{1,3}(?:\.\d{1,3}){3})')
 
+
+@functools.lru_cache(maxsize=256)
 def get_ollama_base_url(url: str) -> str:
     """Return the base URL for the Ollama server without the /api suffix.
 
     Handles URLs with path prefixes correctly by working from right to left.
+    Results are memoized since the same few URLs are resolved repeatedly.
     Examples:
         'http://localhost:11434/api/generate' -> 'http://localhost:11434'
         'https://example.com/api/ollama/api/generate' -> 'https://example.com/api/ollama'
@@ -48,17 +104,20 @@ def get_ollama_base_url(url: str) -> str:
     stripped = url.rstrip('/')
 
     # Work from right to left to handle prefixed paths correctly
-    if stripped.endswith('/api/generate'):
-        return stripped[:-len('/api/generate')]
-    if stripped.endswith('/api'):
-        return stripped[:-len('/api')]
+    if stripped.endswith(_API_GENERATE):
+        return stripped[:-_API_GENERATE_LEN]
+    if stripped.endswith(_API_SUFFIX):
+        return stripped[:-_API_SUFFIX_LEN]
 
     return stripped
 
 
+@functools.lru_cache(maxsize=256)
 def build_generate_url(base_url: str) -> str:
     """Ensure the provided base URL targets the /api/generate endpoint.
 
+    Results are memoized since the same few URLs are resolved repeatedly.
+
     Args:
         base_url: Base URL or partial URL for Ollama server
 
@@ -74,14 +133,54 @@ def build_generate_url(base_url: str) -> str:
 
     url = url.rstrip('/')
 
-    if url.endswith('/api/generate'):
+    if url.endswith(_API_GENERATE):
         return url
-    if url.endswith('/api'):
+    if url.endswith(_API_SUFFIX):
         return f'{url}/generate'
-    if url.endswith('/api/'):
-        return f'{url}generate'
 
-    return f'{url}/api/generate'
+    return f'{url}{_API_GENERATE}'
+
+
+@functools.lru_cache(maxsize=256)
+def build_chat_url(url: str) -> str:
+    """Return the /api/chat endpoint on the same Ollama server as url.
+
+    Args:
+        url: Any Ollama URL (typically config.OLLAMA_URL)
+
+    Returns:
+        str: Base URL with /api/chat appended
+    """
+    return f'{get_ollama_base_url(url)}/api/chat'
+
+
+@functools.lru_cache(maxsize=256)
+def build_tags_url(url: str) -> str:
+    """Return the /api/tags endpoint on the same Ollama server as url.
+
+    Args:
+        url: Any Ollama URL (typically config.OLLAMA_URL)
+
+    Returns:
+        str: Base URL with /api/tags appended
+    """
+    return f'{get_ollama_base_url(url)}/api/tags'
+
+
+def ollama_get(url: str, timeout: float = 10):
+    """Send a GET request to Ollama over the shared keep-alive session.
+
+    Args:
+        url: Full Ollama endpoint URL (e.g. .../api/tags)
+        timeout: Seconds to wait for the response
+
+    Returns:
+        requests.Response: The response from Ollama
+
+    Raises:
+        requests.RequestException: The request failed
+    """
+    return _OLLAMA_SESSION.get(url, timeout=timeout)
 
 
 def check_ollama_connection(base_url: str, timeout: float = 2.0) -> bool:
@@ -89,6 +188,9 @@ def check_ollama_connection(base_url: str, timeout: float = 2.0) -> bool:
 
     Validates the response contains Ollama-specific fields to ensure we're
     actually connecting to an Ollama server, not just any HTTP endpoint.
+    Only the first 256 bytes of the response are read for this check.
+    A bare TCP connect is attempted first so hosts with nothing listening
+    are rejected without an HTTP round trip.
 
     Args:
         base_url: Base URL of the Ollama server (without /api suffix)
@@ -100,26 +202,38 @@ def check_ollama_connection(base_url: str, timeout: float = 2.0) -> bool:
     if not base_url:
         return False
 
-    test_url = f'{base_url.rstrip("/")}/api/version'
     try:
-        response = requests.get(test_url, timeout=timeout)
-        response.raise_for_status()
+        # .port raises ValueError for a non-numeric or out-of-range port
+        parts = urlsplit(base_url)
+        host = parts.hostname
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        with socket.create_connection((host, port), timeout=timeout):
+            pass
+    except (OSError, TypeError, ValueError) as exc:
+        logger.debug("Ollama TCP pre-check failed for %s: %s", base_url, exc)
+        return False
 
-        # Validate this is actually an Ollama server by checking response structure
-        try:
-            data = response.json()
-            # Ollama's /api/version endpoint returns {"version": "..."}
-            if not isinstance(data, dict) or 'version' not in data:
-                logger.debug(f"Response from {base_url} doesn't match Ollama API structure")
-                return False
-        except (json.JSONDecodeError, ValueError):
-            logger.debug(f"Response from {base_url} is not valid JSON")
+    test_url = f'{base_url.rstrip("/")}/api/version'
+    try:
+        with _OLLAMA_SESSION.get(
+            test_url,
+            timeout=timeout,
+            stream=True,
+            headers={'Accept-Encoding': 'identity'}
+        ) as response:
+            response.raise_for_status()
+            # Ollama's /api/version endpoint returns {"version": "..."}; the key
+            # appears in the first few bytes, so there is no need to parse the body
+            head = response.raw.read(256, decode_content=True)
+
+        if b'"version"' not in head:
+            logger.debug("Response from %s doesn't match Ollama API structure", base_url)
             return False
 
-        logger.debug(f"Successfully connected to Ollama at {base_url}")
+        logger.debug("Successfully connected to Ollama at %s", base_url)
         return True
-    except RequestException as exc:
-        logger.debug(f"Ollama connection test failed for {base_url}: {exc}")
+    except (RequestException, urllib3.exceptions.HTTPError) as exc:
+        logger.debug("Ollama connection test failed for %s: %s", base_url, exc)
         return False
 
 
@@ -135,19 +249,63 @@ def get_local_ip() -> Optional[str]:
             sock.connect(('8.8.8.8', 80))
             return sock.getsockname()[0]
     except OSError as exc:
-        logger.debug(f"Unable to determine local IP address: {exc}")
+        logger.debug("Unable to determine local IP address: %s", exc)
         return None
 
 
-def auto_discover_ollama_server(timeout: float = 0.75, max_workers: int = 20) -> Optional[str]:
+def _live_neighbors() -> set:
+    """Return IPv4 addresses of hosts currently present in the ARP cache.
+
+    Reads /proc/net/arp on Linux (skipping incomplete entries with flags
+    0x0). On other platforms, parses the output of the system ``arp``
+    command instead.
+
+    Returns:
+        set: Neighbor IP addresses as strings (empty if none could be read)
+    """
+    neighbors = set()
+
+    try:
+        with open('/proc/net/arp', 'r', encoding='utf-8') as f:
+            next(f, None)  # Skip header row
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 3 and fields[2] != '0x0':
+                    neighbors.add(fields[0])
+        return neighbors
+    except OSError:
+        pass
+
+    command = ['arp', '-a'] if sys.platform.startswith('win') else ['arp', '-an']
+    try:
+        output = subprocess.run(command, capture_output=True, text=True, timeout=2).stdout
+    except (OSError, subprocess.SubprocessError) as exc:
+        logger.debug("Unable to read ARP table: %s", exc)
+        return neighbors
+
+    for line in output.splitlines():
+        if 'incomplete' in line:
+            continue
+        match = _ARP_IP_PATTERN.search(line)
+        if match:
+            neighbors.add(match.group(1))
+
+    return neighbors
+
+
+def auto_discover_ollama_server(timeout: float = 0.75, max_workers: int = 64) -> Optional[str]:
     """Scan the local /24 network for an Ollama instance on port 11434.
 
-    Uses parallel scanning to check multiple hosts simultaneously, reducing
-    total scan time from ~3 minutes to under 10 seconds for a /24 network.
+    Hosts already present in the ARP cache are probed first, which usually
+    narrows the search to a handful of live machines. Only when none of
+    them runs Ollama does the scan fall back to every address in the /24.
+    Each probe opens a plain TCP connection before issuing any HTTP request
+    (see check_ollama_connection), so addresses with nothing listening on
+    the port are rejected cheaply and many probes can run at once.
 
     Args:
         timeout: Connection timeout per host in seconds (default: 0.75)
-        max_workers: Maximum number of parallel connection attempts (default: 20)
+        max_workers: Maximum number of parallel connection attempts (default: 64)
 
     Returns:
         str: Full Ollama URL (with /api/generate) if found, None otherwise
@@ -160,43 +318,75 @@ def auto_discover_ollama_server(timeout: float = 0.75, max_workers: int = 20) ->
     try:
         network = ipaddress.ip_network(f'{local_ip}/24', strict=False)
     except ValueError as exc:
-        logger.debug(f"Invalid network definition for discovery: {exc}")
+        logger.debug("Invalid network definition for discovery: %s", exc)
         return None
 
-    logger.info(f"Scanning {network} for Ollama servers on port 11434 (parallel mode)")
-
     # Build list of candidate IPs to scan (exclude local IP)
-    all_hosts = [str(host) for host in network.hosts()]
-    candidates = [ip for ip in all_hosts if ip != local_ip]
+    all_hosts = [str(host) for host in network.hosts() if str(host) != local_ip]
+
+    neighbors = _live_neighbors()
+    neighbor_hosts = [(ip, f'http://{ip}:{OLLAMA_PORT}') for ip in all_hosts if ip in neighbors]
 
-    def check_host(host_ip: str) -> Optional[str]:
-        """Check a single host for Ollama service."""
-        candidate_base = f'http://{host_ip}:11434'
+    def check_host(candidate) -> Optional[str]:
+        """Check a single (host_ip, base_url) candidate for Ollama service."""
+        host_ip, candidate_base = candidate
         if check_ollama_connection(candidate_base, timeout=timeout):
             return build_generate_url(candidate_base)
         return None
 
-    # Scan hosts in parallel
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all tasks
-        future_to_host = {executor.submit(check_host, ip): ip for ip in candidates}
-
-        # Return the first successful result
-        for future in as_completed(future_to_host):
-            result = future.result()
-            if result:
-                host_ip = future_to_host[future]
-                logger.info(f"Discovered Ollama server at http://{host_ip}:11434")
-                # Cancel remaining pending tasks since we found a server
-                for f in future_to_host:
-                    if not f.done():
-                        f.cancel()
-                return result
+    if neighbor_hosts:
+        logger.info("Probing %d ARP neighbors in %s for Ollama servers", len(neighbor_hosts), network)
+        result = _scan_hosts(neighbor_hosts, check_host, max_workers)
+        if result:
+            return result
+
+    remaining = [(ip, f'http://{ip}:{OLLAMA_PORT}') for ip in all_hosts if ip not in neighbors]
+    logger.info("Scanning %s for Ollama servers on port %s (parallel mode)", network, OLLAMA_PORT)
+    result = _scan_hosts(remaining, check_host, max_workers)
+    if result:
+        return result
 
     logger.info("Ollama auto-discovery scan completed without finding a server")
     return None
 
 
+def _scan_hosts(candidates, check_host, max_workers: int) -> Optional[str]:
+    """Run check_host over candidates in parallel and return the first hit.
+
+    Args:
+        candidates: List of (host_ip, base_url) tuples to probe
+        check_host: Callable returning an Ollama URL or None for one candidate
+        max_workers: Maximum number of parallel connection attempts
+
+    Returns:
+        str: First Ollama URL found, or None if no candidate responded
+    """
+    if not candidates:
+        return None
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(candidates)))
+    try:
+        # Submit all tasks
+        future_to_host = {executor.submit(check_host, candidate): candidate[0] for candidate in candidates}
+
+        # Return as soon as any probe succeeds
+        pending = set(future_to_host)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if result:
+                    host_ip = future_to_host[future]
+                    logger.info("Discovered Ollama server at http://%s:%s", host_ip, OLLAMA_PORT)
+                    logger.debug("Abandoning %d outstanding discovery probe(s)", len(pending))
+                    return result
+    finally:
+        # Don't wait for in-flight probes to time out; queued ones are cancelled
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return None
+
+
 def _update_ollama_url(new_url: str) -> None:
     """Helper function to update both config.OLLAMA_URL and environment variable.
 
@@ -287,7 +477,108 @@ def ensure_ollama_connection() -> Optional[str]:
         )
 
 
-def call_ollama(messages, model=None, stream=False):
+def _response_cache_key(model: str, prompt: str) -> bytes:
+    """Return the response cache key for a model and full prompt."""
+    return hashlib.blake2b(f"{model}\0{prompt}".encode('utf-8'), digest_size=16).digest()
+
+
+def _get_cached_response(key: bytes) -> Optional[str]:
+    """Return a cached, unexpired response for key, or None."""
+    with _response_cache_lock:
+        entry = _response_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _response_cache[key]
+            return None
+        _response_cache.move_to_end(key)
+        return entry[1]
+
+
+def _store_response(key: bytes, response: str) -> None:
+    """Cache a response for config.OLLAMA_RESPONSE_CACHE_TTL seconds."""
+    with _response_cache_lock:
+        _response_cache[key] = (time.monotonic() + config.OLLAMA_RESPONSE_CACHE_TTL, response)
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > config.OLLAMA_RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
+
+def _singleflight(key: bytes, fn):
+    """
+    Run fn() once for concurrent callers that share key.
+
+    The first caller runs fn; callers arriving while it is in flight wait for
+    and share its result (or exception) instead of issuing a second request.
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = Future()
+            _inflight[key] = future
+
+    if owner:
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with _inflight_lock:
+                _inflight.pop(key, None)
+    else:
+        logger.debug("Waiting on identical in-flight Ollama request")
+    return future.result()
+
+
+def _build_prompt(messages) -> str:
+    """
+    Flatten a message list into a single /api/generate prompt string.
+
+    The system message goes first, followed by the conversation as
+    "User:"/"Assistant:" lines, ending with "Assistant:" to prompt a reply.
+
+    Args:
+        messages: Message dicts with 'role' and 'content' keys
+
+    Returns:
+        str: The formatted prompt
+    """
+    # Collect pieces in a list and join once; repeated += on a growing
+    # string copies the whole conversation for every message
+    system_msg = ""
+    parts = []
+
+    for msg in messages:
+        role = msg["role"]
+        if role == "system":
+            # Extract system message (instructions for the AI)
+            system_msg = msg["content"]
+            continue
+        # Prefix user/assistant turns; unknown roles are skipped
+        prefix = _ROLE_PREFIX.get(role)
+        if prefix:
+            parts += (prefix, msg["content"], "\n")
+
+    parts.append("Assistant:")
+    if system_msg:
+        parts[:0] = (system_msg, "\n\n")
+    return "".join(parts)
+
+
+def _response_text(result: dict, chat_api: bool):
+    """
+    Return the generated text from an Ollama response object, or None.
+
+    /api/generate puts it in 'response'; /api/chat in 'message.content'.
+    """
+    if chat_api:
+        message = result.get('message')
+        return message.get('content') if isinstance(message, dict) else None
+    return result.get('response')
+
+
+def call_ollama(messages, model=None, stream=False, no_cache=False):
     """
     Call Ollama API to generate text based on conversation messages.
 
@@ -307,6 +598,9 @@ def call_ollama(messages, model=None, stream=False):
         stream (bool, optional): If True, returns a generator yielding tokens.
                                 If False, returns complete response string.
                                 Default: False
+        no_cache (bool, optional): Skip the response cache for this call even
+                                  when OLLAMA_RESPONSE_CACHE_TTL is set.
+                                  Default: False
 
     Returns:
         str: The complete response from Ollama (if stream=False)
@@ -314,63 +608,439 @@ def call_ollama(messages, model=None, stream=False):
 
     Raises:
         OllamaConnectionError: Cannot connect to Ollama server (check if running)
-        OllamaTimeoutError: Request exceeded 120 second timeout (model too large?)
+        OllamaTimeoutError: Request exceeded OLLAMA_TIMEOUT (model too large?)
         OllamaModelNotFoundError: Model not installed (need 'ollama pull')
         OllamaAPIError: API returned error or unexpected format
 
     Notes:
-        - Timeout is fixed at 120 seconds
-        - Messages are formatted into a single prompt string for Ollama
+        - Timeout, output token limit and connection retries come from
+          OLLAMA_TIMEOUT, OLLAMA_MAX_OUTPUT_TOKENS (see _output_token_cap)
+          and OLLAMA_MAX_RETRIES
+        - Messages are formatted into a single prompt string for Ollama, or
+          sent as-is to /api/chat when OLLAMA_USE_CHAT_API is enabled
         - System message is placed at the start, followed by conversation
         - All custom exceptions include troubleshooting guidance
+        - With OLLAMA_RESPONSE_CACHE_TTL > 0, non-streaming responses are
+          reused for identical model + prompt until they expire
+        - Concurrent non-streaming calls for the same model + prompt share a
+          single Ollama request
     """
     # Use configured default model if none specified
     if model is None:
         model = config.OLLAMA_MODEL
 
-    logger.debug(f"Attempting to call Ollama API with model: {model}, stream: {stream}")
-
-    # Build the prompt from messages
-    # Ollama's /api/generate endpoint expects a single prompt string,
-    # so we convert the message list into a formatted conversation
-    system_msg = ""
-    conversation = ""
-
-    for msg in messages:
-        if msg["role"] == "system":
-            # Extract system message (instructions for the AI)
-            system_msg = msg["content"]
-        elif msg["role"] == "user":
-            # Format user messages with "User:" prefix
-            conversation += f"User: {msg['content']}\n"
-        elif msg["role"] == "assistant":
-            # Format assistant messages (conversation history)
-            conversation += f"Assistant: {msg['content']}\n"
-
-    # Assemble the full prompt
-    # System message goes first, then conversation, ending with "Assistant:" to prompt response
-    if system_msg:
-        full_prompt = f"{system_msg}\n\n{conversation}Assistant:"
+    logger.debug("Attempting to call Ollama API with model: %s, stream: %s", model, stream)
+
+    chat_api = config.OLLAMA_USE_CHAT_API
+    if chat_api:
+        # /api/chat takes the message list natively, letting Ollama apply the
+        # model's chat template and reuse its KV cache for a shared prefix
+        messages = list(messages)
+        payload = {
+            "model": model,
+            "messages": messages,
+            "stream": stream
+        }
+        cache_text = jsonutil.dumps(messages)
     else:
-        full_prompt = f"{conversation}Assistant:"
-
-    # Prepare API request payload
-    payload = {
-        "model": model,
-        "prompt": full_prompt,
-        "stream": stream  # Enable/disable streaming mode
-    }
+        # Ollama's /api/generate endpoint expects a single prompt string
+        full_prompt = _build_prompt(messages)
+        payload = {
+            "model": model,
+            "prompt": full_prompt,
+            "stream": stream  # Enable/disable streaming mode
+        }
+        cache_text = full_prompt
+
+    max_tokens = _output_token_cap(messages)
+    if max_tokens > 0:
+        # Cap generation length so a runaway response cannot hold the GPU
+        payload["options"] = {"num_predict": max_tokens}
 
     # Route to appropriate handler based on streaming mode
     if stream:
         # Return generator for streaming mode (tokens arrive one by one)
-        return _stream_ollama_response(payload, model)
-    else:
-        # Return complete response for synchronous mode
-        return _call_ollama_sync(payload, model)
+        return _stream_ollama_response(payload, model, chat_api)
 
+    # Return complete response for synchronous mode
+    use_cache = config.OLLAMA_RESPONSE_CACHE_TTL > 0 and not no_cache
+    cache_key = _response_cache_key(model, cache_text)
+    if use_cache:
+        result = _get_cached_response(cache_key)
+        if result is not None:
+            logger.debug("Returning cached Ollama response for model: %s", model)
+            return result
 
-def _stream_ollama_response(payload, model):
+    # Identical requests already in flight share one Ollama generation
+    result = _singleflight(cache_key, functools.partial(_call_ollama_sync, payload, model, chat_api))
+    if use_cache:
+        _store_response(cache_key, result)
+    return result
+
+
+def _output_token_cap(messages) -> int:
+    """
+    Return the num_predict limit for a request, or 0 for no limit.
+
+    The cap grows with the latest user message, 512 tokens plus 4 per word,
+    so a short idea cannot produce an unbounded answer while a long brief
+    still has room. It never exceeds config.OLLAMA_MAX_OUTPUT_TOKENS; a
+    setting of 0 disables the cap.
+
+    Args:
+        messages: Message dictionaries with 'role' and 'content' keys
+
+    Returns:
+        int: Maximum tokens Ollama may generate, or 0 for no limit
+    """
+    ceiling = config.OLLAMA_MAX_OUTPUT_TOKENS
+    if ceiling <= 0:
+        return 0
+    user_input = next(
+        (msg.get('content') or '' for msg in reversed(messages) if msg.get('role') == 'user'),
+        ''
+    )
+    return min(ceiling, 512 + 4 * len(user_input.split()))
+
+
+def _post_to_ollama(url, payload, stream=False):
+    """
+    POST payload to Ollama, retrying refused connections.
+
+    Only a failure to open the connection (NewConnectionError, e.g. Ollama
+    restarting or a DNS error) is retried, up to config.OLLAMA_MAX_RETRIES
+    extra attempts with exponential backoff from 0.5s: no request was sent,
+    so retrying cannot duplicate work. Timeouts (including connect
+    timeouts), connections dropped after the request was sent, and HTTP
+    errors are returned or raised to the caller unchanged.
+
+    Args:
+        url: Ollama endpoint URL
+        payload: JSON request body
+        stream: Whether to stream the response body
+
+    Returns:
+        requests.Response: The response from Ollama
+    """
+    attempts = max(config.OLLAMA_MAX_RETRIES, 0) + 1
+    for attempt in range(1, attempts + 1):
+        try:
+            return _OLLAMA_SESSION.post(url, json=payload, stream=stream, timeout=config.OLLAMA_TIMEOUT)
+        except Timeout:
+            # ConnectTimeout is also a ConnectionError; never retry timeouts
+            raise
+        except ConnectionError as e:
+            reason = getattr(e.args[0], 'reason', None) if e.args else None
+            if attempt == attempts or not isinstance(reason, urllib3.exceptions.NewConnectionError):
+                raise
+            delay = 0.5 * 2 ** (attempt - 1)
+            logger.warning("Connection to Ollama failed (%s); retry %d/%d in %.1fs",
+                           e, attempt, attempts - 1, delay)
+            time.sleep(delay)
+
+
+def _check_response_status(response, model):
+    """
+    Raise the appropriate error for a non-2xx Ollama response.
+
+    Raises:
+        OllamaModelNotFoundError: 404 for a model that is not installed
+        OllamaAPIError: 404 for a wrong endpoint
+        requests.HTTPError: Any other error status
+    """
+    if response.status_code == 404:
+        _raise_not_found(response, model)
+    response.raise_for_status()
+
+
+def _raise_not_found(response, model):
+    """
+    Raise the error for an HTTP 404 from Ollama.
+
+    A 404 means either the model is not installed or the URL does not point
+    at the Ollama API; the JSON error detail (if any) tells them apart.
+
+    Raises:
+        OllamaModelNotFoundError: The error detail mentions a missing model
+        OllamaAPIError: Otherwise (wrong endpoint)
+    """
+    error_detail = ''
+    if response.headers.get('content-type', '').startswith('application/json'):
+        try:
+            body = jsonutil.loads(response.content)
+        except ValueError:
+            body = None
+        if isinstance(body, dict):
+            error_detail = str(body.get('error', ''))
+    if 'model' in error_detail.lower() or 'not found' in error_detail.lower():
+        logger.error("Ollama model not found: %s", model)
+        raise OllamaModelNotFoundError(
+            f"Model '{model}' is not installed.\n\n"
+            f"To fix this, run:\n"
+            f"  ollama pull {model}\n\n"
+            f"To see available models, visit: https://ollama.com/library\n"
+            f"To list installed models, run: ollama list"
+        )
+    logger.error("Ollama API endpoint not found: %s", error_detail)
+    raise OllamaAPIError(
+        f"Ollama API endpoint not found.\n\n"
+        f"To fix this:\n"
+        f"1. Verify Ollama is running: curl http://localhost:11434\n"
+        f"2. Check OLLAMA_URL in .env (current: {config.OLLAMA_URL})\n"
+        f"3. Update Ollama to latest version: curl -fsSL https://ollama.com/install.sh | sh\n\n"
+        f"Error details: {error_detail}"
+    )
+
+
+def _timeout_error(model) -> OllamaTimeoutError:
+    """Build the error for a request that exceeded config.OLLAMA_TIMEOUT."""
+    return OllamaTimeoutError(
+        f"Request timed out after {config.OLLAMA_TIMEOUT:g} seconds.\n\n"
+        f"To fix this:\n"
+        f"1. Try a smaller/faster model: ollama pull qwen2.5:0.5b\n"
+        f"2. Check Ollama status: ollama ps\n"
+        f"3. Ensure your system has enough RAM (8GB+ recommended)\n"
+        f"4. Try restarting Ollama: pkill ollama && ollama serve\n\n"
+        f"Current model '{model}' may be too large for your system."
+    )
+
+
+def _connection_error() -> OllamaConnectionError:
+    """Build the error for a refused or failed connection to OLLAMA_URL."""
+    return OllamaConnectionError(
+        f"Cannot connect to Ollama at {config.OLLAMA_URL}\n\n"
+        f"To fix this:\n"
+        f"1. Start Ollama: ollama serve\n"
+        f"2. Verify it's running: curl {get_ollama_base_url(config.OLLAMA_URL)}\n"
+        f"3. Check your OLLAMA_URL setting in .env\n\n"
+        f"For installation help: https://ollama.com/download"
+    )
+
+
+def _request_error(e) -> OllamaAPIError:
+    """Build the error for any other requests failure."""
+    return OllamaAPIError(
+        f"Network error communicating with Ollama: {str(e)}\n\n"
+        f"To fix this:\n"
+        f"1. Check network connectivity to {config.OLLAMA_URL}\n"
+        f"2. Verify Ollama is running: curl http://localhost:11434\n"
+        f"3. Check firewall settings if using remote Ollama"
+    )
+
+
+def _unexpected_error(e, model) -> OllamaAPIError:
+    """Build the error for an exception not covered by the cases above."""
+    return OllamaAPIError(
+        f"Unexpected error: {str(e)}\n\n"
+        f"To troubleshoot:\n"
+        f"1. Check application logs: tail -f logs/app.log\n"
+        f"2. Verify Ollama is working: ollama run {model} \"test\"\n"
+        f"3. Report issue with logs at: https://github.com/CreativeNewEra/comfyui-prompt-generator/issues"
+    )
+
+
+def _invalid_json_error() -> OllamaAPIError:
+    """Build the error for a response body that is not valid JSON."""
+    return OllamaAPIError(
+        f"Invalid response from Ollama (not valid JSON).\n\n"
+        f"To fix this:\n"
+        f"1. Update Ollama: curl -fsSL https://ollama.com/install.sh | sh\n"
+        f"2. Restart Ollama service\n"
+        f"3. Verify API endpoint: curl {get_ollama_base_url(config.OLLAMA_URL)}/api/version\n\n"
+        f"This usually indicates an Ollama version mismatch or corruption."
+    )
+
+
+def _missing_field_error(e) -> OllamaAPIError:
+    """Build the error for a response missing an expected field."""
+    return OllamaAPIError(
+        f"Incomplete response from Ollama (missing field: {str(e)}).\n\n"
+        f"To fix this:\n"
+        f"1. Update Ollama to latest version\n"
+        f"2. Try a different model: ollama pull qwen2.5:latest\n"
+        f"3. Check Ollama status: ollama ps"
+    )
+
+
+def _translate_ollama_exception(e, model, action: str) -> Exception:
+    """
+    Log an exception raised while talking to Ollama and return the error to raise.
+
+    Our own Ollama* errors are returned unchanged (they were logged where
+    they were raised). Everything else is mapped to the matching Ollama*
+    error with troubleshooting guidance.
+
+    Args:
+        e: The caught exception
+        model: Model name for error messages
+        action: Verb phrase for the unexpected-error log ('calling', 'streaming from')
+
+    Returns:
+        Exception: The exception to raise in place of e
+    """
+    if isinstance(e, (OllamaConnectionError, OllamaTimeoutError, OllamaModelNotFoundError, OllamaAPIError)):
+        return e
+    # Timeout before ConnectionError: requests' ConnectTimeout is both
+    if isinstance(e, Timeout):
+        logger.error("Ollama request timed out after %g seconds for model: %s", config.OLLAMA_TIMEOUT, model)
+        return _timeout_error(model)
+    if isinstance(e, ConnectionError):
+        logger.error("Failed to connect to Ollama at %s", config.OLLAMA_URL)
+        return _connection_error()
+    if isinstance(e, RequestException):
+        logger.error("Request exception when calling Ollama: %s", e)
+        return _request_error(e)
+    if isinstance(e, json.JSONDecodeError):
+        logger.error("Failed to parse JSON response from Ollama API")
+        return _invalid_json_error()
+    if isinstance(e, KeyError):
+        logger.error("Missing expected field in Ollama response: %s", e)
+        return _missing_field_error(e)
+    # Tracebacks are costly to format; keep them for debug runs only
+    logger.error("Unexpected error when %s Ollama: %s", action, e,
+                 exc_info=config.FLASK_DEBUG or logger.isEnabledFor(logging.DEBUG))
+    return _unexpected_error(e, model)
+
+
+def _iter_ndjson_lines(response, chunk_size: int = 65536):
+    """
+    Yield the raw byte lines of a streamed NDJSON response.
+
+    Reads the urllib3 stream directly and splits on b'\\n', skipping the
+    per-chunk reassembly and line-splitting layers of iter_lines(). Ollama
+    sends chunked responses, so each chunk is yielded as soon as it arrives.
+    Lines are left as bytes for the JSON parser.
+
+    Args:
+        response: requests Response opened with stream=True
+        chunk_size: Maximum bytes to read per chunk
+
+    Yields:
+        bytes: One line without its newline (may be empty)
+
+    Raises:
+        requests.exceptions.ConnectionError: Read timed out or connection dropped
+        requests.exceptions.RequestException: Other urllib3 stream failures,
+            translated the same way iter_content() does
+    """
+    pending = b''
+    try:
+        for chunk in response.raw.stream(chunk_size, decode_content=True):
+            lines = (pending + chunk).split(b'\n')
+            pending = lines.pop()
+            yield from lines
+    except urllib3.exceptions.ProtocolError as e:
+        raise ChunkedEncodingError(e)
+    except urllib3.exceptions.DecodeError as e:
+        raise ContentDecodingError(e)
+    except urllib3.exceptions.ReadTimeoutError as e:
+        raise ConnectionError(e)
+    except urllib3.exceptions.HTTPError as e:
+        raise RequestException(e)
+    if pending:
+        yield pending
+
+
+def _put_until_stopped(buffer: queue.Queue, item, stop: threading.Event) -> bool:
+    """Put item on buffer, giving up once stop is set. Returns True if queued."""
+    while not stop.is_set():
+        try:
+            buffer.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _read_ahead(lines, buffer: queue.Queue, stop: threading.Event) -> None:
+    """Reader thread body: move lines into buffer, then an exception or _STREAM_END."""
+    try:
+        for line in lines:
+            if not _put_until_stopped(buffer, line, stop):
+                return
+    except Exception as e:
+        _put_until_stopped(buffer, e, stop)
+        return
+    _put_until_stopped(buffer, _STREAM_END, stop)
+
+
+def _buffered_lines(response, maxsize: int = 64, join_timeout: float = 1.0):
+    """
+    Yield NDJSON lines read ahead of the consumer by a background thread.
+
+    A reader thread keeps pulling lines from the Ollama socket into a
+    bounded queue while the caller is busy writing the previous token to a
+    (possibly slow) client, so Ollama is not held back by client
+    backpressure. Exceptions raised while reading are re-raised here.
+
+    Closing this generator stops the reader and waits up to join_timeout
+    seconds for it to finish its current read. After Ollama's final
+    "done" line that read reaches the end of the response, so urllib3
+    returns the keep-alive connection to the pool before the caller
+    closes the response. Only a reader still blocked after the timeout
+    is left for the response close to unblock.
+
+    Args:
+        response: requests Response opened with stream=True
+        maxsize: Maximum number of lines buffered ahead of the consumer
+        join_timeout: Seconds to wait for the reader thread when closed
+
+    Yields:
+        bytes: One line without its newline (may be empty)
+    """
+    buffer = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    reader = threading.Thread(
+        target=_read_ahead,
+        args=(_iter_ndjson_lines(response), buffer, stop),
+        name='ollama-stream-reader',
+        daemon=True
+    )
+    reader.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _STREAM_END:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        reader.join(join_timeout)
+
+
+def coalesce_tokens(tokens, max_tokens: int = 8, max_wait: float = 0.03):
+    """
+    Join streamed tokens into larger chunks for fewer SSE frames.
+
+    A chunk is emitted once it holds max_tokens tokens, or when a token
+    arrives max_wait seconds or more after the previous chunk was sent, so
+    a slow model still shows up token by token while a fast one is framed
+    a few tokens at a time. Whatever is left is emitted when tokens ends.
+
+    Args:
+        tokens: Iterable of text tokens (e.g. call_ollama(..., stream=True))
+        max_tokens: Most tokens joined into one chunk
+        max_wait: Seconds after which the next token is sent immediately
+
+    Yields:
+        str: Concatenated tokens, in order
+    """
+    pending = []
+    last_sent = time.monotonic()
+    for token in tokens:
+        pending.append(token)
+        now = time.monotonic()
+        if len(pending) >= max_tokens or now - last_sent >= max_wait:
+            yield ''.join(pending)
+            pending.clear()
+            last_sent = now
+    if pending:
+        yield ''.join(pending)
+
+
+def _stream_ollama_response(payload, model, chat_api=False):
     """
     Generator function that streams tokens from Ollama in real-time.
 
@@ -379,15 +1049,17 @@ def _stream_ollama_response(payload, model):
     to provide responsive, real-time feedback to users.
 
     Args:
-        payload (dict): Request payload containing 'model', 'prompt', and 'stream'
+        payload (dict): Request payload containing 'model', 'prompt' (or
+                        'messages' for /api/chat), and 'stream'
         model (str): Model name for inclusion in error messages
+        chat_api (bool): Post to /api/chat instead of OLLAMA_URL
 
     Yields:
         str: Individual tokens (text fragments) as they arrive from Ollama
 
     Raises:
         OllamaConnectionError: Cannot connect to Ollama server
-        OllamaTimeoutError: Request exceeded 120 second timeout
+        OllamaTimeoutError: Request exceeded OLLAMA_TIMEOUT
         OllamaModelNotFoundError: Model not installed locally
         OllamaAPIError: API returned error or malformed response
 
@@ -396,53 +1068,36 @@ def _stream_ollama_response(payload, model):
         - Each chunk contains a 'response' field (token) and 'done' flag
         - Continues until 'done': true is received
         - Skips malformed JSON lines with warning instead of failing
+        - The response is always closed so its pooled connection is released,
+          even when the consumer stops iterating early
     """
+    response = None
     try:
-        logger.debug(f"Sending streaming request to Ollama at {config.OLLAMA_URL}")
+        url = build_chat_url(config.OLLAMA_URL) if chat_api else config.OLLAMA_URL
+        logger.debug("Sending streaming request to Ollama at %s", url)
         # stream=True enables line-by-line reading, timeout prevents hanging
-        response = requests.post(config.OLLAMA_URL, json=payload, stream=True, timeout=120)
-
-        # Check for HTTP 404 - could be model not found OR endpoint not found
-        if response.status_code == 404:
-            error_detail = response.json().get('error', '') if response.headers.get('content-type', '').startswith('application/json') else ''
-            if 'model' in error_detail.lower() or 'not found' in error_detail.lower():
-                logger.error(f"Ollama model not found: {model}")
-                raise OllamaModelNotFoundError(
-                    f"Model '{model}' is not installed.\n\n"
-                    f"To fix this, run:\n"
-                    f"  ollama pull {model}\n\n"
-                    f"To see available models, visit: https://ollama.com/library\n"
-                    f"To list installed models, run: ollama list"
-                )
-            logger.error(f"Ollama API endpoint not found: {error_detail}")
-            raise OllamaAPIError(
-                f"Ollama API endpoint not found.\n\n"
-                f"To fix this:\n"
-                f"1. Verify Ollama is running: curl http://localhost:11434\n"
-                f"2. Check OLLAMA_URL in .env (current: {config.OLLAMA_URL})\n"
-                f"3. Update Ollama to latest version: curl -fsSL https://ollama.com/install.sh | sh\n\n"
-                f"Error details: {error_detail}"
-            )
+        response = _post_to_ollama(url, payload, stream=True)
 
-        # Raise for other HTTP errors (non-404)
-        response.raise_for_status()
+        # 404 could be model not found OR endpoint not found; raise for other HTTP errors too
+        _check_response_status(response, model)
 
         # Stream the response line by line
         # Ollama returns newline-delimited JSON (NDJSON) format
-        for line in response.iter_lines():
+        for line in _buffered_lines(response):
             if line:  # Skip empty lines
                 try:
                     # Each line is a JSON object with response token and metadata
-                    chunk = json.loads(line)
+                    chunk = jsonutil.loads(line)
 
                     # Check for error field in chunk (API-level errors)
                     if 'error' in chunk:
-                        logger.error(f"Ollama API returned error: {chunk['error']}")
+                        logger.error("Ollama API returned error: %s", chunk['error'])
                         raise OllamaAPIError(f"Ollama API error: {chunk['error']}")
 
                     # Yield the token if present (incremental text generation)
-                    if 'response' in chunk:
-                        yield chunk['response']
+                    token = _response_text(chunk, chat_api)
+                    if token is not None:
+                        yield token
 
                     # Check if generation is complete
                     # Final chunk has 'done': true and includes metadata (timing, etc.)
@@ -453,54 +1108,17 @@ def _stream_ollama_response(payload, model):
                 except json.JSONDecodeError:
                     # Don't fail on malformed lines, just log and continue
                     # This provides resilience against network issues
-                    logger.warning(f"Failed to parse streaming chunk: {line}")
+                    logger.warning("Failed to parse streaming chunk: %s", line)
                     continue
 
-    except Timeout:
-        logger.error(f"Ollama request timed out after 120 seconds for model: {model}")
-        raise OllamaTimeoutError(
-            f"Request timed out after 120 seconds.\n\n"
-            f"To fix this:\n"
-            f"1. Try a smaller/faster model: ollama pull qwen2.5:0.5b\n"
-            f"2. Check Ollama status: ollama ps\n"
-            f"3. Ensure your system has enough RAM (8GB+ recommended)\n"
-            f"4. Try restarting Ollama: pkill ollama && ollama serve\n\n"
-            f"Current model '{model}' may be too large for your system."
-        )
-    except ConnectionError:
-        logger.error(f"Failed to connect to Ollama at {config.OLLAMA_URL}")
-        raise OllamaConnectionError(
-            f"Cannot connect to Ollama at {config.OLLAMA_URL}\n\n"
-            f"To fix this:\n"
-            f"1. Start Ollama: ollama serve\n"
-            f"2. Verify it's running: curl {config.OLLAMA_URL.rsplit('/api', 1)[0]}\n"
-            f"3. Check your OLLAMA_URL setting in .env\n\n"
-            f"For installation help: https://ollama.com/download"
-        )
-    except (OllamaConnectionError, OllamaTimeoutError, OllamaModelNotFoundError, OllamaAPIError):
-        # Re-raise our custom exceptions (already logged)
-        raise
-    except RequestException as e:
-        logger.error(f"Request exception when calling Ollama: {str(e)}")
-        raise OllamaAPIError(
-            f"Network error communicating with Ollama: {str(e)}\n\n"
-            f"To fix this:\n"
-            f"1. Check network connectivity to {config.OLLAMA_URL}\n"
-            f"2. Verify Ollama is running: curl http://localhost:11434\n"
-            f"3. Check firewall settings if using remote Ollama"
-        )
     except Exception as e:
-        logger.error(f"Unexpected error when streaming from Ollama: {str(e)}", exc_info=True)
-        raise OllamaAPIError(
-            f"Unexpected error: {str(e)}\n\n"
-            f"To troubleshoot:\n"
-            f"1. Check application logs: tail -f logs/app.log\n"
-            f"2. Verify Ollama is working: ollama run {model} \"test\"\n"
-            f"3. Report issue with logs at: https://github.com/CreativeNewEra/comfyui-prompt-generator/issues"
-        )
+        raise _translate_ollama_exception(e, model, 'streaming from')
+    finally:
+        if response is not None:
+            response.close()
 
 
-def _call_ollama_sync(payload, model):
+def _call_ollama_sync(payload, model, chat_api=False):
     """
     Synchronous call to Ollama (non-streaming).
 
@@ -508,53 +1126,34 @@ def _call_ollama_sync(payload, model):
     before returning. Used for the /generate and /chat endpoints.
 
     Args:
-        payload (dict): The request payload containing 'model', 'prompt', and 'stream'
+        payload (dict): The request payload containing 'model', 'prompt' (or
+                        'messages' for /api/chat), and 'stream'
         model (str): Model name for error messages
+        chat_api (bool): Post to /api/chat instead of OLLAMA_URL
 
     Returns:
         str: The complete response from Ollama
 
     Raises:
         OllamaConnectionError: Cannot connect to Ollama server
-        OllamaTimeoutError: Request exceeded 120 second timeout
+        OllamaTimeoutError: Request exceeded OLLAMA_TIMEOUT
         OllamaModelNotFoundError: Model not installed locally
         OllamaAPIError: API returned error or unexpected format
     """
     try:
-        logger.debug(f"Sending request to Ollama at {config.OLLAMA_URL}")
-        response = requests.post(config.OLLAMA_URL, json=payload, timeout=120)
-
-        # Check for specific error status codes
-        if response.status_code == 404:
-            error_detail = response.json().get('error', '') if response.headers.get('content-type', '').startswith('application/json') else ''
-            if 'model' in error_detail.lower() or 'not found' in error_detail.lower():
-                logger.error(f"Ollama model not found: {model}")
-                raise OllamaModelNotFoundError(
-                    f"Model '{model}' is not installed.\n\n"
-                    f"To fix this, run:\n"
-                    f"  ollama pull {model}\n\n"
-                    f"To see available models, visit: https://ollama.com/library\n"
-                    f"To list installed models, run: ollama list"
-                )
-            logger.error(f"Ollama API endpoint not found: {error_detail}")
-            raise OllamaAPIError(
-                f"Ollama API endpoint not found.\n\n"
-                f"To fix this:\n"
-                f"1. Verify Ollama is running: curl http://localhost:11434\n"
-                f"2. Check OLLAMA_URL in .env (current: {config.OLLAMA_URL})\n"
-                f"3. Update Ollama to latest version: curl -fsSL https://ollama.com/install.sh | sh\n\n"
-                f"Error details: {error_detail}"
-            )
+        url = build_chat_url(config.OLLAMA_URL) if chat_api else config.OLLAMA_URL
+        logger.debug("Sending request to Ollama at %s", url)
+        response = _post_to_ollama(url, payload)
 
-        # Raise for other HTTP errors
-        response.raise_for_status()
+        # Check for specific error status codes, then other HTTP errors
+        _check_response_status(response, model)
 
-        # Parse response
-        result = response.json()
+        # Parse the raw body; jsonutil uses orjson when available
+        result = jsonutil.loads(response.content)
 
         # Check if response contains an error field
         if 'error' in result:
-            logger.error(f"Ollama API returned error: {result['error']}")
+            logger.error("Ollama API returned error: %s", result['error'])
             raise OllamaAPIError(
                 f"Ollama API error: {result['error']}\n\n"
                 f"To troubleshoot:\n"
@@ -565,78 +1164,20 @@ def _call_ollama_sync(payload, model):
             )
 
         # Return the generated response
-        if 'response' in result:
+        text = _response_text(result, chat_api)
+        if text is not None:
             logger.debug("Successfully received response from Ollama")
-            return result['response']
+            return text
         else:
             logger.error("Unexpected response format from Ollama API")
             raise OllamaAPIError(
                 f"Unexpected response format from Ollama.\n\n"
                 f"To fix this:\n"
                 f"1. Update Ollama: curl -fsSL https://ollama.com/install.sh | sh\n"
-                f"2. Verify API is working: curl {config.OLLAMA_URL.rsplit('/api', 1)[0]}/api/tags\n"
+                f"2. Verify API is working: curl {get_ollama_base_url(config.OLLAMA_URL)}/api/tags\n"
                 f"3. Check logs: tail -f logs/app.log\n\n"
                 f"The Ollama API may have changed or be misconfigured."
             )
 
-    except Timeout:
-        logger.error(f"Ollama request timed out after 120 seconds for model: {model}")
-        raise OllamaTimeoutError(
-            f"Request timed out after 120 seconds.\n\n"
-            f"To fix this:\n"
-            f"1. Try a smaller/faster model: ollama pull qwen2.5:0.5b\n"
-            f"2. Check Ollama status: ollama ps\n"
-            f"3. Ensure your system has enough RAM (8GB+ recommended)\n"
-            f"4. Try restarting Ollama: pkill ollama && ollama serve\n\n"
-            f"Current model '{model}' may be too large for your system."
-        )
-    except ConnectionError:
-        logger.error(f"Failed to connect to Ollama at {config.OLLAMA_URL}")
-        raise OllamaConnectionError(
-            f"Cannot connect to Ollama at {config.OLLAMA_URL}\n\n"
-            f"To fix this:\n"
-            f"1. Start Ollama: ollama serve\n"
-            f"2. Verify it's running: curl {config.OLLAMA_URL.rsplit('/api', 1)[0]}\n"
-            f"3. Check your OLLAMA_URL setting in .env\n\n"
-            f"For installation help: https://ollama.com/download"
-        )
-    except (OllamaConnectionError, OllamaTimeoutError, OllamaModelNotFoundError, OllamaAPIError):
-        # Re-raise our custom exceptions (already logged)
-        raise
-    except RequestException as e:
-        logger.error(f"Request exception when calling Ollama: {str(e)}")
-        raise OllamaAPIError(
-            f"Network error communicating with Ollama: {str(e)}\n\n"
-            f"To fix this:\n"
-            f"1. Check network connectivity to {config.OLLAMA_URL}\n"
-            f"2. Verify Ollama is running: curl http://localhost:11434\n"
-            f"3. Check firewall settings if using remote Ollama"
-        )
-    except json.JSONDecodeError as e:
-        logger.error("Failed to parse JSON response from Ollama API")
-        raise OllamaAPIError(
-            f"Invalid response from Ollama (not valid JSON).\n\n"
-            f"To fix this:\n"
-            f"1. Update Ollama: curl -fsSL https://ollama.com/install.sh | sh\n"
-            f"2. Restart Ollama service\n"
-            f"3. Verify API endpoint: curl {config.OLLAMA_URL.rsplit('/api', 1)[0]}/api/version\n\n"
-            f"This usually indicates an Ollama version mismatch or corruption."
-        )
-    except KeyError as e:
-        logger.error(f"Missing expected field in Ollama response: {str(e)}")
-        raise OllamaAPIError(
-            f"Incomplete response from Ollama (missing field: {str(e)}).\n\n"
-            f"To fix this:\n"
-            f"1. Update Ollama to latest version\n"
-            f"2. Try a different model: ollama pull qwen2.5:latest\n"
-            f"3. Check Ollama status: ollama ps"
-        )
     except Exception as e:
-        logger.error(f"Unexpected error when calling Ollama: {str(e)}", exc_info=True)
-        raise OllamaAPIError(
-            f"Unexpected error: {str(e)}\n\n"
-            f"To troubleshoot:\n"
-            f"1. Check application logs: tail -f logs/app.log\n"
-            f"2. Verify Ollama is working: ollama run {model} \"test\"\n"
-            f"3. Report issue with logs at: https://github.com/CreativeNewEra/comfyui-prompt-generator/issues"
-        )
+        raise _translate_ollama_exception(e, model, 'calling')
@@ -10,27 +10,133 @@ Toggle between systems using ENABLE_HIERARCHICAL_PRESETS config flag.
 
 import json
 import logging
+import marshal
+import mmap
 import os
+import time
 
+from app import jsonutil
 from app.config import config
 
 logger = logging.getLogger(__name__)
 
+# Bump when the cached structure changes so stale .marshal files are ignored
+MARSHAL_CACHE_VERSION = 2
 
-# Load presets at module import time
-# This allows routes to import PRESETS directly without calling load_presets()
-PRESETS = None
+# Minimal presets returned when the presets file is missing or invalid.
+# These are shared, like the memoized presets themselves, so callers must
+# treat the returned dictionaries as read-only.
+_HIERARCHICAL_FALLBACK = {
+    "version": "1.0",
+    "categories": {},
+    "preset_packs": {"packs": []},
+    "universal_options": {},
+    "quality_tags": {"flux": {}, "sdxl": {}}
+}
+
+# Top-level keys a hierarchical presets file must provide
+_HIERARCHICAL_REQUIRED_KEYS = frozenset(('categories', 'preset_packs'))
+
+_LEGACY_FALLBACK = {
+    "styles": {"None": ""},
+    "artists": {"None": ""},
+    "composition": {"None": ""},
+    "lighting": {"None": ""}
+}
+
+
+def _load_presets_cached(path):
+    """
+    Load a presets JSON file, using a marshal cache when it is up to date.
+
+    The parsed presets are written to a sibling ``<path>.marshal`` file.
+    The cache records the source's st_mtime_ns and st_size, and later loads
+    use it only when both still match exactly, so restoring an older copy
+    of the JSON file also invalidates it. A matching cache is read with
+    marshal, which rebuilds the dict tree far faster than parsing JSON.
+    Cache misses memory-map the JSON file and parse it in place with orjson
+    when it is installed (see app.jsonutil), instead of first copying the
+    whole file into a bytes object. A missing, stale, corrupt or unwritable
+    cache silently falls back to parsing the JSON file.
+
+    Args:
+        path: Path to the presets JSON file
+
+    Returns:
+        dict: Parsed presets
+
+    Raises:
+        FileNotFoundError: If the presets file is missing
+        json.JSONDecodeError: If the presets file contains invalid JSON
+    """
+    cache_path = path + '.marshal'
+
+    try:
+        st = os.stat(path)
+        with open(cache_path, 'rb') as f:
+            version, mtime_ns, size, data = marshal.load(f)
+        if (version == MARSHAL_CACHE_VERSION
+                and mtime_ns == st.st_mtime_ns and size == st.st_size):
+            logger.debug("Loaded presets from marshal cache %s", cache_path)
+            return data
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    with open(path, 'rb') as f:
+        # Key the cache on the file actually parsed, not an earlier stat()
+        st = os.fstat(f.fileno())
+        if st.st_size == 0:
+            # mmap cannot map an empty file; let the parser report it
+            data = jsonutil.loads(b'')
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                data = jsonutil.loads(view)
+
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            marshal.dump((MARSHAL_CACHE_VERSION, st.st_mtime_ns, st.st_size, data), f)
+        os.replace(tmp_path, cache_path)
+    except (OSError, ValueError) as e:
+        logger.debug("Could not write presets marshal cache %s: %s", cache_path, e)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+    return data
 
 
-def load_presets():
+# (presets_file, hierarchical, mtime, presets, checked_at) from the last
+# load_presets() call; checked_at is the time.monotonic() of the last stat
+_presets_cache = None
+
+# Seconds between mtime checks of the presets file. Every preset route calls
+# load_presets(), so this caps the stat() calls under load; edits still show
+# up within this interval
+_MTIME_CHECK_INTERVAL = 1.0
+
+
+def load_presets(force=False):
     """
     Load presets from either hierarchical_presets.json or legacy presets.json.
 
+    The parsed result is kept in memory together with the file's mtime.
+    Later calls stat the file at most once per _MTIME_CHECK_INTERVAL: while
+    it is unchanged they return the same dictionary, and after it is edited
+    the next check re-reads it, so hot-reload needs no explicit cache
+    invalidation.
+
     The function supports both:
     - Legacy flat presets (styles, artists, composition, lighting)
     - New hierarchical presets (categories, preset_packs, universal_options)
 
     Which file is loaded depends on the ENABLE_HIERARCHICAL_PRESETS feature flag.
+    Parsed presets are cached in a sibling .marshal file (see
+    _load_presets_cached) to skip JSON parsing on subsequent startups.
+
+    Args:
+        force (bool): Re-read the presets file even if its mtime is unchanged
 
     Returns:
         dict: Presets dictionary in appropriate format based on preset type
@@ -42,86 +148,75 @@ def load_presets():
     The function includes fallback presets in case the file is missing or invalid.
     This ensures the application can still run even if the presets file is corrupted.
     """
-    preset_type = "hierarchical" if config.ENABLE_HIERARCHICAL_PRESETS else "legacy"
+    global _presets_cache
+
     presets_file = config.PRESETS_FILE
+    hierarchical = config.ENABLE_HIERARCHICAL_PRESETS
+    now = time.monotonic()
+
+    cached = _presets_cache
+    same_file = not force and cached is not None and cached[:2] == (presets_file, hierarchical)
+    if same_file and now - cached[4] < _MTIME_CHECK_INTERVAL:
+        return cached[3]
 
     try:
-        with open(presets_file, 'r', encoding='utf-8') as f:
-            presets = json.load(f)
-            logger.info(f"Successfully loaded {preset_type} presets from {presets_file}")
+        mtime = os.path.getmtime(presets_file)
+    except OSError:
+        mtime = None
 
-            # Validate structure based on type
-            if config.ENABLE_HIERARCHICAL_PRESETS:
-                if 'categories' in presets and 'preset_packs' in presets:
-                    num_categories = len(presets.get('categories', {}))
-                    num_packs = len(presets.get('preset_packs', {}).get('packs', []))
-                    logger.info(f"Loaded {num_categories} categories and {num_packs} preset packs")
-                else:
-                    logger.warning("Hierarchical presets file missing expected structure")
+    if same_file and cached[2] == mtime:
+        _presets_cache = cached[:4] + (now,)
+        return cached[3]
 
-            return presets
+    presets = _load_presets(presets_file, hierarchical)
+    _presets_cache = (presets_file, hierarchical, mtime, presets, now)
+    return presets
 
-    except FileNotFoundError:
-        logger.error(f"Presets file not found: {presets_file}")
-        logger.warning(f"Using minimal fallback {preset_type} presets")
 
-        # Return appropriate fallback based on type
-        if config.ENABLE_HIERARCHICAL_PRESETS:
-            return {
-                "version": "1.0",
-                "categories": {},
-                "preset_packs": {"packs": []},
-                "universal_options": {},
-                "quality_tags": {"flux": {}, "sdxl": {}}
-            }
-        else:
-            return {
-                "styles": {"None": ""},
-                "artists": {"None": ""},
-                "composition": {"None": ""},
-                "lighting": {"None": ""}
-            }
-
-    except json.JSONDecodeError as e:
-        logger.error(f"Invalid JSON in presets file: {e}")
-        logger.warning(f"Using minimal fallback {preset_type} presets")
-
-        if config.ENABLE_HIERARCHICAL_PRESETS:
-            return {
-                "version": "1.0",
-                "categories": {},
-                "preset_packs": {"packs": []},
-                "universal_options": {},
-                "quality_tags": {"flux": {}, "sdxl": {}}
-            }
-        else:
-            return {
-                "styles": {"None": ""},
-                "artists": {"None": ""},
-                "composition": {"None": ""},
-                "lighting": {"None": ""}
-            }
+def _load_presets(presets_file, hierarchical):
+    """
+    Load and validate a presets file (uncached implementation of load_presets).
+
+    Args:
+        presets_file: Path to the presets JSON file
+        hierarchical: Whether the file uses the hierarchical preset format
+
+    Returns:
+        dict: Presets dictionary, or a minimal fallback on error
+    """
+    preset_type = "hierarchical" if hierarchical else "legacy"
+
+    try:
+        presets = _load_presets_cached(presets_file)
+        logger.info("Successfully loaded %s presets from %s", preset_type, presets_file)
+
+        # Validate structure based on type
+        if hierarchical:
+            missing = _HIERARCHICAL_REQUIRED_KEYS.difference(presets)
+            if not missing:
+                num_categories = len(presets.get('categories', {}))
+                num_packs = len(presets.get('preset_packs', {}).get('packs', []))
+                logger.info("Loaded %d categories and %d preset packs", num_categories, num_packs)
+            else:
+                logger.warning(
+                    "Hierarchical presets file missing expected structure: %s", ', '.join(sorted(missing))
+                )
+
+        return presets
 
     except Exception as e:
-        logger.error(f"Unexpected error loading presets: {e}")
-        logger.warning(f"Using minimal fallback {preset_type} presets")
-
-        if config.ENABLE_HIERARCHICAL_PRESETS:
-            return {
-                "version": "1.0",
-                "categories": {},
-                "preset_packs": {"packs": []},
-                "universal_options": {},
-                "quality_tags": {"flux": {}, "sdxl": {}}
-            }
+        if isinstance(e, FileNotFoundError):
+            logger.error("Presets file not found: %s", presets_file)
+        elif isinstance(e, json.JSONDecodeError):
+            logger.error("Invalid JSON in presets file: %s", e)
         else:
-            return {
-                "styles": {"None": ""},
-                "artists": {"None": ""},
-                "composition": {"None": ""},
-                "lighting": {"None": ""}
-            }
+            logger.error("Unexpected error loading presets: %s", e)
+        logger.warning("Using minimal fallback %s presets", preset_type)
+
+        # Return appropriate fallback based on type
+        return _HIERARCHICAL_FALLBACK if hierarchical else _LEGACY_FALLBACK
 
 
 # Load presets at module import time
+# This allows routes to import PRESETS directly without calling load_presets()
 PRESETS = load_presets()
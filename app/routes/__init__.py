@@ -15,7 +15,36 @@ Blueprints:
     - admin: Administrative endpoints
 """
 
-from flask import Flask
+import functools
+
+from flask import Flask, current_app, request
+
+
+def etag_json(view):
+    """
+    Decorator giving a view's successful JSON responses an ETag.
+
+    The ETag is a hash of the body, sent with "Cache-Control: private,
+    no-cache" so the browser keeps a copy but revalidates on every use.
+    A request whose If-None-Match matches gets a bodyless 304 instead of
+    the same JSON again. Error responses pass through unchanged.
+
+    Args:
+        view: Flask view function
+
+    Returns:
+        function: Wrapped view function
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        response = current_app.make_response(view(*args, **kwargs))
+        if response.status_code != 200 or not response.is_json:
+            return response
+        response.add_etag()
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+    return wrapper
 
 
 def register_blueprints(app: Flask):
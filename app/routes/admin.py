@@ -36,7 +36,10 @@ def reload_prompts():
         X-Admin-API-Key header (or admin_api_key query param) or that the
         request originates from a loopback/localhost IP address. Additional
         IPs can be whitelisted through the ADMIN_ALLOWED_IPS environment
-        variable.
+        variable. The AdminGate WSGI middleware installed by create_app()
+        (see app.auth) rejects other requests with 403 before they reach
+        Flask; the view repeats the check so the endpoint stays protected
+        when the blueprint is served without the gate.
 
     Returns:
         JSON: Success message with list of reloaded prompts
@@ -52,8 +55,11 @@ def reload_prompts():
         curl -X POST http://localhost:5000/admin/reload-prompts
     """
     from app.auth import authorize_admin_request
+    from app.routes.models import clear_models_cache
     from app.utils import reload_system_prompts
 
+    # Normally AdminGate has already answered unauthorized requests; this
+    # covers apps that register the blueprint without create_app()
     authorized, client_ip, forwarded_for, reason = authorize_admin_request(request)
     if not authorized:
         logger.warning(
@@ -76,6 +82,8 @@ def reload_prompts():
     try:
         # Reload prompts from files and update global variables
         new_system_prompts, new_chat_prompts = reload_system_prompts()
+        # Also re-query Ollama for installed models on the next /models request
+        clear_models_cache()
 
         reloaded_prompts = list(new_system_prompts.keys()) + [f"{k}_chat" for k in new_chat_prompts.keys()]
 
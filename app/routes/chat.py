@@ -11,8 +11,8 @@ Routes:
 """
 
 from flask import Blueprint, jsonify, request, session, current_app
-import json
 import logging
+from app import jsonutil
 
 bp = Blueprint('chat', __name__)
 logger = logging.getLogger(__name__)
@@ -72,20 +72,14 @@ def chat():
 
     from app.config import config
     from app.presets import load_presets, PRESETS
-    from app.utils import CHAT_SYSTEM_PROMPTS, build_hierarchical_prompt
+    from app.utils import (
+        PromptRequest, get_chat_system_prompts, build_hierarchical_prompt, build_preset_context, format_user_message
+    )
     from app.ollama_client import call_ollama
-    from app.database import save_to_history
+    from app.database import queue_history
 
-    user_message = data.get('message', '').strip()
-    model_type = data.get('model', 'flux')
-    ollama_model = data.get('ollama_model', config.OLLAMA_MODEL)  # Ollama model to use
-
-    # Get preset selections
-    style = data.get('style', 'None')
-    artist = data.get('artist', 'None')
-    composition = data.get('composition', 'None')
-    lighting = data.get('lighting', 'None')
-    selections = data.get('selections')
+    (user_message, model_type, ollama_model,
+     style, artist, composition, lighting, selections) = PromptRequest.from_json(data, 'message')
 
     hierarchical_message = None
     using_hierarchical = False
@@ -113,7 +107,8 @@ def chat():
         stored_model = None
 
     if not conversation:
-        system_prompt = CHAT_SYSTEM_PROMPTS.get(model_type, CHAT_SYSTEM_PROMPTS['flux'])
+        chat_prompts = get_chat_system_prompts()
+        system_prompt = chat_prompts.get(model_type, chat_prompts['flux'])
         conversation = [{
             "role": "system",
             "content": system_prompt
@@ -132,20 +127,8 @@ def chat():
         full_message = hierarchical_message
     else:
         # Build context with presets
-        preset_context = []
-        if style and style != 'None' and style in PRESETS['styles']:
-            preset_context.append(f"Style: {PRESETS['styles'][style]}")
-        if artist and artist != 'None' and artist in PRESETS['artists']:
-            preset_context.append(f"Artist/Style: {PRESETS['artists'][artist]}")
-        if composition and composition != 'None' and composition in PRESETS['composition']:
-            preset_context.append(f"Composition: {PRESETS['composition'][composition]}")
-        if lighting and lighting != 'None' and lighting in PRESETS['lighting']:
-            preset_context.append(f"Lighting: {PRESETS['lighting'][lighting]}")
-
-        # Build the full user message
-        if preset_context:
-            preset_info = "\n".join(preset_context)
-            full_message = f"{user_message}\n\n[Selected presets: {preset_info}]"
+        preset_context = build_preset_context(PRESETS, style, artist, composition, lighting)
+        full_message = format_user_message(user_message, preset_context, chat_mode=True)
 
     # Add user message
     conversation.append({
@@ -155,10 +138,8 @@ def chat():
 
     conversation = current_app.conversation_store.save_messages(conversation_id, conversation, model_type)
 
-    conversation_snapshot = list(conversation)
-
     # Get response from Ollama
-    result = call_ollama(conversation_snapshot, model=ollama_model)
+    result = call_ollama(conversation, model=ollama_model)
 
     # Add assistant response to history
     conversation.append({
@@ -178,7 +159,7 @@ def chat():
     }
     if using_hierarchical:
         presets_dict['hierarchical'] = selections
-    save_to_history(user_message, result, model_type, presets_dict, 'chat')
+    queue_history(user_message, result, model_type, presets_dict, 'chat')
 
     return jsonify({
         'result': result,
@@ -202,21 +183,15 @@ def chat_stream():
 
     from app.config import config
     from app.presets import load_presets, PRESETS
-    from app.utils import CHAT_SYSTEM_PROMPTS, build_hierarchical_prompt
-    from app.ollama_client import call_ollama
-    from app.database import save_to_history
+    from app.utils import (
+        PromptRequest, get_chat_system_prompts, build_hierarchical_prompt, build_preset_context, format_user_message
+    )
+    from app.ollama_client import call_ollama, coalesce_tokens
+    from app.database import queue_history
     from app.errors import OllamaConnectionError, OllamaTimeoutError, OllamaModelNotFoundError, OllamaAPIError
 
-    user_message = data.get('message', '').strip()
-    model_type = data.get('model', 'flux')
-    ollama_model = data.get('ollama_model', config.OLLAMA_MODEL)  # Ollama model to use
-
-    # Get preset selections
-    style = data.get('style', 'None')
-    artist = data.get('artist', 'None')
-    composition = data.get('composition', 'None')
-    lighting = data.get('lighting', 'None')
-    selections = data.get('selections')
+    (user_message, model_type, ollama_model,
+     style, artist, composition, lighting, selections) = PromptRequest.from_json(data, 'message')
 
     hierarchical_message = None
     using_hierarchical = False
@@ -244,7 +219,8 @@ def chat_stream():
         stored_model = None
 
     if not conversation:
-        system_prompt = CHAT_SYSTEM_PROMPTS.get(model_type, CHAT_SYSTEM_PROMPTS['flux'])
+        chat_prompts = get_chat_system_prompts()
+        system_prompt = chat_prompts.get(model_type, chat_prompts['flux'])
         conversation = [{
             "role": "system",
             "content": system_prompt
@@ -262,20 +238,8 @@ def chat_stream():
         full_message = hierarchical_message
     else:
         # Build context with presets
-        preset_context = []
-        if style and style != 'None' and style in PRESETS['styles']:
-            preset_context.append(f"Style: {PRESETS['styles'][style]}")
-        if artist and artist != 'None' and artist in PRESETS['artists']:
-            preset_context.append(f"Artist/Style: {PRESETS['artists'][artist]}")
-        if composition and composition != 'None' and composition in PRESETS['composition']:
-            preset_context.append(f"Composition: {PRESETS['composition'][composition]}")
-        if lighting and lighting != 'None' and lighting in PRESETS['lighting']:
-            preset_context.append(f"Lighting: {PRESETS['lighting'][lighting]}")
-
-        # Build the full user message
-        if preset_context:
-            preset_info = "\n".join(preset_context)
-            full_message = f"{user_message}\n\n[Selected presets: {preset_info}]"
+        preset_context = build_preset_context(PRESETS, style, artist, composition, lighting)
+        full_message = format_user_message(user_message, preset_context, chat_mode=True)
 
     conversation.append({
         "role": "user",
@@ -284,8 +248,6 @@ def chat_stream():
 
     conversation = current_app.conversation_store.save_messages(conversation_id, conversation, model_type)
 
-    conversation_snapshot = list(conversation)
-
     presets_dict = {
         'style': style,
         'artist': artist,
@@ -295,28 +257,31 @@ def chat_stream():
     if using_hierarchical:
         presets_dict['hierarchical'] = selections
 
+    # The generator runs after the view returns, outside the app context
+    conversation_store = current_app.conversation_store
+
     def generate():
         """Generator function for SSE streaming"""
         nonlocal conversation
         full_response = ""
         try:
-            for token in call_ollama(conversation_snapshot, model=ollama_model, stream=True):
+            for token in coalesce_tokens(call_ollama(conversation, model=ollama_model, stream=True)):
                 full_response += token
-                # Send token as SSE event
-                yield f"data: {json.dumps({'token': token})}\n\n"
+                # Send tokens as SSE event, a few at a time when Ollama is fast
+                yield jsonutil.sse_event({'token': token})
 
             # Send completion event
-            yield f"data: {json.dumps({'done': True})}\n\n"
+            yield jsonutil.sse_event({'done': True})
 
             logger.info("Successfully processed streaming chat message")
 
         except (OllamaConnectionError, OllamaTimeoutError, OllamaModelNotFoundError, OllamaAPIError) as e:
             # Send error event
-            yield f"data: {json.dumps({'error': str(e), 'type': type(e).__name__})}\n\n"
+            yield jsonutil.sse_event({'error': str(e), 'type': type(e).__name__})
             logger.error(f"Error during streaming: {str(e)}")
         except Exception as e:
             # Send generic error event
-            yield f"data: {json.dumps({'error': f'Unexpected error: {str(e)}', 'type': 'UnexpectedError'})}\n\n"
+            yield jsonutil.sse_event({'error': f'Unexpected error: {str(e)}', 'type': 'UnexpectedError'})
             logger.error(f"Unexpected error during streaming: {str(e)}", exc_info=True)
         finally:
             # Update session after streaming completes
@@ -327,10 +292,10 @@ def chat_stream():
                     "content": full_response
                 })
 
-                conversation = current_app.conversation_store.save_messages(conversation_id, conversation, model_type)
+                conversation = conversation_store.save_messages(conversation_id, conversation, model_type)
 
                 # Save to history after completion
-                save_to_history(user_message, full_response, model_type, presets_dict, 'chat')
+                queue_history(user_message, full_response, model_type, presets_dict, 'chat')
 
     return current_app.response_class(generate(), mimetype='text/event-stream')
 
@@ -10,8 +10,8 @@ Routes:
 """
 
 from flask import Blueprint, jsonify, request, current_app
-import json
 import logging
+from app import jsonutil
 
 bp = Blueprint('generate', __name__)
 logger = logging.getLogger(__name__)
@@ -64,21 +64,15 @@ def generate():
 
     from app.config import config
     from app.presets import load_presets, PRESETS
-    from app.utils import SYSTEM_PROMPTS, build_hierarchical_prompt
+    from app.utils import (
+        PromptRequest, get_system_prompts, build_hierarchical_prompt, build_preset_context, format_user_message
+    )
     from app.ollama_client import call_ollama
-    from app.database import save_to_history
+    from app.database import queue_history
 
-    # Extract request parameters
-    user_input = data.get('input', '').strip()
-    model_type = data.get('model', 'flux')  # Default to Flux if not specified
-    ollama_model = data.get('ollama_model', config.OLLAMA_MODEL)  # Ollama model to use
-
-    # Extract preset selections (all default to 'None' if not provided)
-    style = data.get('style', 'None')
-    artist = data.get('artist', 'None')
-    composition = data.get('composition', 'None')
-    lighting = data.get('lighting', 'None')
-    selections = data.get('selections')
+    # Extract request parameters (presets default to 'None', model to Flux)
+    (user_input, model_type, ollama_model,
+     style, artist, composition, lighting, selections) = PromptRequest.from_json(data, 'input')
 
     hierarchical_prompt = None
     using_hierarchical = False
@@ -107,25 +101,13 @@ def generate():
     else:
         # Build preset context by looking up selected preset values
         # Only include presets that aren't "None" or empty
-        preset_context = []
-        if style and style != 'None' and style in PRESETS['styles']:
-            preset_context.append(f"Style: {PRESETS['styles'][style]}")
-        if artist and artist != 'None' and artist in PRESETS['artists']:
-            preset_context.append(f"Artist/Style: {PRESETS['artists'][artist]}")
-        if composition and composition != 'None' and composition in PRESETS['composition']:
-            preset_context.append(f"Composition: {PRESETS['composition'][composition]}")
-        if lighting and lighting != 'None' and lighting in PRESETS['lighting']:
-            preset_context.append(f"Lighting: {PRESETS['lighting'][lighting]}")
-
-        # Build the full user message with presets incorporated
-        if preset_context:
-            # If presets are selected, format them clearly for the AI
-            preset_info = "\n".join(preset_context)
-            full_input = f"User's image idea: {user_input}\n\nSelected presets:\n{preset_info}\n\nPlease create a detailed prompt incorporating these elements."
+        preset_context = build_preset_context(PRESETS, style, artist, composition, lighting)
+        full_input = format_user_message(user_input, preset_context)
 
     # Get the appropriate system prompt for this model type
     # Falls back to Flux prompt if model type is unknown
-    system_prompt = SYSTEM_PROMPTS.get(model_type, SYSTEM_PROMPTS['flux'])
+    system_prompts = get_system_prompts()
+    system_prompt = system_prompts.get(model_type, system_prompts['flux'])
 
     # Construct message array for Ollama
     messages = [
@@ -146,7 +128,7 @@ def generate():
     }
     if using_hierarchical:
         presets_dict['hierarchical'] = selections
-    save_to_history(user_input, result, model_type, presets_dict, 'oneshot')
+    queue_history(user_input, result, model_type, presets_dict, 'oneshot')
 
     return jsonify({
         'result': result,
@@ -170,21 +152,15 @@ def generate_stream():
 
     from app.config import config
     from app.presets import load_presets, PRESETS
-    from app.utils import SYSTEM_PROMPTS, build_hierarchical_prompt
-    from app.ollama_client import call_ollama
-    from app.database import save_to_history
+    from app.utils import (
+        PromptRequest, get_system_prompts, build_hierarchical_prompt, build_preset_context, format_user_message
+    )
+    from app.ollama_client import call_ollama, coalesce_tokens
+    from app.database import queue_history
     from app.errors import OllamaConnectionError, OllamaTimeoutError, OllamaModelNotFoundError, OllamaAPIError
 
-    user_input = data.get('input', '').strip()
-    model_type = data.get('model', 'flux')
-    ollama_model = data.get('ollama_model', config.OLLAMA_MODEL)  # Ollama model to use
-
-    # Get preset selections
-    style = data.get('style', 'None')
-    artist = data.get('artist', 'None')
-    composition = data.get('composition', 'None')
-    lighting = data.get('lighting', 'None')
-    selections = data.get('selections')
+    (user_input, model_type, ollama_model,
+     style, artist, composition, lighting, selections) = PromptRequest.from_json(data, 'input')
 
     hierarchical_prompt = None
     using_hierarchical = False
@@ -211,23 +187,12 @@ def generate_stream():
         full_input = hierarchical_prompt
     else:
         # Build context with presets
-        preset_context = []
-        if style and style != 'None' and style in PRESETS['styles']:
-            preset_context.append(f"Style: {PRESETS['styles'][style]}")
-        if artist and artist != 'None' and artist in PRESETS['artists']:
-            preset_context.append(f"Artist/Style: {PRESETS['artists'][artist]}")
-        if composition and composition != 'None' and composition in PRESETS['composition']:
-            preset_context.append(f"Composition: {PRESETS['composition'][composition]}")
-        if lighting and lighting != 'None' and lighting in PRESETS['lighting']:
-            preset_context.append(f"Lighting: {PRESETS['lighting'][lighting]}")
-
-        # Build the full user message
-        if preset_context:
-            preset_info = "\n".join(preset_context)
-            full_input = f"User's image idea: {user_input}\n\nSelected presets:\n{preset_info}\n\nPlease create a detailed prompt incorporating these elements."
+        preset_context = build_preset_context(PRESETS, style, artist, composition, lighting)
+        full_input = format_user_message(user_input, preset_context)
 
     # Get appropriate system prompt
-    system_prompt = SYSTEM_PROMPTS.get(model_type, SYSTEM_PROMPTS['flux'])
+    system_prompts = get_system_prompts()
+    system_prompt = system_prompts.get(model_type, system_prompts['flux'])
 
     messages = [
         {"role": "system", "content": system_prompt},
@@ -247,25 +212,25 @@ def generate_stream():
         """Generator function for SSE streaming"""
         try:
             full_response = ""
-            for token in call_ollama(messages, model=ollama_model, stream=True):
+            for token in coalesce_tokens(call_ollama(messages, model=ollama_model, stream=True)):
                 full_response += token
-                # Send token as SSE event
-                yield f"data: {json.dumps({'token': token})}\n\n"
+                # Send tokens as SSE event, a few at a time when Ollama is fast
+                yield jsonutil.sse_event({'token': token})
 
             # Send completion event
-            yield f"data: {json.dumps({'done': True})}\n\n"
+            yield jsonutil.sse_event({'done': True})
 
             # Save to history after completion
-            save_to_history(user_input, full_response, model_type, presets_dict, 'oneshot')
+            queue_history(user_input, full_response, model_type, presets_dict, 'oneshot')
             logger.info("Successfully generated streaming prompt")
 
         except (OllamaConnectionError, OllamaTimeoutError, OllamaModelNotFoundError, OllamaAPIError) as e:
             # Send error event
-            yield f"data: {json.dumps({'error': str(e), 'type': type(e).__name__})}\n\n"
+            yield jsonutil.sse_event({'error': str(e), 'type': type(e).__name__})
             logger.error(f"Error during streaming: {str(e)}")
         except Exception as e:
             # Send generic error event
-            yield f"data: {json.dumps({'error': f'Unexpected error: {str(e)}', 'type': 'UnexpectedError'})}\n\n"
+            yield jsonutil.sse_event({'error': f'Unexpected error: {str(e)}', 'type': 'UnexpectedError'})
             logger.error(f"Unexpected error during streaming: {str(e)}", exc_info=True)
 
     return current_app.response_class(generate(), mimetype='text/event-stream')
@@ -10,12 +10,14 @@ Routes:
 
 from flask import Blueprint, jsonify, request
 import logging
+from app.routes import etag_json
 
 bp = Blueprint('history', __name__)
 logger = logging.getLogger(__name__)
 
 
 @bp.route('/history', methods=['GET'])
+@etag_json
 def get_prompt_history():
     """
     Retrieve prompt generation history from database.
@@ -26,6 +28,8 @@ def get_prompt_history():
     Query Parameters:
         limit (int, optional): Number of records to return (1-200, default: 50)
         q (str, optional): Search query to filter results
+        preview (bool, optional): Truncate generated_output to its first
+            200 characters (preview=1) for list views
 
     Returns:
         JSON: List of history records with metadata
@@ -51,6 +55,7 @@ def get_prompt_history():
 
     Example:
         GET /history?limit=10&q=cyberpunk
+        GET /history?limit=200&preview=1
     """
     logger.info("Received /history request")
 
@@ -58,6 +63,7 @@ def get_prompt_history():
 
     limit = request.args.get('limit', 50, type=int)
     search_query = request.args.get('q', None)
+    preview = request.args.get('preview', '').lower() in ('1', 'true', 'yes')
 
     # Validate limit
     if limit < 1 or limit > 200:
@@ -66,7 +72,7 @@ def get_prompt_history():
             'message': 'Limit must be between 1 and 200'
         }), 400
 
-    history = get_history(limit=limit, search_query=search_query)
+    history = get_history(limit=limit, search_query=search_query, preview=preview)
 
     logger.info(f"Retrieved {len(history)} history records")
     return jsonify({
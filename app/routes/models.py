@@ -11,19 +11,75 @@ from flask import Blueprint, jsonify
 import requests
 from requests.exceptions import ConnectionError, RequestException
 import logging
+import time
+from app.routes import etag_json
 
 bp = Blueprint('models', __name__)
 logger = logging.getLogger(__name__)
 
+# Seconds to reuse the installed-model list; installs and removals are rare
+# compared to how often the UI asks
+_MODELS_CACHE_TTL = 30
+
+# (tags_url, expires_at, model names) from the last successful /api/tags call
+_models_cache = None
+
+
+def clear_models_cache():
+    """Forget the cached model list so the next /models request asks Ollama."""
+    global _models_cache
+    _models_cache = None
+
+
+def _fetch_models(tags_url):
+    """
+    Return installed model names, reusing a recent answer from Ollama.
+
+    Args:
+        tags_url: Ollama /api/tags URL
+
+    Returns:
+        list: Model names (e.g. ["qwen3:latest", "llama2:latest"])
+
+    Raises:
+        requests.RequestException: The request to Ollama failed
+    """
+    from app.ollama_client import ollama_get
+
+    global _models_cache
+    cached = _models_cache
+    now = time.monotonic()
+    if cached is not None and cached[0] == tags_url and now < cached[1]:
+        logger.debug("Returning cached model list")
+        return cached[2]
+
+    logger.debug(f"Fetching models from {tags_url}")
+    response = ollama_get(tags_url, timeout=10)
+    response.raise_for_status()
+
+    result = response.json()
+
+    # Extract model names from the response
+    # Ollama returns: {"models": [{"name": "model:tag", ...}, ...]}
+    models = []
+    if 'models' in result:
+        models = [model['name'] for model in result['models']]
+
+    _models_cache = (tags_url, now + _MODELS_CACHE_TTL, models)
+    return models
+
 
 @bp.route('/models', methods=['GET'])
+@etag_json
 def get_models():
     """
     Return available Ollama models installed on the system.
 
     Queries the Ollama API /api/tags endpoint to retrieve a list of
     all locally installed models. This allows users to select which
-    model they want to use for prompt generation.
+    model they want to use for prompt generation. The list is cached for
+    _MODELS_CACHE_TTL seconds, so a newly pulled model can take that long
+    to appear.
 
     Returns:
         JSON: List of model names and default model
@@ -47,23 +103,13 @@ def get_models():
 
     from app.config import config
     from app.errors import OllamaConnectionError, OllamaTimeoutError, OllamaAPIError
+    from app.ollama_client import build_tags_url
 
     try:
-        # Get base URL for Ollama (remove /api/generate path)
-        ollama_base_url = config.OLLAMA_URL.rsplit('/api', 1)[0]
-        tags_url = f"{ollama_base_url}/api/tags"
-
-        logger.debug(f"Fetching models from {tags_url}")
-        response = requests.get(tags_url, timeout=10)
-        response.raise_for_status()
-
-        result = response.json()
+        # Resolved once per OLLAMA_URL; auto-discovery can change it at runtime
+        tags_url = build_tags_url(config.OLLAMA_URL)
 
-        # Extract model names from the response
-        # Ollama returns: {"models": [{"name": "model:tag", ...}, ...]}
-        models = []
-        if 'models' in result:
-            models = [model['name'] for model in result['models']]
+        models = _fetch_models(tags_url)
 
         logger.info(f"Found {len(models)} installed Ollama models")
 
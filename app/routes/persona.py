@@ -13,8 +13,8 @@ Routes:
 """
 
 from flask import Blueprint, jsonify, request, session, current_app
-import json
 import logging
+from app import jsonutil
 
 bp = Blueprint('persona', __name__)
 logger = logging.getLogger(__name__)
@@ -182,14 +182,13 @@ def persona_chat():
     from app.config import config
     from app.personas import load_personas, load_persona_prompt
     from app.presets import load_presets, PRESETS
-    from app.utils import build_hierarchical_prompt
+    from app.utils import PromptRequest, build_hierarchical_prompt, build_preset_context, format_user_message
     from app.ollama_client import call_ollama
-    from app.database import save_to_history
+    from app.database import queue_history
 
-    user_message = data.get('message', '').strip()
+    (user_message, model_type, ollama_model,
+     style, artist, composition, lighting, selections) = PromptRequest.from_json(data, 'message')
     persona_id = data.get('persona_id', '').strip()
-    model_type = data.get('model', 'flux')  # For preset compatibility
-    ollama_model = data.get('ollama_model', config.OLLAMA_MODEL)
 
     if not user_message:
         logger.warning("Persona-chat request with empty message")
@@ -256,12 +255,6 @@ def persona_chat():
     # Handle presets if persona supports them
     full_message = user_message
     if persona_info.get('supports_presets', False):
-        style = data.get('style', 'None')
-        artist = data.get('artist', 'None')
-        composition = data.get('composition', 'None')
-        lighting = data.get('lighting', 'None')
-        selections = data.get('selections')
-
         hierarchical_message = None
         using_hierarchical = False
         if config.ENABLE_HIERARCHICAL_PRESETS and isinstance(selections, dict) and selections:
@@ -274,19 +267,8 @@ def persona_chat():
             full_message = hierarchical_message
         else:
             # Build context with legacy presets
-            preset_context = []
-            if style and style != 'None' and style in PRESETS['styles']:
-                preset_context.append(f"Style: {PRESETS['styles'][style]}")
-            if artist and artist != 'None' and artist in PRESETS['artists']:
-                preset_context.append(f"Artist/Style: {PRESETS['artists'][artist]}")
-            if composition and composition != 'None' and composition in PRESETS['composition']:
-                preset_context.append(f"Composition: {PRESETS['composition'][composition]}")
-            if lighting and lighting != 'None' and lighting in PRESETS['lighting']:
-                preset_context.append(f"Lighting: {PRESETS['lighting'][lighting]}")
-
-            if preset_context:
-                preset_info = "\n".join(preset_context)
-                full_message = f"{user_message}\n\n[Selected presets: {preset_info}]"
+            preset_context = build_preset_context(PRESETS, style, artist, composition, lighting)
+            full_message = format_user_message(user_message, preset_context, chat_mode=True)
 
     # Add user message
     conversation.append({
@@ -295,10 +277,9 @@ def persona_chat():
     })
 
     conversation = current_app.conversation_store.save_messages(conversation_id, conversation, persona_id)
-    conversation_snapshot = list(conversation)
 
     # Get response from Ollama
-    result = call_ollama(conversation_snapshot, model=ollama_model)
+    result = call_ollama(conversation, model=ollama_model)
 
     # Add assistant response to history
     conversation.append({
@@ -313,12 +294,12 @@ def persona_chat():
     presets_dict = {'persona': persona_id}
     if persona_info.get('supports_presets', False):
         presets_dict.update({
-            'style': data.get('style', 'None'),
-            'artist': data.get('artist', 'None'),
-            'composition': data.get('composition', 'None'),
-            'lighting': data.get('lighting', 'None')
+            'style': style,
+            'artist': artist,
+            'composition': composition,
+            'lighting': lighting
         })
-    save_to_history(user_message, result, model_type, presets_dict, 'persona-chat')
+    queue_history(user_message, result, model_type, presets_dict, 'persona-chat')
 
     return jsonify({
         'result': result,
@@ -374,15 +355,14 @@ def persona_chat_stream():
     from app.config import config
     from app.personas import load_personas, load_persona_prompt
     from app.presets import load_presets, PRESETS
-    from app.utils import build_hierarchical_prompt
-    from app.ollama_client import call_ollama
-    from app.database import save_to_history
+    from app.utils import PromptRequest, build_hierarchical_prompt, build_preset_context, format_user_message
+    from app.ollama_client import call_ollama, coalesce_tokens
+    from app.database import queue_history
     from app.errors import OllamaConnectionError, OllamaTimeoutError, OllamaModelNotFoundError, OllamaAPIError
 
-    user_message = data.get('message', '').strip()
+    (user_message, model_type, ollama_model,
+     style, artist, composition, lighting, selections) = PromptRequest.from_json(data, 'message')
     persona_id = data.get('persona_id', '').strip()
-    model_type = data.get('model', 'flux')
-    ollama_model = data.get('ollama_model', config.OLLAMA_MODEL)
 
     if not user_message:
         logger.warning("Persona-chat-stream request with empty message")
@@ -449,12 +429,6 @@ def persona_chat_stream():
     presets_dict = {'persona': persona_id}
 
     if persona_info.get('supports_presets', False):
-        style = data.get('style', 'None')
-        artist = data.get('artist', 'None')
-        composition = data.get('composition', 'None')
-        lighting = data.get('lighting', 'None')
-        selections = data.get('selections')
-
         hierarchical_message = None
         using_hierarchical = False
         if config.ENABLE_HIERARCHICAL_PRESETS and isinstance(selections, dict) and selections:
@@ -468,19 +442,8 @@ def persona_chat_stream():
             presets_dict['hierarchical'] = selections
         else:
             # Build context with legacy presets
-            preset_context = []
-            if style and style != 'None' and style in PRESETS['styles']:
-                preset_context.append(f"Style: {PRESETS['styles'][style]}")
-            if artist and artist != 'None' and artist in PRESETS['artists']:
-                preset_context.append(f"Artist/Style: {PRESETS['artists'][artist]}")
-            if composition and composition != 'None' and composition in PRESETS['composition']:
-                preset_context.append(f"Composition: {PRESETS['composition'][composition]}")
-            if lighting and lighting != 'None' and lighting in PRESETS['lighting']:
-                preset_context.append(f"Lighting: {PRESETS['lighting'][lighting]}")
-
-            if preset_context:
-                preset_info = "\n".join(preset_context)
-                full_message = f"{user_message}\n\n[Selected presets: {preset_info}]"
+            preset_context = build_preset_context(PRESETS, style, artist, composition, lighting)
+            full_message = format_user_message(user_message, preset_context, chat_mode=True)
 
             presets_dict.update({
                 'style': style,
@@ -496,30 +459,32 @@ def persona_chat_stream():
     })
 
     conversation = current_app.conversation_store.save_messages(conversation_id, conversation, persona_id)
-    conversation_snapshot = list(conversation)
+
+    # The generator runs after the view returns, outside the app context
+    conversation_store = current_app.conversation_store
 
     def generate():
         """Generator function for SSE streaming"""
         nonlocal conversation
         full_response = ""
         try:
-            for token in call_ollama(conversation_snapshot, model=ollama_model, stream=True):
+            for token in coalesce_tokens(call_ollama(conversation, model=ollama_model, stream=True)):
                 full_response += token
-                # Send token as SSE event
-                yield f"data: {json.dumps({'token': token})}\n\n"
+                # Send tokens as SSE event, a few at a time when Ollama is fast
+                yield jsonutil.sse_event({'token': token})
 
             # Send completion event
-            yield f"data: {json.dumps({'done': True})}\n\n"
+            yield jsonutil.sse_event({'done': True})
 
             logger.info(f"Successfully processed streaming persona chat for: {persona_id}")
 
         except (OllamaConnectionError, OllamaTimeoutError, OllamaModelNotFoundError, OllamaAPIError) as e:
             # Send error event
-            yield f"data: {json.dumps({'error': str(e), 'type': type(e).__name__})}\n\n"
+            yield jsonutil.sse_event({'error': str(e), 'type': type(e).__name__})
             logger.error(f"Error during persona streaming: {str(e)}")
         except Exception as e:
             # Send generic error event
-            yield f"data: {json.dumps({'error': f'Unexpected error: {str(e)}', 'type': 'UnexpectedError'})}\n\n"
+            yield jsonutil.sse_event({'error': f'Unexpected error: {str(e)}', 'type': 'UnexpectedError'})
             logger.error(f"Unexpected error during persona streaming: {str(e)}", exc_info=True)
         finally:
             # Update session after streaming completes
@@ -529,10 +494,10 @@ def persona_chat_stream():
                     "content": full_response
                 })
 
-                current_app.conversation_store.save_messages(conversation_id, conversation, persona_id)
+                conversation_store.save_messages(conversation_id, conversation, persona_id)
 
                 # Save to history after completion
-                save_to_history(user_message, full_response, model_type, presets_dict, 'persona-chat')
+                queue_history(user_message, full_response, model_type, presets_dict, 'persona-chat')
 
     return current_app.response_class(generate(), mimetype='text/event-stream')
 
@@ -11,16 +11,235 @@ Routes:
     GET /api/categories/<cat>/<type>/artists - Level 3: Artists
     GET /api/artists/<cat>/<type>/<artist>/technical - Level 4: Technical options
     GET /api/artists/<cat>/<type>/<artist>/specifics - Level 5: Scene specifics
+    GET /api/artists/<cat>/<type>/<artist>/bundle - Levels 1-5 for one artist
     GET /api/preset-packs - Quick-start preset packs
     GET /api/universal-options - Universal cross-cutting options
 """
 
-from flask import Blueprint, jsonify, current_app
+from flask import Blueprint, jsonify, current_app, request
+from werkzeug.exceptions import HTTPException
+import gzip
+import hashlib
 import logging
 
+from app import jsonutil
+
 bp = Blueprint('presets', __name__)
 logger = logging.getLogger(__name__)
 
+# (presets dict, _encode() result) for the last presets served by /presets
+_presets_body = (None, None)
+
+# Bodies at least this large are also stored gzip-compressed; smaller ones
+# gain little and are sent as-is
+_GZIP_MIN_SIZE = 1024
+
+# 'error' title of the 500 response for each route's unexpected failures
+_FAILURE_TITLES = {
+    'get_categories': 'Failed to load categories',
+    'get_category_types': 'Failed to load types',
+    'get_artists': 'Failed to load artists',
+    'get_artist_technical': 'Failed to load technical options',
+    'get_artist_specifics': 'Failed to load specifics',
+    'get_artist_bundle': 'Failed to load artist bundle',
+    'get_preset_packs': 'Failed to load preset packs',
+    'get_universal_options': 'Failed to load universal options'
+}
+
+# Body of the 400 returned by hierarchical routes while the feature is off
+_DISABLED_BODY = jsonutil.dumps_bytes({
+    'error': 'Hierarchical presets not enabled',
+    'message': 'Set ENABLE_HIERARCHICAL_PRESETS=true in .env'
+}, sort_keys=True)
+
+# (presets dict, {route key: _encode() result}) for the hierarchical
+# routes; replaced wholesale when load_presets() returns a new dictionary
+_route_bodies = (None, {})
+
+
+def _encode(payload):
+    """
+    Serialize payload for a cacheable response.
+
+    Keys are sorted to match what jsonify produces, and the ETag is a digest
+    of the body so it changes exactly when the response does. Larger bodies
+    are compressed here once, rather than on every request that accepts gzip.
+
+    Args:
+        payload: JSON-serializable response data
+
+    Returns:
+        tuple: (UTF-8 JSON body, ETag value, gzipped body or None)
+    """
+    body = jsonutil.dumps_bytes(payload, sort_keys=True)
+    etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+    gzipped = gzip.compress(body, compresslevel=6) if len(body) >= _GZIP_MIN_SIZE else None
+    return body, etag, gzipped
+
+
+def _presets_json(presets):
+    """
+    Return presets encoded by _encode(), reusing the previous encoding.
+
+    load_presets() returns the same dictionary until the presets file
+    changes, so the body is re-encoded only after an edit.
+
+    Args:
+        presets: Presets dictionary returned by load_presets()
+
+    Returns:
+        tuple: Result of _encode() for presets
+    """
+    global _presets_body
+    cached_presets, encoded = _presets_body
+    if cached_presets is not presets:
+        encoded = _encode(presets)
+        _presets_body = (presets, encoded)
+    return encoded
+
+
+def _popular_first(entries):
+    """
+    Move entries with 'high' popularity to the front, keeping file order.
+
+    Equivalent to a stable sort on popularity == 'high', done as a single
+    partitioning pass.
+
+    Args:
+        entries: List of dicts with a 'popularity' key
+
+    Returns:
+        list: High-popularity entries followed by the rest
+    """
+    high, rest = [], []
+    for entry in entries:
+        (high if entry['popularity'] == 'high' else rest).append(entry)
+    return high + rest
+
+
+def _json_response(encoded):
+    """
+    Wrap an encoded JSON body in a response, honouring If-None-Match.
+
+    Clients get the body's ETag with "Cache-Control: no-cache", so they may
+    keep a copy but revalidate on every use. A matching If-None-Match turns
+    the response into a bodyless 304, and edits to the presets file are
+    still picked up on the next request. Clients that accept gzip get the
+    precompressed body when there is one, under its own ETag.
+
+    Args:
+        encoded: Result of _encode()
+
+    Returns:
+        Response: 200 JSON response, or 304 Not Modified
+    """
+    body, etag, gzipped = encoded
+    if gzipped is not None and request.accept_encodings['gzip']:
+        response = current_app.response_class(gzipped, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+        etag = f'{etag}-gzip'
+    else:
+        response = current_app.response_class(body, mimetype='application/json')
+    if gzipped is not None:
+        response.vary.add('Accept-Encoding')
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+def _disabled_response():
+    """Return the 400 response for hierarchical routes while they are disabled."""
+    return current_app.response_class(_DISABLED_BODY, status=400, mimetype='application/json')
+
+
+def _not_found(error, message):
+    """
+    Return a 404 JSON response for an unknown category, type or artist.
+
+    Encodes the two-field body directly rather than going through jsonify.
+
+    Args:
+        error: Short error title (e.g. 'Category not found')
+        message: Message naming the missing id
+
+    Returns:
+        Response: 404 JSON response
+    """
+    body = jsonutil.dumps_bytes({'error': error, 'message': message}, sort_keys=True)
+    return current_app.response_class(body, status=404, mimetype='application/json')
+
+
+def _cached_response(key, presets):
+    """
+    Return the stored response for key, or None.
+
+    Bodies are stored by _cache_response() and ignored once load_presets()
+    hands back a different presets dictionary, which happens when the
+    presets file changes or the feature flag is toggled.
+
+    Args:
+        key: Tuple identifying the route and its URL parameters
+        presets: Presets dictionary returned by load_presets()
+
+    Returns:
+        Response or None: Cached JSON response, if any
+    """
+    cached_presets, bodies = _route_bodies
+    if cached_presets is not presets:
+        return None
+    encoded = bodies.get(key)
+    return None if encoded is None else _json_response(encoded)
+
+
+def _cache_response(key, presets, payload):
+    """
+    Serialize payload, store it under key and return it as a response.
+
+    Only successful lookups are stored, so the cache is bounded by the
+    number of valid category/type/artist combinations in the presets file.
+
+    Args:
+        key: Tuple identifying the route and its URL parameters
+        presets: Presets dictionary the payload was built from
+        payload: JSON-serializable response data
+
+    Returns:
+        Response: JSON response with the encoded payload
+    """
+    global _route_bodies
+    encoded = _encode(payload)
+    cached_presets, bodies = _route_bodies
+    if cached_presets is not presets:
+        bodies = {}
+        _route_bodies = (presets, bodies)
+    bodies[key] = encoded
+    return _json_response(encoded)
+
+
+@bp.errorhandler(Exception)
+def handle_preset_error(error):
+    """
+    Turn an unexpected exception in a preset route into a JSON 500.
+
+    Replaces a try/except in every route; the response names the data the
+    route was loading, e.g. 'Failed to load categories'. HTTP errors are
+    passed through unchanged.
+
+    Args:
+        error: The exception raised by the route
+
+    Returns:
+        tuple: (JSON response, HTTP status code 500)
+    """
+    if isinstance(error, HTTPException):
+        return error
+    endpoint = request.endpoint.rpartition('.')[2] if request.endpoint else ''
+    logger.error("Error in preset route %s: %s", endpoint, error)
+    return jsonify({
+        'error': _FAILURE_TITLES.get(endpoint, 'Failed to load presets'),
+        'message': str(error)
+    }), 500
+
 
 @bp.route('/presets', methods=['GET'])
 def get_presets():
@@ -31,9 +250,10 @@ def get_presets():
     dropdown menus. Includes all categories: styles, artists,
     composition, and lighting.
 
-    NOTE: This endpoint reloads presets.json from disk on each request,
-    allowing hot-reload without server restart. This makes it easy to
-    edit presets and see changes immediately by refreshing the browser.
+    NOTE: This endpoint picks up edits to presets.json within about a second
+    (load_presets() re-checks the file's mtime), allowing hot-reload without
+    server restart. This makes it easy to edit presets and see changes
+    immediately by refreshing the browser.
 
     Returns:
         JSON: PRESETS dictionary with all preset categories and options
@@ -45,14 +265,14 @@ def get_presets():
             ...
         }
     """
-    logger.debug("Reloading presets from disk for hot-reload")
+    logger.debug("Checking presets file for hot-reload")
 
     # Import load_presets from shared modules
     from app.presets import load_presets
 
-    # Reload presets from file on each request to enable hot-reload
+    # load_presets() re-reads the file only when its mtime has changed
     presets = load_presets()
-    return jsonify(presets)
+    return _json_response(_presets_json(presets))
 
 
 # ============================================================================
@@ -96,41 +316,35 @@ def get_categories():
     from app.presets import load_presets
 
     if not config.ENABLE_HIERARCHICAL_PRESETS:
-        return jsonify({
-            'error': 'Hierarchical presets not enabled',
-            'message': 'Set ENABLE_HIERARCHICAL_PRESETS=true in .env'
-        }), 400
-
-    try:
-        presets = load_presets()
-        categories = []
-
-        for cat_id, cat_data in presets.get('categories', {}).items():
-            categories.append({
-                'id': cat_id,
-                'name': cat_data.get('name', cat_id),
-                'icon': cat_data.get('icon', ''),
-                'description': cat_data.get('description', ''),
-                'popularity': cat_data.get('popularity', 'medium'),
-                'best_for': cat_data.get('best_for', [])
-            })
-
-        # Sort by popularity (high first)
-        categories.sort(key=lambda x: 0 if x['popularity'] == 'high' else 1)
-
-        logger.info(f"Returned {len(categories)} categories")
-
-        return jsonify({
-            'version': presets.get('version', '1.0'),
-            'categories': categories
+        return _disabled_response()
+
+    presets = load_presets()
+    key = ('categories',)
+    response = _cached_response(key, presets)
+    if response is not None:
+        return response
+
+    categories = []
+
+    for cat_id, cat_data in presets.get('categories', {}).items():
+        categories.append({
+            'id': cat_id,
+            'name': cat_data.get('name', cat_id),
+            'icon': cat_data.get('icon', ''),
+            'description': cat_data.get('description', ''),
+            'popularity': cat_data.get('popularity', 'medium'),
+            'best_for': cat_data.get('best_for', [])
         })
 
-    except Exception as e:
-        logger.error(f"Error getting categories: {str(e)}")
-        return jsonify({
-            'error': 'Failed to load categories',
-            'message': str(e)
-        }), 500
+    # High-popularity entries first, otherwise in file order
+    categories = _popular_first(categories)
+
+    logger.debug("Returned %d categories", len(categories))
+
+    return _cache_response(key, presets, {
+        'version': presets.get('version', '1.0'),
+        'categories': categories
+    })
 
 
 @bp.route('/api/categories/<category_id>/types', methods=['GET'])
@@ -152,48 +366,40 @@ def get_category_types(category_id):
     from app.presets import load_presets
 
     if not config.ENABLE_HIERARCHICAL_PRESETS:
-        return jsonify({
-            'error': 'Hierarchical presets not enabled'
-        }), 400
-
-    try:
-        presets = load_presets()
-        category = presets.get('categories', {}).get(category_id)
-
-        if not category:
-            logger.warning(f"Category not found: {category_id}")
-            return jsonify({
-                'error': 'Category not found',
-                'message': f"No category with id '{category_id}'"
-            }), 404
-
-        types = []
-        for type_id, type_data in category.get('level2_types', {}).items():
-            types.append({
-                'id': type_id,
-                'name': type_data.get('name', type_id),
-                'description': type_data.get('description', ''),
-                'icon': type_data.get('icon', ''),
-                'popularity': type_data.get('popularity', 'medium')
-            })
-
-        # Sort by popularity
-        types.sort(key=lambda x: 0 if x['popularity'] == 'high' else 1)
-
-        logger.info(f"Returned {len(types)} types for category '{category_id}'")
-
-        return jsonify({
-            'category_id': category_id,
-            'category_name': category.get('name', category_id),
-            'types': types
+        return _disabled_response()
+
+    presets = load_presets()
+    key = ('types', category_id)
+    response = _cached_response(key, presets)
+    if response is not None:
+        return response
+
+    category = presets.get('categories', {}).get(category_id)
+
+    if not category:
+        logger.warning("Category not found: %s", category_id)
+        return _not_found('Category not found', f"No category with id '{category_id}'")
+
+    types = []
+    for type_id, type_data in category.get('level2_types', {}).items():
+        types.append({
+            'id': type_id,
+            'name': type_data.get('name', type_id),
+            'description': type_data.get('description', ''),
+            'icon': type_data.get('icon', ''),
+            'popularity': type_data.get('popularity', 'medium')
         })
 
-    except Exception as e:
-        logger.error(f"Error getting types for {category_id}: {str(e)}")
-        return jsonify({
-            'error': 'Failed to load types',
-            'message': str(e)
-        }), 500
+    # High-popularity entries first, otherwise in file order
+    types = _popular_first(types)
+
+    logger.debug("Returned %d types for category '%s'", len(types), category_id)
+
+    return _cache_response(key, presets, {
+        'category_id': category_id,
+        'category_name': category.get('name', category_id),
+        'types': types
+    })
 
 
 @bp.route('/api/categories/<category_id>/types/<type_id>/artists', methods=['GET'])
@@ -216,56 +422,47 @@ def get_artists(category_id, type_id):
     from app.presets import load_presets
 
     if not config.ENABLE_HIERARCHICAL_PRESETS:
-        return jsonify({'error': 'Hierarchical presets not enabled'}), 400
-
-    try:
-        presets = load_presets()
-        category = presets.get('categories', {}).get(category_id)
-
-        if not category:
-            return jsonify({
-                'error': 'Category not found',
-                'message': f"No category '{category_id}'"
-            }), 404
-
-        type_data = category.get('level2_types', {}).get(type_id)
-        if not type_data:
-            return jsonify({
-                'error': 'Type not found',
-                'message': f"No type '{type_id}' in category '{category_id}'"
-            }), 404
-
-        artists = []
-        for artist_id, artist_data in type_data.get('level3_artists', {}).items():
-            artists.append({
-                'id': artist_id,
-                'name': artist_data.get('name', artist_id),
-                'description': artist_data.get('description', ''),
-                'signature': artist_data.get('signature', ''),
-                'best_for': artist_data.get('best_for', []),
-                'popularity': artist_data.get('popularity', 'medium'),
-                'has_technical': bool(artist_data.get('level4_technical')),
-                'has_specifics': bool(artist_data.get('level5_specifics'))
-            })
-
-        # Sort by popularity
-        artists.sort(key=lambda x: 0 if x['popularity'] == 'high' else 1)
-
-        logger.info(f"Returned {len(artists)} artists for {category_id}/{type_id}")
-
-        return jsonify({
-            'category_id': category_id,
-            'type_id': type_id,
-            'type_name': type_data.get('name', type_id),
-            'artists': artists
+        return _disabled_response()
+
+    presets = load_presets()
+    key = ('artists', category_id, type_id)
+    response = _cached_response(key, presets)
+    if response is not None:
+        return response
+
+    category = presets.get('categories', {}).get(category_id)
+
+    if not category:
+        return _not_found('Category not found', f"No category '{category_id}'")
+
+    type_data = category.get('level2_types', {}).get(type_id)
+    if not type_data:
+        return _not_found('Type not found', f"No type '{type_id}' in category '{category_id}'")
+
+    artists = []
+    for artist_id, artist_data in type_data.get('level3_artists', {}).items():
+        artists.append({
+            'id': artist_id,
+            'name': artist_data.get('name', artist_id),
+            'description': artist_data.get('description', ''),
+            'signature': artist_data.get('signature', ''),
+            'best_for': artist_data.get('best_for', []),
+            'popularity': artist_data.get('popularity', 'medium'),
+            'has_technical': bool(artist_data.get('level4_technical')),
+            'has_specifics': bool(artist_data.get('level5_specifics'))
         })
 
-    except Exception as e:
-        logger.error(f"Error getting artists: {str(e)}")
-        return jsonify({
-            'error': 'Failed to load artists',
-            'message': str(e)
-        }), 500
+    # High-popularity entries first, otherwise in file order
+    artists = _popular_first(artists)
+
+    logger.debug("Returned %d artists for %s/%s", len(artists), category_id, type_id)
+
+    return _cache_response(key, presets, {
+        'category_id': category_id,
+        'type_id': type_id,
+        'type_name': type_data.get('name', type_id),
+        'artists': artists
+    })
 
 
 @bp.route('/api/artists/<category_id>/<type_id>/<artist_id>/technical', methods=['GET'])
@@ -289,43 +486,36 @@ def get_artist_technical(category_id, type_id, artist_id):
     from app.presets import load_presets
 
     if not config.ENABLE_HIERARCHICAL_PRESETS:
-        return jsonify({'error': 'Hierarchical presets not enabled'}), 400
-
-    try:
-        presets = load_presets()
-
-        # Navigate to artist data
-        artist_data = (presets.get('categories', {})
-                      .get(category_id, {})
-                      .get('level2_types', {})
-                      .get(type_id, {})
-                      .get('level3_artists', {})
-                      .get(artist_id))
-
-        if not artist_data:
-            return jsonify({
-                'error': 'Artist not found',
-                'message': f"No artist '{artist_id}' in {category_id}/{type_id}"
-            }), 404
-
-        technical = artist_data.get('level4_technical', {})
-
-        logger.info(f"Returned technical options for {artist_id}")
-
-        return jsonify({
-            'category_id': category_id,
-            'type_id': type_id,
-            'artist_id': artist_id,
-            'artist_name': artist_data.get('name', artist_id),
-            'technical_options': technical
-        })
+        return _disabled_response()
 
-    except Exception as e:
-        logger.error(f"Error getting technical options: {str(e)}")
-        return jsonify({
-            'error': 'Failed to load technical options',
-            'message': str(e)
-        }), 500
+    presets = load_presets()
+    key = ('technical', category_id, type_id, artist_id)
+    response = _cached_response(key, presets)
+    if response is not None:
+        return response
+
+    # Navigate to artist data
+    artist_data = (presets.get('categories', {})
+                  .get(category_id, {})
+                  .get('level2_types', {})
+                  .get(type_id, {})
+                  .get('level3_artists', {})
+                  .get(artist_id))
+
+    if not artist_data:
+        return _not_found('Artist not found', f"No artist '{artist_id}' in {category_id}/{type_id}")
+
+    technical = artist_data.get('level4_technical', {})
+
+    logger.debug("Returned technical options for %s", artist_id)
+
+    return _cache_response(key, presets, {
+        'category_id': category_id,
+        'type_id': type_id,
+        'artist_id': artist_id,
+        'artist_name': artist_data.get('name', artist_id),
+        'technical_options': technical
+    })
 
 
 @bp.route('/api/artists/<category_id>/<type_id>/<artist_id>/specifics', methods=['GET'])
@@ -349,43 +539,109 @@ def get_artist_specifics(category_id, type_id, artist_id):
     from app.presets import load_presets
 
     if not config.ENABLE_HIERARCHICAL_PRESETS:
-        return jsonify({'error': 'Hierarchical presets not enabled'}), 400
-
-    try:
-        presets = load_presets()
-
-        # Navigate to artist data
-        artist_data = (presets.get('categories', {})
-                      .get(category_id, {})
-                      .get('level2_types', {})
-                      .get(type_id, {})
-                      .get('level3_artists', {})
-                      .get(artist_id))
-
-        if not artist_data:
-            return jsonify({
-                'error': 'Artist not found',
-                'message': f"No artist '{artist_id}' in {category_id}/{type_id}"
-            }), 404
-
-        specifics = artist_data.get('level5_specifics', {})
-
-        logger.info(f"Returned scene specifics for {artist_id}")
-
-        return jsonify({
-            'category_id': category_id,
-            'type_id': type_id,
-            'artist_id': artist_id,
-            'artist_name': artist_data.get('name', artist_id),
-            'scene_specifics': specifics
-        })
+        return _disabled_response()
 
-    except Exception as e:
-        logger.error(f"Error getting specifics: {str(e)}")
-        return jsonify({
-            'error': 'Failed to load specifics',
-            'message': str(e)
-        }), 500
+    presets = load_presets()
+    key = ('specifics', category_id, type_id, artist_id)
+    response = _cached_response(key, presets)
+    if response is not None:
+        return response
+
+    # Navigate to artist data
+    artist_data = (presets.get('categories', {})
+                  .get(category_id, {})
+                  .get('level2_types', {})
+                  .get(type_id, {})
+                  .get('level3_artists', {})
+                  .get(artist_id))
+
+    if not artist_data:
+        return _not_found('Artist not found', f"No artist '{artist_id}' in {category_id}/{type_id}")
+
+    specifics = artist_data.get('level5_specifics', {})
+
+    logger.debug("Returned scene specifics for %s", artist_id)
+
+    return _cache_response(key, presets, {
+        'category_id': category_id,
+        'type_id': type_id,
+        'artist_id': artist_id,
+        'artist_name': artist_data.get('name', artist_id),
+        'scene_specifics': specifics
+    })
+
+
+@bp.route('/api/artists/<category_id>/<type_id>/<artist_id>/bundle', methods=['GET'])
+def get_artist_bundle(category_id, type_id, artist_id):
+    """
+    Get everything about an artist selection (Levels 1-5) in one response.
+
+    Combines the category and type summaries, the artist entry, and the
+    technical options and scene specifics that the /technical and
+    /specifics routes return, saving the client the extra round trips once
+    an artist is chosen (e.g. when applying a preset pack).
+
+    Args:
+        category_id: ID of the category
+        type_id: ID of the type
+        artist_id: ID of the artist
+
+    Returns:
+        JSON: Category, type and artist summaries plus Level 4 and 5 options
+
+    Example:
+        GET /api/artists/photography/portrait/annie_leibovitz/bundle
+    """
+    from app.config import config
+    from app.presets import load_presets
+
+    if not config.ENABLE_HIERARCHICAL_PRESETS:
+        return _disabled_response()
+
+    presets = load_presets()
+    key = ('bundle', category_id, type_id, artist_id)
+    response = _cached_response(key, presets)
+    if response is not None:
+        return response
+
+    category = presets.get('categories', {}).get(category_id)
+    if not category:
+        return _not_found('Category not found', f"No category '{category_id}'")
+
+    type_data = category.get('level2_types', {}).get(type_id)
+    if not type_data:
+        return _not_found('Type not found', f"No type '{type_id}' in category '{category_id}'")
+
+    artist_data = type_data.get('level3_artists', {}).get(artist_id)
+    if not artist_data:
+        return _not_found('Artist not found', f"No artist '{artist_id}' in {category_id}/{type_id}")
+
+    logger.debug("Returned bundle for %s/%s/%s", category_id, type_id, artist_id)
+
+    return _cache_response(key, presets, {
+        'category': {
+            'id': category_id,
+            'name': category.get('name', category_id),
+            'icon': category.get('icon', ''),
+            'description': category.get('description', '')
+        },
+        'type': {
+            'id': type_id,
+            'name': type_data.get('name', type_id),
+            'icon': type_data.get('icon', ''),
+            'description': type_data.get('description', '')
+        },
+        'artist': {
+            'id': artist_id,
+            'name': artist_data.get('name', artist_id),
+            'description': artist_data.get('description', ''),
+            'signature': artist_data.get('signature', ''),
+            'best_for': artist_data.get('best_for', []),
+            'popularity': artist_data.get('popularity', 'medium')
+        },
+        'technical_options': artist_data.get('level4_technical', {}),
+        'scene_specifics': artist_data.get('level5_specifics', {})
+    })
 
 
 @bp.route('/api/preset-packs', methods=['GET'])
@@ -420,24 +676,21 @@ def get_preset_packs():
     from app.presets import load_presets
 
     if not config.ENABLE_HIERARCHICAL_PRESETS:
-        return jsonify({'error': 'Hierarchical presets not enabled'}), 400
+        return _disabled_response()
 
-    try:
-        presets = load_presets()
-        packs = presets.get('preset_packs', {}).get('packs', [])
+    presets = load_presets()
+    key = ('preset_packs',)
+    response = _cached_response(key, presets)
+    if response is not None:
+        return response
 
-        logger.info(f"Returned {len(packs)} preset packs")
+    packs = presets.get('preset_packs', {}).get('packs', [])
 
-        return jsonify({
-            'packs': packs
-        })
+    logger.debug("Returned %d preset packs", len(packs))
 
-    except Exception as e:
-        logger.error(f"Error getting preset packs: {str(e)}")
-        return jsonify({
-            'error': 'Failed to load preset packs',
-            'message': str(e)
-        }), 500
+    return _cache_response(key, presets, {
+        'packs': packs
+    })
 
 
 @bp.route('/api/universal-options', methods=['GET'])
@@ -471,21 +724,18 @@ def get_universal_options():
     from app.presets import load_presets
 
     if not config.ENABLE_HIERARCHICAL_PRESETS:
-        return jsonify({'error': 'Hierarchical presets not enabled'}), 400
+        return _disabled_response()
 
-    try:
-        presets = load_presets()
-        universal = presets.get('universal_options', {})
+    presets = load_presets()
+    key = ('universal_options',)
+    response = _cached_response(key, presets)
+    if response is not None:
+        return response
 
-        logger.info(f"Returned universal options ({len(universal)} categories)")
+    universal = presets.get('universal_options', {})
 
-        return jsonify({
-            'universal_options': universal
-        })
+    logger.debug("Returned universal options (%d categories)", len(universal))
 
-    except Exception as e:
-        logger.error(f"Error getting universal options: {str(e)}")
-        return jsonify({
-            'error': 'Failed to load universal options',
-            'message': str(e)
-        }), 500
+    return _cache_response(key, presets, {
+        'universal_options': universal
+    })
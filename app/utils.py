@@ -9,7 +9,9 @@ This module contains helper functions for:
 
 import logging
 import os
-from typing import Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
 
 from app.config import config
 
@@ -17,15 +19,70 @@ from app.config import config
 logger = logging.getLogger(__name__)
 
 
+def _read_prompt(path: str, fallback: str) -> str:
+    """
+    Read a single prompt file, returning fallback if it is missing, empty or unreadable.
+
+    Args:
+        path: Path to the prompt text file
+        fallback: Prompt text to use when the file cannot be used
+
+    Returns:
+        str: Stripped file content, or fallback
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read().strip()
+    except FileNotFoundError:
+        logger.warning("%s not found, using fallback", path)
+        return fallback
+    except Exception as e:
+        logger.error("Error loading %s: %s, using fallback", path, e)
+        return fallback
+
+    if not content:
+        logger.warning("%s is empty, using fallback", path)
+        return fallback
+
+    logger.info("Loaded prompt from %s", path)
+    return content
+
+
+def _baked_prompts() -> Dict[str, str]:
+    """
+    Return prompts baked into app/_prompts_baked.py, if that module exists.
+
+    The module is generated by bake_prompts.py for frozen deployments where
+    the prompt files never change, so importing it (from its cached .pyc)
+    replaces reading prompts/ at startup. It is not checked in.
+
+    Returns:
+        dict: PROMPT_FILES key -> prompt text, or {} when nothing is baked
+    """
+    try:
+        from app import _prompts_baked
+    except ImportError:
+        return {}
+
+    logger.info("Using baked system prompts from app/_prompts_baked.py")
+    return _prompts_baked.PROMPTS
+
+
+@lru_cache(maxsize=1)
 def load_prompts() -> Tuple[Dict[str, str], Dict[str, str]]:
     """
     Load system prompts from text files in the prompts/ directory.
 
+    The result is memoized and nothing is read until the first call (see
+    get_system_prompts); reload_system_prompts() clears the cache before
+    re-reading the files.
+
     Returns:
-        tuple: (SYSTEM_PROMPTS dict, CHAT_SYSTEM_PROMPTS dict)
+        tuple: (system prompts dict, chat system prompts dict)
 
     This function attempts to load prompts from external text files, enabling
-    prompt editing without code changes. If files are missing or unreadable,
+    prompt editing without code changes. Prompts baked by bake_prompts.py
+    take precedence over the files when present (see _baked_prompts). If files are missing or unreadable,
     it falls back to hardcoded default prompts to ensure the app remains functional.
 
     The function logs all operations for debugging and provides helpful error
@@ -88,82 +145,116 @@ For each reply:
 Avoid emitting a single "PROMPT:" response. Keep the tone collaborative and idea-focused."""
     }
 
-    system_prompts = {}
-    chat_prompts = {}
-
     # Get prompt files from config
     prompt_files = config.PROMPT_FILES
+    models = ('sdxl', 'flux')
+    fallbacks = {}
+    for model in models:
+        fallbacks[f'{model}_oneshot'] = fallback_system_prompts[model]
+        fallbacks[f'{model}_chat'] = fallback_chat_prompts[model]
+
+    texts = _baked_prompts().copy()
+    to_read = [file_key for file_key in fallbacks if file_key not in texts]
+    if to_read:
+        # Read the files concurrently; file reads release the GIL, which
+        # matters when prompts/ lives on a slow or network filesystem
+        with ThreadPoolExecutor(max_workers=len(to_read)) as executor:
+            contents = executor.map(lambda key: _read_prompt(prompt_files[key], fallbacks[key]), to_read)
+            texts.update(zip(to_read, contents))
+
+    system_prompts = {model: texts[f'{model}_oneshot'] for model in models}
+    chat_prompts = {model: texts[f'{model}_chat'] for model in models}
 
-    # Try to load SDXL oneshot prompt
-    try:
-        with open(prompt_files['sdxl_oneshot'], 'r', encoding='utf-8') as f:
-            content = f.read().strip()
-            if content:
-                system_prompts['sdxl'] = content
-                logger.info("Loaded SDXL oneshot prompt from prompts/sdxl_oneshot.txt")
-            else:
-                logger.warning("prompts/sdxl_oneshot.txt is empty, using fallback")
-                system_prompts['sdxl'] = fallback_system_prompts['sdxl']
-    except FileNotFoundError:
-        logger.warning("prompts/sdxl_oneshot.txt not found, using fallback")
-        system_prompts['sdxl'] = fallback_system_prompts['sdxl']
-    except Exception as e:
-        logger.error(f"Error loading prompts/sdxl_oneshot.txt: {e}, using fallback")
-        system_prompts['sdxl'] = fallback_system_prompts['sdxl']
+    logger.info("System prompts loaded successfully")
+    return system_prompts, chat_prompts
 
-    # Try to load Flux oneshot prompt
-    try:
-        with open(prompt_files['flux_oneshot'], 'r', encoding='utf-8') as f:
-            content = f.read().strip()
-            if content:
-                system_prompts['flux'] = content
-                logger.info("Loaded Flux oneshot prompt from prompts/flux_oneshot.txt")
-            else:
-                logger.warning("prompts/flux_oneshot.txt is empty, using fallback")
-                system_prompts['flux'] = fallback_system_prompts['flux']
-    except FileNotFoundError:
-        logger.warning("prompts/flux_oneshot.txt not found, using fallback")
-        system_prompts['flux'] = fallback_system_prompts['flux']
-    except Exception as e:
-        logger.error(f"Error loading prompts/flux_oneshot.txt: {e}, using fallback")
-        system_prompts['flux'] = fallback_system_prompts['flux']
 
-    # Try to load SDXL chat prompt
-    try:
-        with open(prompt_files['sdxl_chat'], 'r', encoding='utf-8') as f:
-            content = f.read().strip()
-            if content:
-                chat_prompts['sdxl'] = content
-                logger.info("Loaded SDXL chat prompt from prompts/sdxl_chat.txt")
-            else:
-                logger.warning("prompts/sdxl_chat.txt is empty, using fallback")
-                chat_prompts['sdxl'] = fallback_chat_prompts['sdxl']
-    except FileNotFoundError:
-        logger.warning("prompts/sdxl_chat.txt not found, using fallback")
-        chat_prompts['sdxl'] = fallback_chat_prompts['sdxl']
-    except Exception as e:
-        logger.error(f"Error loading prompts/sdxl_chat.txt: {e}, using fallback")
-        chat_prompts['sdxl'] = fallback_chat_prompts['sdxl']
+# Translation table for turning preset IDs ("golden_hour") into display text
+_UNDERSCORE_TO_SPACE = str.maketrans('_', ' ')
 
-    # Try to load Flux chat prompt
-    try:
-        with open(prompt_files['flux_chat'], 'r', encoding='utf-8') as f:
-            content = f.read().strip()
-            if content:
-                chat_prompts['flux'] = content
-                logger.info("Loaded Flux chat prompt from prompts/flux_chat.txt")
-            else:
-                logger.warning("prompts/flux_chat.txt is empty, using fallback")
-                chat_prompts['flux'] = fallback_chat_prompts['flux']
-    except FileNotFoundError:
-        logger.warning("prompts/flux_chat.txt not found, using fallback")
-        chat_prompts['flux'] = fallback_chat_prompts['flux']
-    except Exception as e:
-        logger.error(f"Error loading prompts/flux_chat.txt: {e}, using fallback")
-        chat_prompts['flux'] = fallback_chat_prompts['flux']
+# Universal options in prompt order: (selection key, line label, list-valued)
+_UNIVERSAL_FIELDS = (
+    ('mood', "Mood: ", True),
+    ('time_of_day', "Time: ", False),
+    ('lighting', "Lighting: ", False),
+    ('color_palette', "Colors: ", False),
+    ('weather_atmosphere', "Weather: ", False),
+    ('camera_effects', "Camera Effects: ", True),
+)
+
+
+def _format_scene_list(buf: list, label: str, value: list) -> None:
+    """Write a multi-select level 5 value as one comma-separated line."""
+    buf.extend(("- ", label, ": ", ', '.join(value), "\n"))
+
+
+def _format_scene_dict(buf: list, label: str, value: Dict) -> None:
+    """Write nested level 5 selections as one line per sub-key."""
+    for sub_key, sub_value in value.items():
+        sub_label = sub_key.translate(_UNDERSCORE_TO_SPACE).title()
+        buf.extend(("- ", label, " - ", sub_label, ": ", str(sub_value), "\n"))
 
-    logger.info("System prompts loaded successfully")
-    return system_prompts, chat_prompts
+
+def _format_scene_value(buf: list, label: str, value) -> None:
+    """Write a single level 5 value, turning its ID into display text."""
+    buf.extend(("- ", label, ": ", str(value).translate(_UNDERSCORE_TO_SPACE), "\n"))
+
+
+# Level 5 formatters by exact JSON value type; anything else is a scalar
+_SCENE_FORMATTERS = {
+    list: _format_scene_list,
+    dict: _format_scene_dict,
+}
+
+
+class _Artist(NamedTuple):
+    """Level 3 artist fields used by the prompt builder."""
+
+    name: Optional[str]
+    description: Optional[str]
+    signature: Optional[str]
+    level4_technical: Dict
+
+
+# (presets_data, index) for the most recently indexed presets dict
+_artist_index_cache = (None, {})
+
+
+def _artist_index(presets_data: Dict) -> Dict[Tuple[str, str, str], _Artist]:
+    """
+    Return a flat (category, type, artist) -> _Artist index for presets_data.
+
+    The index is rebuilt only when a different presets object is passed in,
+    so the loaded (and memoized) presets are walked once rather than on
+    every prompt. It is kept here rather than inside presets_data because
+    the presets dict is also served as JSON by the /presets route. Entries
+    are _Artist tuples, so the builder reads fields by attribute instead of
+    repeated dict.get() calls.
+
+    Args:
+        presets_data: Full hierarchical presets JSON data
+
+    Returns:
+        dict: _Artist entries keyed by (level1, level2, level3) IDs
+    """
+    global _artist_index_cache
+    cached_data, index = _artist_index_cache
+    if cached_data is presets_data:
+        return index
+
+    index = {
+        (category_id, type_id, artist_id): _Artist(
+            artist.get('name'),
+            artist.get('description'),
+            artist.get('signature'),
+            artist.get('level4_technical', {}),
+        )
+        for category_id, category in presets_data.get('categories', {}).items()
+        for type_id, type_data in category.get('level2_types', {}).items()
+        for artist_id, artist in type_data.get('level3_artists', {}).items()
+    }
+    _artist_index_cache = (presets_data, index)
+    return index
 
 
 def build_hierarchical_prompt(user_input: str, selections: Dict, presets_data: Dict) -> str:
@@ -201,13 +292,95 @@ def build_hierarchical_prompt(user_input: str, selections: Dict, presets_data: D
 
         Style: Photography > Portrait > Annie Leibovitz
         ...
+
+    Results are memoized per (user_input, selections, presets object), so
+    re-submitting the same selections (e.g. "regenerate") skips the rebuild.
+    Reloading presets produces a new presets object and therefore new keys.
     """
     if not selections:
         logger.debug("No hierarchical selections provided, returning user input as-is")
         return user_input
 
     try:
-        prompt_parts = [user_input, ""]
+        key = _SelectionsKey(selections)
+    except TypeError:
+        # Selections contain values we cannot freeze; build without caching
+        return _build_hierarchical_prompt(user_input, selections, presets_data)
+
+    return _build_hierarchical_prompt_cached(user_input, key, _PresetsRef(presets_data))
+
+
+def _freeze(value):
+    """
+    Convert a JSON-style value into a hashable equivalent.
+
+    Dict and list order is preserved because it determines the order of
+    lines in the built prompt, and leaves carry their type so that, for
+    example, 1 and True do not share a cache entry.
+
+    Raises:
+        TypeError: If value contains something unhashable
+    """
+    if isinstance(value, dict):
+        return (dict, tuple((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return (list, tuple(_freeze(v) for v in value))
+    hash(value)
+    return (type(value), value)
+
+
+class _SelectionsKey:
+    """Cache key that compares by frozen selections but keeps the original dict."""
+
+    __slots__ = ('selections', '_frozen', '_hash')
+
+    def __init__(self, selections):
+        self.selections = selections
+        self._frozen = _freeze(selections)
+        self._hash = hash(self._frozen)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        return isinstance(other, _SelectionsKey) and self._frozen == other._frozen
+
+
+class _PresetsRef:
+    """Cache key that compares a presets dictionary by identity."""
+
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data
+
+    def __hash__(self):
+        return id(self.data)
+
+    def __eq__(self, other):
+        return isinstance(other, _PresetsRef) and self.data is other.data
+
+
+@lru_cache(maxsize=256)
+def _build_hierarchical_prompt_cached(user_input: str, key: _SelectionsKey, presets: _PresetsRef) -> str:
+    """Memoized wrapper around _build_hierarchical_prompt."""
+    return _build_hierarchical_prompt(user_input, key.selections, presets.data)
+
+
+def _build_hierarchical_prompt(user_input: str, selections: Dict, presets_data: Dict) -> str:
+    """
+    Build the enhanced prompt text (uncached implementation of build_hierarchical_prompt).
+
+    Args:
+        user_input: User's basic image idea
+        selections: Hierarchical selections at each level
+        presets_data: Full hierarchical presets JSON data
+
+    Returns:
+        str: Enhanced prompt, or user_input if the selections cannot be used
+    """
+    try:
+        buf = [user_input, "\n\n"]
 
         # Get category data (Level 1)
         category_id = selections.get('level1')
@@ -217,7 +390,7 @@ def build_hierarchical_prompt(user_input: str, selections: Dict, presets_data: D
 
         category = presets_data.get('categories', {}).get(category_id)
         if not category:
-            logger.warning(f"Category '{category_id}' not found in presets")
+            logger.warning("Category '%s' not found in presets", category_id)
             return user_input
 
         # Level 2: Type
@@ -225,29 +398,32 @@ def build_hierarchical_prompt(user_input: str, selections: Dict, presets_data: D
         type_data = category.get('level2_types', {}).get(type_id) if type_id else None
 
         if type_data:
-            prompt_parts.append(f"Style: {category['name']} > {type_data['name']}")
+            buf.extend(("Style: ", category['name'], " > ", type_data['name'], "\n"))
 
         # Level 3: Artist/Style
         artist_id = selections.get('level3')
-        artist_data = type_data.get('level3_artists', {}).get(artist_id) if type_data and artist_id else None
+        artist_data = (
+            _artist_index(presets_data).get((category_id, type_id, artist_id))
+            if type_data and artist_id else None
+        )
 
         if artist_data:
-            prompt_parts.append(f"Artist Style: {artist_data['name']}")
+            buf.extend(("Artist Style: ", artist_data.name, "\n"))
 
-            if artist_data.get('description'):
-                prompt_parts.append(f"Description: {artist_data['description']}")
+            if artist_data.description:
+                buf.extend(("Description: ", artist_data.description, "\n"))
 
-            if artist_data.get('signature'):
-                prompt_parts.append(f"Signature: {artist_data['signature']}")
+            if artist_data.signature:
+                buf.extend(("Signature: ", artist_data.signature, "\n"))
 
-            prompt_parts.append("")
+            buf.append("\n")
 
         # Level 4: Technical details
         level4_selections = selections.get('level4', {})
         if level4_selections and artist_data:
-            technical_opts = artist_data.get('level4_technical', {})
+            technical_opts = artist_data.level4_technical
             if technical_opts:
-                prompt_parts.append("Technical Details:")
+                buf.append("Technical Details:\n")
                 for tech_key, tech_value in level4_selections.items():
                     tech_category = technical_opts.get(tech_key)
                     if tech_category:
@@ -256,80 +432,213 @@ def build_hierarchical_prompt(user_input: str, selections: Dict, presets_data: D
                         if options and isinstance(options[0], dict):
                             option = next((opt for opt in options if opt.get('id') == tech_value), None)
                             if option:
-                                desc = f" ({option.get('description')})" if option.get('description') else ""
-                                prompt_parts.append(f"- {tech_category['name']}: {option['name']}{desc}")
+                                buf.extend(("- ", tech_category['name'], ": ", option['name']))
+                                if option.get('description'):
+                                    buf.extend((" (", str(option['description']), ")"))
+                                buf.append("\n")
                         else:
                             # Simple string list
-                            prompt_parts.append(f"- {tech_category['name']}: {tech_value.replace('_', ' ')}")
-                prompt_parts.append("")
+                            buf.extend((
+                                "- ", tech_category['name'], ": ", tech_value.translate(_UNDERSCORE_TO_SPACE), "\n"
+                            ))
+                buf.append("\n")
 
         # Level 5: Scene specifics
         level5_selections = selections.get('level5', {})
         if level5_selections:
-            prompt_parts.append("Scene Details:")
+            buf.append("Scene Details:\n")
             for key, value in level5_selections.items():
-                formatted_key = key.replace('_', ' ').title()
-                if isinstance(value, list):
-                    prompt_parts.append(f"- {formatted_key}: {', '.join(value)}")
-                elif isinstance(value, dict):
-                    # Handle nested selections
-                    for sub_key, sub_value in value.items():
-                        formatted_sub_key = sub_key.replace('_', ' ').title()
-                        prompt_parts.append(f"- {formatted_key} - {formatted_sub_key}: {sub_value}")
-                else:
-                    formatted_value = str(value).replace('_', ' ')
-                    prompt_parts.append(f"- {formatted_key}: {formatted_value}")
-            prompt_parts.append("")
+                formatter = _SCENE_FORMATTERS.get(type(value), _format_scene_value)
+                formatter(buf, key.translate(_UNDERSCORE_TO_SPACE).title(), value)
+            buf.append("\n")
 
         # Universal options
         universal = selections.get('universal', {})
         if universal:
             universal_added = False
 
-            if universal.get('mood'):
-                moods = universal['mood'] if isinstance(universal['mood'], list) else [universal['mood']]
-                prompt_parts.append(f"Mood: {', '.join(moods)}")
+            for option_key, label, is_list in _UNIVERSAL_FIELDS:
+                value = universal.get(option_key)
+                if not value:
+                    continue
+                if is_list:
+                    buf.extend((label, ', '.join(value if isinstance(value, list) else [value]), "\n"))
+                else:
+                    buf.extend((label, value.translate(_UNDERSCORE_TO_SPACE), "\n"))
                 universal_added = True
 
-            if universal.get('time_of_day'):
-                prompt_parts.append(f"Time: {universal['time_of_day'].replace('_', ' ')}")
-                universal_added = True
+            if universal_added:
+                buf.append("\n")
 
-            if universal.get('lighting'):
-                prompt_parts.append(f"Lighting: {universal['lighting'].replace('_', ' ')}")
-                universal_added = True
+        enhanced_prompt = "".join(buf).strip()
+        logger.info(
+            "Built hierarchical prompt (%d chars) from %d level selections", len(enhanced_prompt), len(selections)
+        )
 
-            if universal.get('color_palette'):
-                prompt_parts.append(f"Colors: {universal['color_palette'].replace('_', ' ')}")
-                universal_added = True
+        return enhanced_prompt
 
-            if universal.get('weather_atmosphere'):
-                prompt_parts.append(f"Weather: {universal['weather_atmosphere'].replace('_', ' ')}")
-                universal_added = True
+    except Exception as e:
+        logger.error("Error building hierarchical prompt: %s", e)
+        logger.debug("Selections: %s", selections)
+        # Return original user input on error
+        return user_input
 
-            if universal.get('camera_effects'):
-                effects = universal['camera_effects'] if isinstance(universal['camera_effects'], list) else [universal['camera_effects']]
-                prompt_parts.append(f"Camera Effects: {', '.join(effects)}")
-                universal_added = True
 
-            if universal_added:
-                prompt_parts.append("")
+# Legacy preset categories, in prompt order, with the label for each line
+_PRESET_LABELS = (
+    ('styles', 'Style: '),
+    ('artists', 'Artist/Style: '),
+    ('composition', 'Composition: '),
+    ('lighting', 'Lighting: '),
+)
 
-        enhanced_prompt = "\n".join(prompt_parts).strip()
-        logger.info(f"Built hierarchical prompt ({len(enhanced_prompt)} chars) from {len(selections)} level selections")
+# (presets, {(category, preset name): context line}) for the last presets seen
+_preset_lines_cache = (None, {})
 
-        return enhanced_prompt
 
-    except Exception as e:
-        logger.error(f"Error building hierarchical prompt: {e}")
-        logger.debug(f"Selections: {selections}")
-        # Return original user input on error
+def _preset_lines(presets: Dict) -> Dict[Tuple[str, str], str]:
+    """
+    Return the formatted context line for every legacy preset in presets.
+
+    Lines are built once per presets object. The "None" entry of each
+    category is left out, so selecting it adds nothing to the prompt.
+
+    Args:
+        presets: Legacy presets dictionary (styles, artists, composition, lighting)
+
+    Returns:
+        dict: e.g. {('styles', 'Cinematic'): 'Style: cinematic, dramatic, ...'}
+    """
+    global _preset_lines_cache
+    cached_presets, lines = _preset_lines_cache
+    if cached_presets is presets:
+        return lines
+
+    lines = {
+        (category, name): label + value
+        for category, label in _PRESET_LABELS
+        for name, value in presets.get(category, {}).items()
+        if name != 'None'
+    }
+    _preset_lines_cache = (presets, lines)
+    return lines
+
+
+class PromptRequest(NamedTuple):
+    """
+    Fields shared by the generate, chat and persona request bodies.
+
+    Unpacks in field order, so a route can read everything it needs in one
+    statement instead of a .get() per field.
+    """
+
+    text: str
+    model_type: str
+    ollama_model: str
+    style: str
+    artist: str
+    composition: str
+    lighting: str
+    selections: Optional[Dict]
+
+    @classmethod
+    def from_json(cls, data: Dict, text_field: str) -> 'PromptRequest':
+        """
+        Read a request body, applying the defaults every route uses.
+
+        Args:
+            data: Parsed JSON body
+            text_field: Key holding the user's text ('input' or 'message')
+
+        Returns:
+            PromptRequest: Stripped text; model 'flux', OLLAMA_MODEL and
+            'None' presets when omitted
+        """
+        get = data.get
+        return cls(
+            get(text_field, '').strip(),
+            get('model', 'flux'),
+            get('ollama_model', config.OLLAMA_MODEL),
+            get('style', 'None'),
+            get('artist', 'None'),
+            get('composition', 'None'),
+            get('lighting', 'None'),
+            get('selections'),
+        )
+
+
+def build_preset_context(presets: Dict, style, artist, composition, lighting) -> list:
+    """
+    Return the context lines for the selected legacy presets.
+
+    Args:
+        presets: Legacy presets dictionary
+        style: Selected style name (or 'None')
+        artist: Selected artist name (or 'None')
+        composition: Selected composition name (or 'None')
+        lighting: Selected lighting name (or 'None')
+
+    Returns:
+        list: Lines such as "Style: ..." for each known, non-"None" selection,
+              in style, artist, composition, lighting order
+    """
+    lines = _preset_lines(presets)
+    selected = (
+        lines.get(('styles', style)),
+        lines.get(('artists', artist)),
+        lines.get(('composition', composition)),
+        lines.get(('lighting', lighting)),
+    )
+    return [line for line in selected if line is not None]
+
+
+# User message wrappers for legacy preset context, filled by format_user_message()
+_ONESHOT_MESSAGE_TEMPLATE = (
+    "User's image idea: {}\n\nSelected presets:\n{}\n\n"
+    "Please create a detailed prompt incorporating these elements."
+)
+_CHAT_MESSAGE_TEMPLATE = "{}\n\n[Selected presets: {}]"
+
+
+def format_user_message(user_input: str, preset_context: list, chat_mode: bool = False) -> str:
+    """
+    Combine the user's text with legacy preset context lines.
+
+    Args:
+        user_input: Text the user typed
+        preset_context: Lines from build_preset_context()
+        chat_mode: Use the compact chat wrapper instead of the one-shot one
+
+    Returns:
+        str: The message to send, or user_input unchanged without presets
+    """
+    if not preset_context:
         return user_input
+    template = _CHAT_MESSAGE_TEMPLATE if chat_mode else _ONESHOT_MESSAGE_TEMPLATE
+    return template.format(user_input, "\n".join(preset_context))
 
 
-# Load system prompts at module import time
-# These can be reloaded dynamically via the /admin/reload-prompts endpoint
-SYSTEM_PROMPTS, CHAT_SYSTEM_PROMPTS = load_prompts()
+def get_system_prompts() -> Dict[str, str]:
+    """
+    Return the oneshot system prompts, loading them on first use.
+
+    Prompts are read lazily rather than at import time; later calls hit the
+    load_prompts() cache until reload_system_prompts() refreshes it.
+
+    Returns:
+        dict: Model type -> oneshot system prompt
+    """
+    return load_prompts()[0]
+
+
+def get_chat_system_prompts() -> Dict[str, str]:
+    """
+    Return the chat-mode system prompts, loading them on first use.
+
+    Returns:
+        dict: Model type -> chat system prompt
+    """
+    return load_prompts()[1]
 
 
 def get_system_prompt(model_type: str, chat_mode: bool = False) -> str:
@@ -343,10 +652,8 @@ def get_system_prompt(model_type: str, chat_mode: bool = False) -> str:
     Returns:
         str: System prompt content
     """
-    if chat_mode:
-        return CHAT_SYSTEM_PROMPTS.get(model_type, CHAT_SYSTEM_PROMPTS.get('flux', ''))
-    else:
-        return SYSTEM_PROMPTS.get(model_type, SYSTEM_PROMPTS.get('flux', ''))
+    prompts = get_chat_system_prompts() if chat_mode else get_system_prompts()
+    return prompts.get(model_type, prompts.get('flux', ''))
 
 
 def reload_system_prompts() -> Tuple[Dict[str, str], Dict[str, str]]:
@@ -357,8 +664,7 @@ def reload_system_prompts() -> Tuple[Dict[str, str], Dict[str, str]]:
     without restarting the application.
 
     Returns:
-        tuple: (SYSTEM_PROMPTS dict, CHAT_SYSTEM_PROMPTS dict)
+        tuple: (system prompts dict, chat system prompts dict)
     """
-    global SYSTEM_PROMPTS, CHAT_SYSTEM_PROMPTS
-    SYSTEM_PROMPTS, CHAT_SYSTEM_PROMPTS = load_prompts()
-    return SYSTEM_PROMPTS, CHAT_SYSTEM_PROMPTS
+    load_prompts.cache_clear()
+    return load_prompts()
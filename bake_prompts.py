@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Prompt Baking Script
+Bake the system prompt files into an importable Python module
+
+For frozen deployments (containers, read-only images) where prompts/ never
+changes, this writes app/_prompts_baked.py containing the text of every
+file in Config.PROMPT_FILES. load_prompts() imports that module instead of
+reading the prompt files at startup.
+
+Edits to prompts/*.txt are ignored while the baked module exists, so re-run
+this script after changing a prompt, or run it with --remove to go back to
+reading the files.
+
+Usage:
+    python bake_prompts.py           # Write app/_prompts_baked.py
+    python bake_prompts.py --remove  # Delete it again
+"""
+
+import os
+import sys
+
+from app.config import config
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BAKED_MODULE = os.path.join(BASE_DIR, 'app', '_prompts_baked.py')
+
+
+def bake():
+    """Write every prompt file into BAKED_MODULE. Returns True on success."""
+    prompts = {}
+    for file_key, path in config.PROMPT_FILES.items():
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read().strip()
+        except OSError as e:
+            print(f"   ✗ Cannot read {path}: {e}")
+            return False
+        if not content:
+            print(f"   ✗ {path} is empty")
+            return False
+        prompts[file_key] = content
+        print(f"   ✓ {file_key}: {len(content)} chars")
+
+    lines = [
+        '"""System prompts baked by bake_prompts.py. Do not edit; re-run the script instead."""',
+        '',
+        'PROMPTS = {',
+    ]
+    lines.extend(f'    {key!r}: {text!r},' for key, text in prompts.items())
+    lines.append('}')
+
+    tmp_path = BAKED_MODULE + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    os.replace(tmp_path, BAKED_MODULE)
+    return True
+
+
+def main():
+    if '--remove' in sys.argv[1:]:
+        if os.path.exists(BAKED_MODULE):
+            os.remove(BAKED_MODULE)
+            print(f"✓ Removed {BAKED_MODULE}")
+        else:
+            print(f"Nothing to remove: {BAKED_MODULE} does not exist")
+        return 0
+
+    print("📦 Baking system prompts...")
+    if not bake():
+        print("❌ Baking failed; app/_prompts_baked.py was not written")
+        return 1
+
+    print(f"✓ Wrote {BAKED_MODULE}")
+    print("  Re-run this script after editing prompts/*.txt, or use --remove to read the files again.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
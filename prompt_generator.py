@@ -42,8 +42,25 @@ if __name__ == '__main__':
     """
     Run the Flask development server.
 
-    For production deployments, use a WSGI server like Gunicorn:
-        gunicorn -w 4 -b 0.0.0.0:5000 prompt_generator:app
+    For production deployments, use a WSGI server like Gunicorn with
+    threaded workers. Each streaming response holds its thread for the
+    whole generation, so sync workers would cap concurrent streams at the
+    worker count; threads are cheap while they wait on Ollama:
+        gunicorn -w 1 --worker-class gthread --threads 32 -b 0.0.0.0:5000 prompt_generator:app
+
+    Put nginx in front of it to serve /static/ from disk (see
+    nginx.conf.example) so asset requests never reach a worker thread.
+
+    Keep it to one worker process and scale with --threads. Several state
+    holders live inside the process: the conversation store's in-memory
+    transcripts and their buffered writes, the cached /models list and
+    preset response bodies, the queued history writes, and the system
+    prompts that /admin/reload-prompts reloads. A second worker would keep
+    its own copies, so it could serve a stale conversation and overwrite
+    newer turns when it flushes, serve an outdated model list or presets,
+    hide history rows that are still queued in the other worker, and keep
+    answering with the old prompts after a reload. The work is I/O-bound
+    waiting on Ollama, so a second process would not add throughput anyway.
     """
     print("\n" + "="*70)
     print("🎨 ComfyUI Prompt Generator")
@@ -57,5 +74,6 @@ if __name__ == '__main__':
     app.run(
         host='0.0.0.0',
         port=config.FLASK_PORT,
-        debug=config.FLASK_DEBUG
+        debug=config.FLASK_DEBUG,
+        threaded=True
     )
@@ -7,40 +7,70 @@ Run this if you need to revert to the original presets.json
 import os
 import sys
 import shutil
-import glob
+import tempfile
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 BACKUP_DIR = os.path.join(BASE_DIR, 'backups')
 
+
+def copy_file(src, dst):
+    """
+    Copy src over dst without copying metadata
+
+    Uses os.copy_file_range where available so the kernel can copy (or
+    reflink, on copy-on-write filesystems) without a user-space buffer;
+    falls back to shutil.copyfile otherwise.
+    """
+    copy_file_range = getattr(os, 'copy_file_range', None)
+    if copy_file_range is not None:
+        try:
+            with open(src, 'rb') as s, open(dst, 'wb') as d:
+                while copy_file_range(s.fileno(), d.fileno(), 2 ** 30):
+                    pass
+            return
+        except OSError:
+            pass
+    shutil.copyfile(src, dst)
+
+
 def rollback():
     """Restore most recent backup"""
     print("🔄 Rolling back to old preset system...")
 
     # Find most recent backup
-    backups = glob.glob(os.path.join(BACKUP_DIR, 'presets_backup_*.json'))
-    if not backups:
+    # (scandir's DirEntry caches the stat, so each candidate costs one call)
+    latest = None
+    if os.path.isdir(BACKUP_DIR):
+        with os.scandir(BACKUP_DIR) as entries:
+            latest = max(
+                (e for e in entries
+                 if e.is_file() and e.name.startswith('presets_backup_') and e.name.endswith('.json')),
+                key=lambda e: e.stat().st_ctime,
+                default=None,
+            )
+    if latest is None:
         print("✗ No backups found!")
         return False
 
-    latest_backup = max(backups, key=os.path.getctime)
-    print(f"   Found backup: {os.path.basename(latest_backup)}")
+    print(f"   Found backup: {latest.name}")
 
     # Restore backup
     dest = os.path.join(BASE_DIR, 'presets.json')
-    shutil.copy2(latest_backup, dest)
+    copy_file(latest.path, dest)
     print(f"   ✓ Restored to: {dest}")
 
     # Update .env
     env_file = os.path.join(BASE_DIR, '.env')
     if os.path.exists(env_file):
-        with open(env_file, 'r') as f:
-            content = f.read()
-
-        content = content.replace('ENABLE_HIERARCHICAL_PRESETS=true',
-                                'ENABLE_HIERARCHICAL_PRESETS=false')
-
-        with open(env_file, 'w') as f:
-            f.write(content)
+        # Write the edited copy next to .env and swap it in, so a crash
+        # mid-write never leaves a truncated .env behind
+        with open(env_file, 'r') as src, \
+                tempfile.NamedTemporaryFile('w', dir=BASE_DIR, delete=False) as dst:
+            for line in src:
+                dst.write(line.replace('ENABLE_HIERARCHICAL_PRESETS=true',
+                                       'ENABLE_HIERARCHICAL_PRESETS=false'))
+        shutil.copymode(env_file, dst.name)
+        os.replace(dst.name, env_file)
 
         print(f"   ✓ Disabled hierarchical presets in .env")
 
@@ -10,10 +10,13 @@ Usage:
     2. In another terminal: python test_api_routes.py
 """
 
+import io
 import requests
+import requests.adapters
 import json
 import sys
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 
 
 pytestmark = pytest.mark.skip(reason="Integration helper that requires a running server")
@@ -29,73 +32,99 @@ if 'pytest' in sys.modules:
 # Base URL for the Flask app
 BASE_URL = "http://localhost:5000"
 
-def test_route(method, endpoint, expected_status=200, description=""):
-    """Test a single API route"""
+# Probes sent to the server at once
+MAX_WORKERS = 8
+
+def prepare_probe(session, method, endpoint):
+    """Build the request for one probe up front (URL, headers and body)."""
+    return session.prepare_request(
+        requests.Request(method, f"{BASE_URL}{endpoint}", json={} if method == "POST" else None)
+    )
+
+
+def test_route(method, endpoint, expected_status=200, description="", session=None, prepared=None):
+    """
+    Test a single API route.
+
+    Output is collected rather than printed so probes can run concurrently
+    and still be reported in order. When a prepared request is given it is
+    sent as-is through the session.
+
+    Returns:
+        tuple: (passed, report text)
+    """
+    http = session or requests
     url = f"{BASE_URL}{endpoint}"
+    out = io.StringIO()
 
-    print(f"\n{'='*70}")
-    print(f"Testing: {method} {endpoint}")
+    def say(*args):
+        print(*args, file=out)
+
+    say(f"\n{'='*70}")
+    say(f"Testing: {method} {endpoint}")
     if description:
-        print(f"Description: {description}")
-    print(f"{'='*70}")
+        say(f"Description: {description}")
+    say(f"{'='*70}")
 
     try:
-        if method == "GET":
-            response = requests.get(url, timeout=5)
+        if prepared is not None and session is not None:
+            response = session.send(prepared, timeout=5)
+        elif method == "GET":
+            response = http.get(url, timeout=5)
         elif method == "POST":
-            response = requests.post(url, json={}, timeout=5)
+            response = http.post(url, json={}, timeout=5)
         else:
-            print(f"❌ Unsupported method: {method}")
-            return False
+            say(f"❌ Unsupported method: {method}")
+            return False, out.getvalue()
 
-        print(f"Status Code: {response.status_code}")
+        say(f"Status Code: {response.status_code}")
 
         if response.status_code != expected_status:
-            print(f"❌ FAIL: Expected {expected_status}, got {response.status_code}")
-            print(f"Response: {response.text[:200]}")
-            return False
+            say(f"❌ FAIL: Expected {expected_status}, got {response.status_code}")
+            say(f"Response: {response.text[:200]}")
+            return False, out.getvalue()
 
         # Try to parse JSON
         try:
             data = response.json()
-            print(f"✅ PASS: Valid JSON response")
+            say(f"✅ PASS: Valid JSON response")
 
             # Show sample of response
             if isinstance(data, dict):
                 if 'error' in data:
-                    print(f"⚠️  Error response: {data.get('error')}")
-                    print(f"   Message: {data.get('message')}")
+                    say(f"⚠️  Error response: {data.get('error')}")
+                    say(f"   Message: {data.get('message')}")
                 else:
                     # Show some keys
                     keys = list(data.keys())[:5]
-                    print(f"Response keys: {keys}")
+                    say(f"Response keys: {keys}")
 
                     # Show counts for list responses
                     for key, value in data.items():
                         if isinstance(value, list):
-                            print(f"  - {key}: {len(value)} items")
+                            say(f"  - {key}: {len(value)} items")
                         elif isinstance(value, dict):
-                            print(f"  - {key}: {len(value)} keys")
+                            say(f"  - {key}: {len(value)} keys")
 
-            return True
+            return True, out.getvalue()
 
         except json.JSONDecodeError:
-            print(f"❌ FAIL: Invalid JSON response")
-            print(f"Response: {response.text[:200]}")
-            return False
+            say(f"❌ FAIL: Invalid JSON response")
+            say(f"Response: {response.text[:200]}")
+            return False, out.getvalue()
 
     except requests.exceptions.ConnectionError:
-        print(f"❌ FAIL: Could not connect to {BASE_URL}")
-        print(f"   Make sure the Flask app is running!")
-        return False
+        say(f"❌ FAIL: Could not connect to {BASE_URL}")
+        say(f"   Make sure the Flask app is running!")
+        return False, out.getvalue()
 
     except requests.exceptions.Timeout:
-        print(f"❌ FAIL: Request timed out")
-        return False
+        say(f"❌ FAIL: Request timed out")
+        return False, out.getvalue()
 
     except Exception as e:
-        print(f"❌ FAIL: Unexpected error: {e}")
-        return False
+        say(f"❌ FAIL: Unexpected error: {e}")
+        return False, out.getvalue()
 
 
 def main():
@@ -116,92 +145,58 @@ def main():
         print(f"   3. Then run this test script again")
         sys.exit(1)
 
-    # Track results
+    # (method, endpoint, expected status, description); the probes are
+    # independent read-only requests, so they run concurrently
+    probes = [
+        # Test 1: Get all categories (Level 1)
+        ("GET", "/api/categories", 200, "Get all main categories"),
+        # Test 2: Get types for photography (Level 2)
+        ("GET", "/api/categories/photography/types", 200, "Get photography types"),
+        # Test 3: Get artists for portrait photography (Level 3)
+        ("GET", "/api/categories/photography/types/portrait/artists", 200, "Get portrait photographers"),
+        # Test 4: Get technical options for Annie Leibovitz (Level 4)
+        ("GET", "/api/artists/photography/portrait/annie_leibovitz/technical", 200,
+         "Get Annie Leibovitz technical options"),
+        # Test 5: Get scene specifics for Annie Leibovitz (Level 5)
+        ("GET", "/api/artists/photography/portrait/annie_leibovitz/specifics", 200,
+         "Get Annie Leibovitz scene specifics"),
+        # Test 6: Get preset packs
+        ("GET", "/api/preset-packs", 200, "Get all preset packs"),
+        # Test 7: Get universal options
+        ("GET", "/api/universal-options", 200, "Get universal options"),
+        # Test 8: Test with Fantasy category
+        ("GET", "/api/categories/fantasy/types", 200, "Get fantasy types"),
+        # Test 9: Test with Fantasy > High Fantasy > Greg Rutkowski
+        ("GET", "/api/categories/fantasy/types/high_fantasy/artists", 200, "Get high fantasy artists"),
+        ("GET", "/api/artists/fantasy/high_fantasy/greg_rutkowski/technical", 200,
+         "Get Greg Rutkowski technical options"),
+        # Test 10: Test error handling (non-existent category)
+        ("GET", "/api/categories/nonexistent/types", 404, "Test error handling for non-existent category"),
+        # Test 11: Test legacy /presets endpoint still works
+        ("GET", "/presets", 200, "Verify legacy /presets endpoint still works"),
+    ]
+
+    # One keep-alive session shared by all probes; the pool holds a
+    # connection per worker thread
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS)
+    session.mount("http://", adapter)
+
+    # Prepare every request once, before the probes start
+    prepared = [prepare_probe(session, method, endpoint) for method, endpoint, _, _ in probes]
+
+    with session, ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        outcomes = list(executor.map(
+            lambda probe, request: test_route(*probe, session=session, prepared=request),
+            probes,
+            prepared
+        ))
+
+    # Print reports in probe order, whatever order they finished in
     results = []
-
-    # Test 1: Get all categories (Level 1)
-    results.append(test_route(
-        "GET",
-        "/api/categories",
-        description="Get all main categories"
-    ))
-
-    # Test 2: Get types for photography (Level 2)
-    results.append(test_route(
-        "GET",
-        "/api/categories/photography/types",
-        description="Get photography types"
-    ))
-
-    # Test 3: Get artists for portrait photography (Level 3)
-    results.append(test_route(
-        "GET",
-        "/api/categories/photography/types/portrait/artists",
-        description="Get portrait photographers"
-    ))
-
-    # Test 4: Get technical options for Annie Leibovitz (Level 4)
-    results.append(test_route(
-        "GET",
-        "/api/artists/photography/portrait/annie_leibovitz/technical",
-        description="Get Annie Leibovitz technical options"
-    ))
-
-    # Test 5: Get scene specifics for Annie Leibovitz (Level 5)
-    results.append(test_route(
-        "GET",
-        "/api/artists/photography/portrait/annie_leibovitz/specifics",
-        description="Get Annie Leibovitz scene specifics"
-    ))
-
-    # Test 6: Get preset packs
-    results.append(test_route(
-        "GET",
-        "/api/preset-packs",
-        description="Get all preset packs"
-    ))
-
-    # Test 7: Get universal options
-    results.append(test_route(
-        "GET",
-        "/api/universal-options",
-        description="Get universal options"
-    ))
-
-    # Test 8: Test with Fantasy category
-    results.append(test_route(
-        "GET",
-        "/api/categories/fantasy/types",
-        description="Get fantasy types"
-    ))
-
-    # Test 9: Test with Fantasy > High Fantasy > Greg Rutkowski
-    results.append(test_route(
-        "GET",
-        "/api/categories/fantasy/types/high_fantasy/artists",
-        description="Get high fantasy artists"
-    ))
-
-    results.append(test_route(
-        "GET",
-        "/api/artists/fantasy/high_fantasy/greg_rutkowski/technical",
-        description="Get Greg Rutkowski technical options"
-    ))
-
-    # Test 10: Test error handling (non-existent category)
-    results.append(test_route(
-        "GET",
-        "/api/categories/nonexistent/types",
-        expected_status=404,
-        description="Test error handling for non-existent category"
-    ))
-
-    # Test 11: Test legacy /presets endpoint still works
-    results.append(test_route(
-        "GET",
-        "/presets",
-        description="Verify legacy /presets endpoint still works"
-    ))
+    for passed, report in outcomes:
+        print(report, end="")
+        results.append(passed)
 
     # Summary
     print("\n" + "="*70)
@@ -11,11 +11,24 @@ NOTE: Testing /persona-chat and /persona-chat-stream requires Ollama to be runni
 This script only demonstrates the API structure without actual Ollama calls.
 """
 
+import sys
+
+if 'pytest' in sys.modules:
+    import pytest
+
+    pytest.skip(
+        "test_persona_api.py is an integration script and should be run manually",
+        allow_module_level=True,
+    )
+
 import requests
 import json
 
 BASE_URL = "http://localhost:5000"  # Change if using different port
 
+# Shared keep-alive session so the probes below reuse one connection
+SESSION = requests.Session()
+
 def print_section(title):
     """Print a formatted section header"""
     print(f"\n{'='*70}")
@@ -27,7 +40,7 @@ def test_get_personas():
     """Test GET /api/personas - List all personas"""
     print_section("TEST 1: GET /api/personas (List All Personas)")
 
-    response = requests.get(f"{BASE_URL}/api/personas")
+    response = SESSION.get(f"{BASE_URL}/api/personas")
 
     print(f"Status Code: {response.status_code}")
     print(f"\nAvailable Personas:")
@@ -49,7 +62,7 @@ def test_get_specific_persona(persona_id="creative_vision_guide"):
     """Test GET /api/personas/<id> - Get specific persona with system prompt"""
     print_section(f"TEST 2: GET /api/personas/{persona_id} (Get Specific Persona)")
 
-    response = requests.get(f"{BASE_URL}/api/personas/{persona_id}")
+    response = SESSION.get(f"{BASE_URL}/api/personas/{persona_id}")
 
     print(f"Status Code: {response.status_code}")
 
@@ -72,7 +85,7 @@ def test_invalid_persona():
     """Test GET /api/personas/<id> with invalid persona_id"""
     print_section("TEST 3: GET /api/personas/invalid_id (Error Handling)")
 
-    response = requests.get(f"{BASE_URL}/api/personas/invalid_id")
+    response = SESSION.get(f"{BASE_URL}/api/personas/invalid_id")
 
     print(f"Status Code: {response.status_code}")
 
@@ -89,7 +102,7 @@ def test_persona_reset():
     """Test POST /persona-reset"""
     print_section("TEST 4: POST /persona-reset (Reset Conversation)")
 
-    response = requests.post(f"{BASE_URL}/persona-reset")
+    response = SESSION.post(f"{BASE_URL}/persona-reset")
 
     print(f"Status Code: {response.status_code}")
 
@@ -106,7 +119,7 @@ def test_persona_chat_validation():
 
     # Test 1: Missing persona_id
     print("Test 5a: Missing persona_id")
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/persona-chat",
         json={"message": "Hello"}
     )
@@ -117,7 +130,7 @@ def test_persona_chat_validation():
 
     # Test 2: Invalid persona_id
     print("\nTest 5b: Invalid persona_id")
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/persona-chat",
         json={"message": "Hello", "persona_id": "invalid_persona"}
     )
@@ -128,7 +141,7 @@ def test_persona_chat_validation():
 
     # Test 3: Valid request (will fail at Ollama call if Ollama not running)
     print("\nTest 5c: Valid request structure")
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/persona-chat",
         json={
             "message": "I want to create an image of a dragon",
@@ -176,7 +189,7 @@ def run_all_tests():
         status = "✓ PASS" if passed else "✗ FAIL"
         print(f"  {status}: {test_name}")
 
-    passed_count = sum(results)
+    passed_count = sum(passed for _, passed in results)
     total_count = len(results)
 
     print(f"\n  Results: {passed_count}/{total_count} tests passed")
@@ -11,31 +11,40 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 
 @pytest.fixture(scope='session', autouse=True)
-def setup_test_database(tmp_path_factory):
+def setup_test_database():
     """
-    Configure a test-specific database path for all tests.
+    Configure a test-specific database for all tests.
     This prevents tests from modifying the production database.
+
+    The database is a shared-cache in-memory SQLite URI, so the schema and
+    rows never touch disk. It lives as long as the session's connections,
+    and each pytest-xdist worker process gets its own copy.
     """
-    test_db_dir = tmp_path_factory.mktemp("test_db")
-    test_db_path = str(test_db_dir / "test_prompt_history.db")
-    os.environ['DB_PATH'] = test_db_path
+    from app.config import config
+
+    test_db_path = 'file:comfyui_test?mode=memory&cache=shared'
+    config.DATABASE_PATH = test_db_path
     yield test_db_path
-    # Cleanup happens automatically with tmp_path_factory
 
 
-# Import after setting DB_PATH to ensure test database is used
+# Importing the app does no database work; setup_test_database points it
+# at the test database before flask_app calls create_app()
 from app import create_app
 from app.presets import PRESETS
 
 
-@pytest.fixture
-def flask_app():
+@pytest.fixture(scope='session')
+def flask_app(setup_test_database):
     """
     Create and configure a Flask app instance for testing
+
+    Built once per session; per-test state (database rows, conversations)
+    is reset by cleanup_conversation_store instead.
     """
     test_app = create_app()
     test_app.config['TESTING'] = True
     test_app.config['SECRET_KEY'] = 'test-secret-key'
+    test_app.conversation_store.clear_all()
     return test_app
 
 
@@ -48,19 +57,76 @@ def client(flask_app):
 
 
 @pytest.fixture
+def hierarchical_presets(monkeypatch):
+    """
+    Enable hierarchical presets for one test by flipping the shared config
+    flag in place; the app and its modules are never re-imported.
+    """
+    from app.config import config
+
+    monkeypatch.setattr(config, 'ENABLE_HIERARCHICAL_PRESETS', True)
+    return config
+
+
+@pytest.fixture(autouse=True)
+def mocked_ollama(monkeypatch):
+    """
+    Replace call_ollama with a stub for every test
+
+    Autouse so no test can reach a real Ollama server by accident. Tests
+    that inspect the call request the fixture by name: it returns the dict
+    the stub records into ('messages' and 'model' from the last call). Set
+    'reply' (non-streaming) or 'tokens' (streaming) on it before the
+    request to control what the stub returns.
+    """
+    import app.ollama_client
+
+    captured = {'reply': 'Mocked response', 'tokens': ['Mocked ', 'response']}
+
+    def fake_call_ollama(messages, model=None, stream=False):
+        captured['messages'] = messages
+        captured['model'] = model
+        return iter(captured['tokens']) if stream else captured['reply']
+
+    monkeypatch.setattr(app.ollama_client, 'call_ollama', fake_call_ollama)
+    return captured
+
+
+@pytest.fixture(scope='session')
 def presets():
     """
     Provide access to PRESETS for testing
+
+    PRESETS is parsed once when app.presets is imported; tests only read it.
     """
     return PRESETS
 
 
-@pytest.fixture(autouse=True)
-def cleanup_conversation_store(flask_app):
-    """Ensure conversation store is cleared between tests."""
+@pytest.fixture(scope='session')
+def flat_presets(presets):
+    """
+    Flatten PRESETS into (category, preset name, preset value) tuples once
+    for the tests that check every entry
+    """
+    return [
+        (category, name, value)
+        for category, items in presets.items()
+        for name, value in items.items()
+    ]
+
+
+@pytest.fixture(scope='session', autouse=True)
+def init_db_once(setup_test_database):
+    """Create the database schema once for the whole session."""
     from app.database import init_db
 
     init_db()
-    flask_app.conversation_store.clear_all()
+
+
+@pytest.fixture(autouse=True)
+def cleanup_conversation_store(flask_app):
+    """Ensure conversation store is cleared between tests."""
+    # The store starts empty (see flask_app) and each test clears up after
+    # itself, so one clear per test is enough
     yield
     flask_app.conversation_store.clear_all()
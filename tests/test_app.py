@@ -2,8 +2,40 @@
 Tests for Flask application routes and functionality
 """
 
+import gzip
+import re
+import time
+
 import pytest
-import json
+import requests
+import urllib3
+
+import app.presets
+import app.ollama_client as ollama_client
+import app.routes.models as models_routes
+from app import jsonutil
+from app.config import config
+from app.database import (
+    HISTORY_PREVIEW_CHARS,
+    delete_history_item,
+    get_history,
+    save_to_history,
+    save_to_history_bulk,
+)
+from app.ollama_client import _output_token_cap, _post_to_ollama, check_ollama_connection
+from app.utils import build_hierarchical_prompt
+
+# Request bodies for the validation (400) tests never vary, so encode them once
+_NO_INPUT_BODY = jsonutil.dumps_bytes({
+    'model': 'flux',
+    'style': 'None',
+    'artist': 'None',
+    'composition': 'None',
+    'lighting': 'None'
+})
+_EMPTY_INPUT_BODY = jsonutil.dumps_bytes({'input': '', 'model': 'flux'})
+_NO_MESSAGE_BODY = jsonutil.dumps_bytes({'model': 'flux'})
+_EMPTY_MESSAGE_BODY = jsonutil.dumps_bytes({'message': '', 'model': 'flux'})
 
 
 class TestAppInitialization:
@@ -22,59 +54,111 @@ class TestAppInitialization:
         assert flask_app.secret_key is not None
 
 
+@pytest.fixture(scope='class')
+def index_response(flask_app):
+    """GET / once and share the (status, body) pair across the class"""
+    response = flask_app.test_client().get('/')
+    return response.status_code, response.data
+
+
 class TestIndexRoute:
     """Test the main index route"""
 
-    def test_index_returns_200(self, client):
+    def test_index_returns_200(self, index_response):
         """Verify GET / returns 200 status code"""
-        response = client.get('/')
-        assert response.status_code == 200
+        status, _ = index_response
+        assert status == 200
 
-    def test_index_returns_html(self, client):
+    def test_index_returns_html(self, index_response):
         """Verify GET / returns HTML content"""
+        _, body = index_response
+        # The doctype/root tag open the document; no need to scan the whole page
+        head = body[:200].lower()
+        assert b'<!doctype html>' in head or b'<html' in head
+
+    def test_static_urls_are_fingerprinted(self, client):
+        """Verify static asset URLs carry a content hash and are cached long-term"""
         response = client.get('/')
-        assert b'<!DOCTYPE html>' in response.data or b'<html' in response.data
+        match = re.search(rb'/static/js/main\.js\?v=([0-9a-f]{8})', response.data)
+        assert match
+
+        asset = client.get(f'/static/js/main.js?v={match.group(1).decode()}')
+        assert asset.status_code == 200
+        assert asset.cache_control.max_age == 31536000
+        asset.close()
+
+    def test_index_is_gzipped_when_accepted(self, client):
+        """Verify HTML responses are gzip-compressed for clients that accept it"""
+        plain = client.get('/')
+        compressed = client.get('/', headers={'Accept-Encoding': 'gzip'})
+
+        assert 'Content-Encoding' not in plain.headers
+        assert compressed.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in compressed.headers['Vary']
+        assert gzip.decompress(compressed.data) == plain.data
+
+
+@pytest.fixture(scope='class')
+def presets_response(flask_app):
+    """GET /presets once and share (status, content type, JSON) across the class"""
+    response = flask_app.test_client().get('/presets')
+    return response.status_code, response.content_type, response.get_json()
 
 
 class TestPresetsRoute:
     """Test the /presets route"""
 
-    def test_presets_returns_200(self, client):
+    def test_presets_returns_200(self, presets_response):
         """Verify GET /presets returns 200 status code"""
-        response = client.get('/presets')
-        assert response.status_code == 200
+        status, _, _ = presets_response
+        assert status == 200
 
-    def test_presets_returns_json(self, client):
+    def test_presets_returns_json(self, presets_response):
         """Verify GET /presets returns valid JSON"""
-        response = client.get('/presets')
-        assert response.content_type == 'application/json'
+        _, content_type, data = presets_response
+        assert content_type == 'application/json'
 
         # Verify it can be parsed as JSON
-        data = json.loads(response.data)
         assert isinstance(data, dict)
 
-    def test_presets_has_required_categories(self, client):
+    def test_presets_has_required_categories(self, presets_response):
         """Verify /presets response has all required categories"""
-        response = client.get('/presets')
-        data = json.loads(response.data)
+        _, _, data = presets_response
 
         required_categories = ['styles', 'artists', 'composition', 'lighting']
         for category in required_categories:
             assert category in data, f"Missing category: {category}"
 
+    def test_presets_honours_if_none_match(self, client):
+        """Verify /presets returns 304 when the client already has the current body"""
+        response = client.get('/presets')
+        etag = response.headers['ETag']
+        assert 'no-cache' in response.headers['Cache-Control']
+
+        cached = client.get('/presets', headers={'If-None-Match': etag})
+        assert cached.status_code == 304
+        assert cached.data == b''
+
+        stale = client.get('/presets', headers={'If-None-Match': '"stale"'})
+        assert stale.status_code == 200
+        assert stale.data == response.data
+
+    def test_presets_sends_gzip_when_accepted(self, client):
+        """Verify /presets serves the precompressed body to gzip-capable clients"""
+        plain = client.get('/presets')
+        compressed = client.get('/presets', headers={'Accept-Encoding': 'gzip, deflate'})
+
+        assert compressed.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in compressed.headers['Vary']
+        assert compressed.headers['ETag'] != plain.headers['ETag']
+        assert gzip.decompress(compressed.data) == plain.data
+
 
 class TestGenerateRoute:
     """Test the /generate route"""
 
-    def test_generate_with_valid_input(self, client, monkeypatch):
+    def test_generate_with_valid_input(self, client):
         """Verify POST /generate with valid input"""
-        # Mock the call_ollama function to avoid actual Ollama calls
-        def mock_call_ollama(messages, model=None):
-            return "Mocked prompt response"
-
-        import app.ollama_client
-        monkeypatch.setattr(app.ollama_client, 'call_ollama', mock_call_ollama)
-
         payload = {
             'input': 'a warrior in a forest',
             'model': 'flux',
@@ -85,41 +169,27 @@ class TestGenerateRoute:
         }
 
         response = client.post('/generate',
-                                data=json.dumps(payload),
-                                content_type='application/json')
+                                json=payload)
 
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'result' in data
         assert 'model' in data
 
     def test_generate_without_input_returns_400(self, client):
         """Verify POST /generate without input returns 400"""
-        payload = {
-            'model': 'flux',
-            'style': 'None',
-            'artist': 'None',
-            'composition': 'None',
-            'lighting': 'None'
-        }
-
         response = client.post('/generate',
-                                data=json.dumps(payload),
+                                data=_NO_INPUT_BODY,
                                 content_type='application/json')
 
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'error' in data or 'message' in data
 
     def test_generate_with_empty_input_returns_400(self, client):
         """Verify POST /generate with empty input returns 400"""
-        payload = {
-            'input': '',
-            'model': 'flux'
-        }
-
         response = client.post('/generate',
-                                data=json.dumps(payload),
+                                data=_EMPTY_INPUT_BODY,
                                 content_type='application/json')
 
         assert response.status_code == 400
@@ -132,22 +202,27 @@ class TestGenerateRoute:
 
         assert response.status_code == 400
 
+    def test_generate_stream_batches_tokens(self, client, mocked_ollama):
+        """Verify /generate-stream sends fast tokens a few per SSE event, in order"""
+        tokens = [f'word{i} ' for i in range(20)]
+        mocked_ollama['tokens'] = tokens
 
-class TestChatRoute:
-    """Test the /chat route"""
+        response = client.post('/generate-stream',
+                                json={'input': 'a warrior', 'model': 'flux'})
 
-    def test_chat_with_valid_message(self, client, monkeypatch, flask_app):
-        """Verify POST /chat with valid message"""
-        # Mock the call_ollama function
-        captured = {}
+        events = [jsonutil.loads(line[len(b'data: '):])
+                  for line in response.data.splitlines() if line.startswith(b'data: ')]
+        chunks = [event['token'] for event in events if 'token' in event]
+        assert ''.join(chunks) == ''.join(tokens)
+        assert len(chunks) < len(tokens)
+        assert events[-1] == {'done': True}
 
-        def mock_call_ollama(messages, model=None):
-            captured['messages'] = messages
-            return "Mocked chat response"
 
-        import app.ollama_client
-        monkeypatch.setattr(app.ollama_client, 'call_ollama', mock_call_ollama)
+class TestChatRoute:
+    """Test the /chat route"""
 
+    def test_chat_with_valid_message(self, client, mocked_ollama, flask_app):
+        """Verify POST /chat with valid message"""
         payload = {
             'message': 'make it more dramatic',
             'model': 'flux',
@@ -158,16 +233,15 @@ class TestChatRoute:
         }
 
         response = client.post('/chat',
-                                data=json.dumps(payload),
-                                content_type='application/json')
+                                json=payload)
 
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'result' in data
         assert 'model' in data
-        assert captured['messages'][0]['role'] == 'system'
+        assert mocked_ollama['messages'][0]['role'] == 'system'
         # Check for system message flexibility (different prompt variants)
-        system_message = captured['messages'][0]['content']
+        system_message = mocked_ollama['messages'][0]['content']
         assert (
             'Flux' in system_message or
             'Avoid emitting a single "PROMPT:" response' in system_message or
@@ -188,29 +262,34 @@ class TestChatRoute:
 
     def test_chat_without_message_returns_400(self, client):
         """Verify POST /chat without message returns 400"""
-        payload = {
-            'model': 'flux'
-        }
-
         response = client.post('/chat',
-                                data=json.dumps(payload),
+                                data=_NO_MESSAGE_BODY,
                                 content_type='application/json')
 
         assert response.status_code == 400
 
     def test_chat_with_empty_message_returns_400(self, client):
         """Verify POST /chat with empty message returns 400"""
-        payload = {
-            'message': '',
-            'model': 'flux'
-        }
-
         response = client.post('/chat',
-                                data=json.dumps(payload),
+                                data=_EMPTY_MESSAGE_BODY,
                                 content_type='application/json')
 
         assert response.status_code == 400
 
+    def test_chat_stream_saves_reply_to_conversation(self, client, mocked_ollama, flask_app):
+        """Verify the streamed reply is stored once the stream has been sent"""
+        mocked_ollama['tokens'] = ['Streamed ', 'reply']
+
+        response = client.post('/chat-stream',
+                                json={'message': 'add fog', 'model': 'flux'})
+        response.get_data()
+
+        with client.session_transaction() as flask_session:
+            conversation_id = flask_session['conversation_id']
+
+        stored_conversation, _ = flask_app.conversation_store.get_conversation(conversation_id)
+        assert stored_conversation[-1] == {'role': 'assistant', 'content': 'Streamed reply'}
+
 
 class TestResetRoute:
     """Test the /reset route"""
@@ -225,10 +304,54 @@ class TestResetRoute:
         response = client.post('/reset')
         assert response.content_type == 'application/json'
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'status' in data
 
 
+class TestModelsRoute:
+    """Test the /models route"""
+
+    def test_models_list_is_cached(self, client, monkeypatch):
+        """Verify repeated /models requests reuse Ollama's answer until cleared"""
+        calls = []
+
+        class FakeResponse:
+            def raise_for_status(self):
+                pass
+
+            def json(self):
+                return {'models': [{'name': 'qwen3:latest'}]}
+
+        def fake_get(url, timeout):
+            calls.append(url)
+            return FakeResponse()
+
+        models_routes.clear_models_cache()
+        monkeypatch.setattr('app.ollama_client.ollama_get', fake_get)
+
+        assert client.get('/models').get_json()['models'] == ['qwen3:latest']
+        assert client.get('/models').get_json()['models'] == ['qwen3:latest']
+        assert len(calls) == 1
+
+        models_routes.clear_models_cache()
+        client.get('/models')
+        assert len(calls) == 2
+        models_routes.clear_models_cache()
+
+    def test_models_honours_if_none_match(self, client, monkeypatch):
+        """Verify /models sends an ETag and answers a matching If-None-Match with 304"""
+        models_routes.clear_models_cache()
+        monkeypatch.setattr(models_routes, '_fetch_models', lambda tags_url: ['qwen3:latest'])
+
+        first = client.get('/models')
+        etag = first.headers['ETag']
+        assert first.status_code == 200
+
+        repeat = client.get('/models', headers={'If-None-Match': etag})
+        assert repeat.status_code == 304
+        assert repeat.data == b''
+
+
 class TestHierarchicalSelections:
     """Tests that hierarchical selections reach the backend helpers."""
 
@@ -280,26 +403,15 @@ class TestHierarchicalSelections:
             'universal': {'mood': ['dramatic', 'elegant']}
         }
 
-    def test_generate_uses_hierarchical_prompt(self, client, monkeypatch):
-        import app.config
-        import app.presets
-        import app.ollama_client
-        from app.database import get_history
-
+    def test_generate_uses_hierarchical_prompt(self, client, monkeypatch, hierarchical_presets, mocked_ollama):
         selections = self._sample_selections()
-        captured = {}
+        loaded = []
 
         def fake_load_presets():
-            captured['load_called'] = True
+            loaded.append(True)
             return self._sample_presets()
 
-        def fake_call_ollama(messages, model=None, stream=False):
-            captured['messages'] = messages
-            return 'Mocked hierarchical response'
-
-        monkeypatch.setattr(app.config.config, 'ENABLE_HIERARCHICAL_PRESETS', True)
         monkeypatch.setattr(app.presets, 'load_presets', fake_load_presets)
-        monkeypatch.setattr(app.ollama_client, 'call_ollama', fake_call_ollama)
 
         payload = {
             'input': 'A heroic figure in the forest',
@@ -309,14 +421,13 @@ class TestHierarchicalSelections:
 
         response = client.post(
             '/generate',
-            data=json.dumps(payload),
-            content_type='application/json'
+            json=payload
         )
 
         assert response.status_code == 200
-        assert captured.get('load_called') is True
-        assert 'messages' in captured
-        enhanced = captured['messages'][1]['content']
+        assert loaded
+        assert 'messages' in mocked_ollama
+        enhanced = mocked_ollama['messages'][1]['content']
         assert 'Style: Photography > Portrait' in enhanced
         assert 'Mood: dramatic, elegant' in enhanced
 
@@ -325,26 +436,15 @@ class TestHierarchicalSelections:
         assert matching is not None
         assert matching['presets'].get('hierarchical') == selections
 
-    def test_chat_uses_hierarchical_prompt(self, client, monkeypatch, flask_app):
-        import app.config
-        import app.presets
-        import app.ollama_client
-        from app.database import get_history
-
+    def test_chat_uses_hierarchical_prompt(self, client, monkeypatch, flask_app, hierarchical_presets, mocked_ollama):
         selections = self._sample_selections()
-        captured = {}
+        loaded = []
 
         def fake_load_presets():
-            captured['load_called'] = True
+            loaded.append(True)
             return self._sample_presets()
 
-        def fake_call_ollama(messages, model=None, stream=False):
-            captured['messages'] = messages
-            return 'Mocked chat response'
-
-        monkeypatch.setattr(app.config.config, 'ENABLE_HIERARCHICAL_PRESETS', True)
         monkeypatch.setattr(app.presets, 'load_presets', fake_load_presets)
-        monkeypatch.setattr(app.ollama_client, 'call_ollama', fake_call_ollama)
 
         payload = {
             'message': 'Can you make it moodier?',
@@ -354,14 +454,13 @@ class TestHierarchicalSelections:
 
         response = client.post(
             '/chat',
-            data=json.dumps(payload),
-            content_type='application/json'
+            json=payload
         )
 
         assert response.status_code == 200
-        assert captured.get('load_called') is True
-        assert 'messages' in captured
-        chat_request = captured['messages'][1]['content']
+        assert loaded
+        assert 'messages' in mocked_ollama
+        chat_request = mocked_ollama['messages'][1]['content']
         assert 'Style: Photography > Portrait' in chat_request
 
         with client.session_transaction() as flask_session:
@@ -377,6 +476,77 @@ class TestHierarchicalSelections:
         assert matching is not None
         assert matching['presets'].get('hierarchical') == selections
 
+    def test_build_hierarchical_prompt_formats_sections(self):
+        enhanced = build_hierarchical_prompt(
+            'A woman posing', self._sample_selections(), self._sample_presets()
+        )
+
+        assert enhanced == (
+            "A woman posing\n"
+            "\n"
+            "Style: Photography > Portrait\n"
+            "Artist Style: Annie Leibovitz\n"
+            "Description: Iconic portrait photographer.\n"
+            "Signature: Bold lighting and dramatic poses.\n"
+            "\n"
+            "Technical Details:\n"
+            "- Lighting: Rembrandt lighting (Classic triangle lighting setup.)\n"
+            "\n"
+            "Scene Details:\n"
+            "- Subject: warrior princess\n"
+            "\n"
+            "Mood: dramatic, elegant"
+        )
+
+    def test_build_hierarchical_prompt_cache_tracks_presets_object(self):
+        presets = self._sample_presets()
+        first = build_hierarchical_prompt('A woman posing', self._sample_selections(), presets)
+        assert build_hierarchical_prompt('A woman posing', self._sample_selections(), presets) is first
+
+        reloaded = self._sample_presets()
+        reloaded['categories']['photography']['name'] = 'Photo'
+        rebuilt = build_hierarchical_prompt('A woman posing', self._sample_selections(), reloaded)
+        assert 'Style: Photo > Portrait' in rebuilt
+
+    def test_types_route_caches_body_until_presets_change(self, client, monkeypatch, hierarchical_presets):
+        current = {'presets': self._sample_presets()}
+        monkeypatch.setattr('app.presets.load_presets', lambda: current['presets'])
+
+        first = client.get('/api/categories/photography/types')
+        assert first.status_code == 200
+        assert first.get_json()['types'][0]['name'] == 'Portrait'
+
+        # Same presets object: served from the cached body
+        current['presets']['categories']['photography']['level2_types']['portrait']['name'] = 'Changed'
+        assert client.get('/api/categories/photography/types').data == first.data
+
+        # A reload returns a new dictionary, which invalidates the cache
+        reloaded = self._sample_presets()
+        reloaded['categories']['photography']['level2_types']['portrait']['name'] = 'Portraiture'
+        current['presets'] = reloaded
+        assert client.get('/api/categories/photography/types').get_json()['types'][0]['name'] == 'Portraiture'
+
+        assert client.get('/api/categories/missing/types').status_code == 404
+
+    def test_artist_bundle_combines_all_levels(self, client, monkeypatch, hierarchical_presets):
+        presets = self._sample_presets()
+        monkeypatch.setattr('app.presets.load_presets', lambda: presets)
+
+        response = client.get('/api/artists/photography/portrait/annie_leibovitz/bundle')
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['category']['name'] == 'Photography'
+        assert data['type']['name'] == 'Portrait'
+        assert data['artist']['signature'] == 'Bold lighting and dramatic poses.'
+        assert data['technical_options'] == client.get(
+            '/api/artists/photography/portrait/annie_leibovitz/technical'
+        ).get_json()['technical_options']
+        assert data['scene_specifics'] == {}
+
+        missing = client.get('/api/artists/photography/portrait/nobody/bundle')
+        assert missing.status_code == 404
+        assert missing.get_json()['error'] == 'Artist not found'
+
 
 class TestConversationStore:
     """Direct tests for the server-side conversation storage."""
@@ -398,6 +568,107 @@ class TestConversationStore:
         assert stored_messages[0]['role'] == 'system'
         assert stored_messages[0]['content'] == system_message['content']
 
+    def test_evicted_sessions_reload_from_disk(self, flask_app, monkeypatch):
+        store = flask_app.conversation_store
+        monkeypatch.setattr(store, 'max_cached_sessions', 1)
+        messages = [{"role": "user", "content": "remember me"}]
+
+        first = store.create_session('flux', messages)
+        store.flush()
+        second = store.create_session('sdxl', [])
+
+        try:
+            assert first not in store._sessions
+            assert store.get_conversation(first) == (messages, 'flux')
+        finally:
+            store.delete_session(first)
+            store.delete_session(second)
+
+
+class TestHistorySearch:
+    """Tests for prompt history storage and search."""
+
+    def test_search_matches_words_and_prefixes(self, flask_app):
+        """Verify search finds rows by whole words and partially typed words"""
+        record_ids = [
+            save_to_history('neon cyberpunk alley', 'rain-soaked street', 'flux', {}, 'oneshot'),
+            save_to_history('quiet meadow', 'soft morning light', 'sdxl', {}, 'oneshot'),
+        ]
+
+        try:
+            assert [item['id'] for item in get_history(search_query='cyberpunk')] == record_ids[:1]
+            assert [item['id'] for item in get_history(search_query='mead')] == record_ids[1:]
+            assert [item['id'] for item in get_history(search_query='morning "light')] == record_ids[1:]
+        finally:
+            for record_id in record_ids:
+                delete_history_item(record_id)
+
+        assert get_history(search_query='cyberpunk') == []
+
+    def test_search_results_are_newest_first(self, flask_app):
+        """Verify matches come back in recency order, and a blank query does not filter"""
+        record_ids = save_to_history_bulk([
+            ('lighthouse lighthouse lighthouse', 'storm', 'flux', {}, 'oneshot', '2023-01-02T03:04:05+00:00'),
+            ('lighthouse at dusk', 'calm sea', 'flux', {}, 'oneshot', '2024-06-07T08:09:10+00:00'),
+        ])
+
+        try:
+            assert [item['id'] for item in get_history(search_query='lighthouse')] == record_ids[::-1]
+            assert [item['id'] for item in get_history(search_query='   ')] == \
+                [item['id'] for item in get_history()]
+        finally:
+            for record_id in record_ids:
+                delete_history_item(record_id)
+
+    def test_bulk_save_returns_ids_in_order(self, flask_app):
+        """Verify bulk inserts return one ID per record, in input order"""
+        record_ids = save_to_history_bulk([
+            ('bulk first', 'output one', 'flux', {'style': 'None'}, 'oneshot'),
+            ('bulk second', 'output two', 'sdxl', {'style': 'None'}, 'chat'),
+        ])
+
+        try:
+            assert len(record_ids) == 2
+            saved = {item['id']: item for item in get_history(limit=10)}
+            assert saved[record_ids[0]]['user_input'] == 'bulk first'
+            assert saved[record_ids[1]]['mode'] == 'chat'
+        finally:
+            for record_id in record_ids:
+                delete_history_item(record_id)
+
+    def test_bulk_save_keeps_imported_timestamps(self, flask_app):
+        """Verify records carrying their own timestamp keep it, others get the current time"""
+        record_ids = save_to_history_bulk([
+            ('imported older', 'output one', 'flux', {}, 'oneshot', '2023-01-02T03:04:05+00:00'),
+            ('imported newer', 'output two', 'flux', {}, 'oneshot', '2024-06-07T08:09:10+00:00'),
+            ('imported undated', 'output three', 'flux', {}, 'oneshot', None),
+        ])
+
+        try:
+            saved = {item['id']: item for item in get_history(search_query='imported')}
+            assert saved[record_ids[0]]['timestamp'] == '2023-01-02T03:04:05+00:00'
+            assert saved[record_ids[1]]['timestamp'] == '2024-06-07T08:09:10+00:00'
+            assert saved[record_ids[2]]['timestamp'] > '2024-06-07T08:09:10+00:00'
+        finally:
+            for record_id in record_ids:
+                delete_history_item(record_id)
+
+    def test_history_preview_truncates_output(self, client):
+        """Verify /history?preview=1 returns shortened outputs"""
+        output = 'x' * (HISTORY_PREVIEW_CHARS * 3)
+        record_id = save_to_history('preview check', output, 'flux', {}, 'oneshot')
+
+        try:
+            full = client.get('/history?q=preview').get_json()['history']
+            preview = client.get('/history?q=preview&preview=1').get_json()['history']
+            assert [item['generated_output'] for item in full if item['id'] == record_id] == [output]
+            assert [item['generated_output'] for item in preview if item['id'] == record_id] == [
+                output[:HISTORY_PREVIEW_CHARS]
+            ]
+        finally:
+            delete_history_item(record_id)
+
+
 class TestErrorHandling:
     """Test error handling"""
 
@@ -409,7 +680,7 @@ class TestErrorHandling:
         # Should return JSON, not HTML
         assert response.content_type == 'application/json'
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'error' in data or 'message' in data
 
     def test_405_method_not_allowed(self, client):
@@ -418,15 +689,98 @@ class TestErrorHandling:
         response = client.post('/')
         assert response.status_code == 405
 
+    def test_preset_route_failure_returns_json_500(self, client, monkeypatch, hierarchical_presets):
+        """Verify unexpected preset route errors name what failed to load"""
+        def broken_load_presets():
+            raise RuntimeError('presets unavailable')
+
+        monkeypatch.setattr('app.presets.load_presets', broken_load_presets)
+
+        response = client.get('/api/universal-options')
+        assert response.status_code == 500
+        assert response.get_json() == {
+            'error': 'Failed to load universal options',
+            'message': 'presets unavailable'
+        }
+
+    @pytest.mark.parametrize('base_url', ['http://localhost:abc', 'http://localhost:99999'])
+    def test_ollama_check_with_invalid_port_returns_false(self, base_url):
+        """Verify an unparseable Ollama port reports unreachable instead of raising"""
+        assert check_ollama_connection(base_url) is False
+
+
+class TestOllamaCallBounds:
+    """Test the output cap and retry policy applied to Ollama calls"""
+
+    def test_output_cap_grows_with_input_up_to_ceiling(self, monkeypatch):
+        """Verify num_predict is 512 + 4 per input word, bounded by the setting"""
+        monkeypatch.setattr(config, 'OLLAMA_MAX_OUTPUT_TOKENS', 1024)
+        messages = [{'role': 'system', 'content': 'You write prompts'},
+                    {'role': 'user', 'content': 'a castle in fog'}]
+        assert _output_token_cap(messages) == 528
+        assert _output_token_cap([{'role': 'user', 'content': 'word ' * 500}]) == 1024
+
+        monkeypatch.setattr(config, 'OLLAMA_MAX_OUTPUT_TOKENS', 0)
+        assert _output_token_cap(messages) == 0
+
+    def test_only_refused_connections_are_retried(self, monkeypatch):
+        """Verify a refused connection is retried but a connect timeout is not"""
+        monkeypatch.setattr(config, 'OLLAMA_MAX_RETRIES', 2)
+        monkeypatch.setattr(ollama_client.time, 'sleep', lambda seconds: None)
+        refused = requests.exceptions.ConnectionError(urllib3.exceptions.MaxRetryError(
+            None, '/api/generate', urllib3.exceptions.NewConnectionError(None, 'refused')
+        ))
+        for error, expected_calls in ((refused, 3), (requests.exceptions.ConnectTimeout(), 1)):
+            calls = []
+
+            def failing_post(*args, error=error, **kwargs):
+                calls.append(args)
+                raise error
+
+            monkeypatch.setattr(ollama_client._OLLAMA_SESSION, 'post', failing_post)
+            with pytest.raises(type(error)):
+                _post_to_ollama('http://localhost:11434/api/generate', {})
+            assert len(calls) == expected_calls
+
+
+class TestOllamaStreaming:
+    """Test how streamed Ollama responses are read and released"""
+
+    def test_stream_is_read_to_end_before_response_closes(self, monkeypatch):
+        """Verify the reader reaches EOF after "done" before the response is closed"""
+        class FakeStreamResponse:
+            status_code = 200
+
+            def __init__(self):
+                self.raw = self
+                self.events = []
+
+            def raise_for_status(self):
+                pass
+
+            def stream(self, chunk_size, decode_content=True):
+                yield b'{"response": "a castle", "done": false}\n'
+                yield b'{"done": true}\n'
+                # Ollama's terminating chunk arrives a moment after "done"
+                time.sleep(0.05)
+                self.events.append('eof')
+
+            def close(self):
+                self.events.append('close')
+
+        response = FakeStreamResponse()
+        monkeypatch.setattr(ollama_client, '_post_to_ollama', lambda url, payload, stream=False: response)
+
+        assert list(ollama_client._stream_ollama_response({}, 'flux')) == ['a castle']
+        assert response.events == ['eof', 'close']
+
 
 class TestAdminSecurity:
     """Test security controls on admin endpoints"""
 
     def test_reload_prompts_rejects_unauthorized_request(self, client, monkeypatch):
         """Verify /admin/reload-prompts requires authentication"""
-        import app.config
-
-        monkeypatch.setattr(app.config.config, 'ADMIN_API_KEY', 'super-secret-key')
+        monkeypatch.setattr(config, 'ADMIN_API_KEY', 'super-secret-key')
 
         response = client.post(
             '/admin/reload-prompts',
@@ -434,6 +788,39 @@ class TestAdminSecurity:
         )
 
         assert response.status_code == 403
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data['success'] is False
         assert data['error'] == 'forbidden'
+
+    def test_spoofed_forwarded_for_does_not_pass_loopback_check(self, client, monkeypatch):
+        """Verify a client-forged X-Forwarded-For entry ahead of the proxy's hop is ignored"""
+        monkeypatch.setattr(config, 'ADMIN_API_KEY', '')
+        monkeypatch.setattr(config, 'ADMIN_ALLOWED_IPS', frozenset())
+        monkeypatch.setattr(config, 'TRUST_PROXY_HEADERS', True)
+
+        response = client.post(
+            '/admin/reload-prompts',
+            headers={'X-Forwarded-For': '127.0.0.1, 203.0.113.10'},
+            environ_overrides={'REMOTE_ADDR': '127.0.0.1'}
+        )
+
+        assert response.status_code == 403
+        assert response.get_json()['error'] == 'forbidden'
+
+    def test_reload_prompts_view_checks_authorization_without_gate(self, monkeypatch):
+        """Verify the blueprint rejects unauthorized requests even without AdminGate"""
+        from flask import Flask
+
+        from app.routes import admin
+
+        monkeypatch.setattr(config, 'ADMIN_API_KEY', 'super-secret-key')
+        bare_app = Flask(__name__)
+        bare_app.register_blueprint(admin.bp)
+
+        response = bare_app.test_client().post(
+            '/admin/reload-prompts',
+            environ_overrides={'REMOTE_ADDR': '203.0.113.10'}
+        )
+
+        assert response.status_code == 403
+        assert response.get_json()['error'] == 'forbidden'
@@ -2,8 +2,12 @@
 Tests for preset validation and structure
 """
 
+import json
+import os
+
 import pytest
-from app.presets import load_presets
+
+from app.presets import _load_presets_cached
 
 
 class TestPresetStructure:
@@ -31,41 +35,28 @@ class TestPresetStructure:
         for category, items in presets.items():
             assert items['None'] == '', f"'None' option in '{category}' should be empty string"
 
-    def test_presets_have_string_values(self, presets):
+    def test_presets_have_string_values(self, flat_presets):
         """Verify all preset values are strings"""
-        for category, items in presets.items():
-            for preset_name, preset_value in items.items():
-                assert isinstance(preset_value, str), \
-                    f"Preset '{preset_name}' in '{category}' has non-string value"
+        for category, preset_name, preset_value in flat_presets:
+            assert isinstance(preset_value, str), \
+                f"Preset '{preset_name}' in '{category}' has non-string value"
 
-    def test_presets_have_non_empty_keys(self, presets):
+    def test_presets_have_non_empty_keys(self, flat_presets):
         """Verify all preset keys are non-empty strings"""
-        for category, items in presets.items():
-            for preset_name in items.keys():
-                assert isinstance(preset_name, str), \
-                    f"Preset key in '{category}' is not a string"
-                assert preset_name.strip() != '', \
-                    f"Empty preset key found in '{category}'"
+        for category, preset_name, _ in flat_presets:
+            assert isinstance(preset_name, str), \
+                f"Preset key in '{category}' is not a string"
+            assert preset_name.strip() != '', \
+                f"Empty preset key found in '{category}'"
 
 
 class TestPresetCategories:
     """Test individual preset categories"""
 
-    def test_styles_category_has_multiple_options(self, presets):
-        """Verify styles category has multiple preset options"""
-        assert len(presets['styles']) > 1, "Styles should have more than just 'None'"
-
-    def test_artists_category_has_multiple_options(self, presets):
-        """Verify artists category has multiple preset options"""
-        assert len(presets['artists']) > 1, "Artists should have more than just 'None'"
-
-    def test_composition_category_has_multiple_options(self, presets):
-        """Verify composition category has multiple preset options"""
-        assert len(presets['composition']) > 1, "Composition should have more than just 'None'"
-
-    def test_lighting_category_has_multiple_options(self, presets):
-        """Verify lighting category has multiple preset options"""
-        assert len(presets['lighting']) > 1, "Lighting should have more than just 'None'"
+    @pytest.mark.parametrize('category', ['styles', 'artists', 'composition', 'lighting'])
+    def test_category_has_multiple_options(self, presets, category):
+        """Verify each category has multiple preset options"""
+        assert len(presets[category]) > 1, f"{category} should have more than just 'None'"
 
     def test_total_preset_count(self, presets):
         """Verify we have a reasonable number of total presets"""
@@ -76,26 +67,37 @@ class TestPresetCategories:
 class TestSpecificPresets:
     """Test for specific preset values"""
 
-    def test_cinematic_style_exists(self, presets):
-        """Verify Cinematic style preset exists"""
-        assert 'Cinematic' in presets['styles'], "Cinematic style should exist"
+    @pytest.mark.parametrize('category, name', [
+        ('styles', 'Cinematic'),
+        ('styles', 'Photorealistic'),
+        ('composition', 'Portrait'),
+        ('lighting', 'Golden Hour'),
+    ])
+    def test_specific_preset_exists(self, presets, category, name):
+        """Verify well-known presets exist in their category"""
+        assert name in presets[category], f"'{name}' should exist in '{category}'"
+
+    def test_presets_are_not_none_values(self, flat_presets):
+        """Verify non-None presets have actual content"""
+        for category, preset_name, preset_value in flat_presets:
+            if preset_name != 'None':
+                assert preset_value != '', \
+                    f"Preset '{preset_name}' in '{category}' should not be empty"
 
-    def test_photorealistic_style_exists(self, presets):
-        """Verify Photorealistic style preset exists"""
-        assert 'Photorealistic' in presets['styles'], "Photorealistic style should exist"
 
-    def test_portrait_composition_exists(self, presets):
-        """Verify Portrait composition preset exists"""
-        assert 'Portrait' in presets['composition'], "Portrait composition should exist"
+class TestMarshalCache:
+    """Test the marshal cache kept next to the presets file"""
 
-    def test_golden_hour_lighting_exists(self, presets):
-        """Verify Golden Hour lighting preset exists"""
-        assert 'Golden Hour' in presets['lighting'], "Golden Hour lighting should exist"
+    def test_restored_older_file_is_reparsed(self, tmp_path):
+        """Verify a cache newer than a restored older JSON file is not reused"""
+        path = tmp_path / 'presets.json'
+        path.write_text(json.dumps({'styles': {'None': ''}}))
+        assert _load_presets_cached(str(path)) == {'styles': {'None': ''}}
 
-    def test_presets_are_not_none_values(self, presets):
-        """Verify non-None presets have actual content"""
-        for category, items in presets.items():
-            for preset_name, preset_value in items.items():
-                if preset_name != 'None':
-                    assert preset_value != '', \
-                        f"Preset '{preset_name}' in '{category}' should not be empty"
+        # Restore a backup whose mtime predates the cache
+        path.write_text(json.dumps({'styles': {'None': '', 'Noir': 'film noir'}}))
+        os.utime(path, (1_000_000_000, 1_000_000_000))
+
+        assert _load_presets_cached(str(path)) == {
+            'styles': {'None': '', 'Noir': 'film noir'}
+        }